@@ -1,19 +1,43 @@
-"""Platform adapters for social media monitoring."""
+"""Platform adapters for social media monitoring.
+
+Adapter classes are imported on first access (`from adapters import
+RedditAdapter` still works), so disabled adapters never load their
+dependencies.
+"""
+from typing import TYPE_CHECKING
+
 from .base import BaseAdapter, Post
-from .reddit import RedditAdapter
-from .discord import DiscordAdapter
-from .twitter import TwitterAdapter
-from .hackernews import HackerNewsAdapter
-from .medium import MediumAdapter
-from .devto import DevToAdapter
-from .stackexchange import StackExchangeAdapter
-from .rssfeeds import RSSAdapter
-from .indiehackers import IndieHackersAdapter
+from .registry import ADAPTERS, ADAPTERS_BY_CLASS, ADAPTERS_BY_SECTION, AdapterSpec, create_enabled_adapters
+
+if TYPE_CHECKING:
+    from .reddit import RedditAdapter
+    from .discord import DiscordAdapter
+    from .twitter import TwitterAdapter
+    from .hackernews import HackerNewsAdapter
+    from .medium import MediumAdapter
+    from .devto import DevToAdapter
+    from .stackexchange import StackExchangeAdapter
+    from .rssfeeds import RSSAdapter
+    from .indiehackers import IndieHackersAdapter
+    from .synthetic import SyntheticAdapter
+
+
+def __getattr__(name: str):
+    spec = ADAPTERS_BY_CLASS.get(name)
+    if spec is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return spec.load()
+
 
 __all__ = [
     "BaseAdapter",
     "Post",
-    "RedditAdapter", 
+    "AdapterSpec",
+    "ADAPTERS",
+    "ADAPTERS_BY_CLASS",
+    "ADAPTERS_BY_SECTION",
+    "create_enabled_adapters",
+    "RedditAdapter",
     "DiscordAdapter",
     "TwitterAdapter",
     "HackerNewsAdapter",
@@ -22,4 +46,5 @@ __all__ = [
     "StackExchangeAdapter",
     "RSSAdapter",
     "IndieHackersAdapter",
+    "SyntheticAdapter",
 ]
@@ -1,13 +1,37 @@
 """Base adapter class for social media platforms."""
+import calendar
+import hashlib
+import sys
+import threading
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timezone
+from typing import Any, Callable, ClassVar, Dict, Iterator, List, Optional, Tuple
 
 
-@dataclass
+def stable_id(key: str) -> str:
+    """
+    Short digest of a feed entry's id or link, for use in Post IDs.
+    
+    Unlike `hash()`, which is salted per process, it is the same in every
+    run and worker process, so seen-state, archive and task dedupe hold.
+    """
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass(slots=True, eq=False)
 class Post:
-    """Represents a social media post from any platform."""
+    """
+    Represents a social media post from any platform.
+    
+    Slotted (no per-instance __dict__) with the low-cardinality platform,
+    subreddit and channel strings interned, so large batches share them.
+    Content longer than `max_content_chars` is truncated at construction.
+    """
+    
+    # Content cap applied when a Post is created (0 = unbounded); set from
+    # monitor.max_content_chars
+    max_content_chars: ClassVar[int] = 20000
     
     # Unique identifier for deduplication
     id: str
@@ -38,6 +62,22 @@ class Post:
     # Extra metadata
     metadata: Dict[str, Any] = field(default_factory=dict)
     
+    # (title, content, text) caches for full_text / display_text
+    _full_text: Optional[Tuple[str, str, str]] = field(default=None, init=False, repr=False)
+    _display_text: Optional[Tuple[str, str, str]] = field(default=None, init=False, repr=False)
+    
+    def __post_init__(self):
+        self.platform = sys.intern(self.platform)
+        if self.subreddit:
+            self.subreddit = sys.intern(self.subreddit)
+        if self.channel:
+            self.channel = sys.intern(self.channel)
+        limit = Post.max_content_chars
+        if limit and self.content and len(self.content) > limit:
+            # Copy: callers may share one metadata dict across posts
+            self.metadata = {**self.metadata, "content_truncated_from": len(self.content)}
+            self.content = self.content[:limit]
+    
     def __hash__(self):
         return hash(self.id)
     
@@ -49,16 +89,23 @@ class Post:
     @property
     def full_text(self) -> str:
         """Returns combined title and content for keyword matching."""
-        parts = []
-        if self.title:
-            parts.append(self.title)
-        if self.content:
-            parts.append(self.content)
-        return "\n\n".join(parts)
+        cached = self._full_text
+        # Identity checks keep the cache valid if title/content are reassigned
+        if cached is not None and cached[0] is self.title and cached[1] is self.content:
+            return cached[2]
+        if self.title and self.content:
+            text = f"{self.title}\n\n{self.content}"
+        else:
+            text = self.title or self.content or ""
+        self._full_text = (self.title, self.content, text)
+        return text
     
     @property
     def display_text(self) -> str:
         """Returns a formatted display text for notifications."""
+        cached = self._display_text
+        if cached is not None and cached[0] is self.title and cached[1] is self.content:
+            return cached[2]
         text = ""
         if self.title:
             text += f"**{self.title}**\n\n"
@@ -68,6 +115,7 @@ class Post:
             if len(self.content) > 500:
                 content += "..."
             text += content
+        self._display_text = (self.title, self.content, text)
         return text
     
     def to_dict(self) -> Dict[str, Any]:
@@ -124,6 +172,20 @@ class BaseAdapter(ABC):
         """
         self.config = config
         self.enabled = config.get("enabled", True)
+        
+        # Optional shared PollScheduler for per-source schedules
+        self.scheduler = None
+        
+        # Raw items examined before keyword filtering (read by metrics)
+        self.items_fetched = 0
+        
+        # Optional PostArchive that keeps every fetched post, matched or not
+        self.archive = None
+        
+        # Optional WebSubSubscriber; feed adapters subscribe to hubs their feeds advertise
+        self.websub = None
+        self._pushed: List[Tuple[str, Post]] = []  # (source, post) received since the last cycle
+        self._pushed_lock = threading.Lock()
     
     @property
     @abstractmethod
@@ -132,18 +194,45 @@ class BaseAdapter(ABC):
         pass
     
     @abstractmethod
-    def fetch_posts(self, keywords: List[str]) -> List[Post]:
+    def fetch_posts(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[Post]:
         """
         Fetch recent posts from the platform.
         
+        Adapters push `since` and `limit` into the API request where it
+        supports them (date filters, page sizes) and otherwise skip stale
+        items before parsing and keyword matching them.
+        
         Args:
             keywords: List of keywords to filter by (can be used for API queries)
+            since: Only posts created after this time (None = no cutoff)
+            limit: Most items to request per source or query (None = the
+                adapter's configured page size)
         
         Returns:
             List of Post objects
         """
         pass
     
+    def iter_posts(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> Iterator[Post]:
+        """
+        Yield matched posts as soon as they are available.
+        
+        Adapters that fetch from many sources override this to yield after
+        each source, so the monitoring pipeline can start on early results
+        while later sources are still downloading. The default yields the
+        whole `fetch_posts` batch.
+        
+        Args:
+            keywords: List of keywords to filter by
+            since: Only posts created after this time (None = no cutoff)
+            limit: Most items to request per source or query
+        """
+        yield from self.fetch_posts(keywords, since=since, limit=limit)
+    
     def filter_by_keywords(self, posts: List[Post], keywords: List[str]) -> List[Post]:
         """
         Filter posts by matching keywords in their content.
@@ -155,6 +244,8 @@ class BaseAdapter(ABC):
         Returns:
             List of posts that match at least one keyword
         """
+        self.items_fetched += len(posts)
+        self._archive_posts(posts)
         filtered = []
         keywords_lower = [kw.lower() for kw in keywords]
         
@@ -172,6 +263,134 @@ class BaseAdapter(ABC):
         
         return filtered
     
+    @staticmethod
+    def _is_stale(created_at: Optional[datetime], since: Optional[datetime]) -> bool:
+        """Whether an item created at `created_at` is at or before the cutoff (undated items never are)."""
+        if since is None or created_at is None:
+            return False
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return created_at <= since
+    
+    @staticmethod
+    def _page_size(configured: int, limit: Optional[int]) -> int:
+        """Items to request per source: the configured size, capped by `limit`."""
+        return configured if limit is None else min(configured, limit)
+    
+    def _fresh_entries(
+        self, entries: List[Any], since: Optional[datetime], limit: Optional[int], newest_first: bool = True
+    ) -> List[Any]:
+        """
+        Feed entries newer than `since`, judged from feedparser's parsed dates.
+        
+        Entries of a newest-first feed are read only up to the first stale
+        one; otherwise stale entries are skipped one by one. Either way they
+        are never converted to posts or keyword-matched.
+        
+        Args:
+            entries: feedparser entries, in feed order
+            since: Cutoff (None = keep all)
+            limit: Most entries to return (None = all)
+            newest_first: Whether the feed lists entries by descending date
+        """
+        fresh = []
+        for entry in entries:
+            if limit is not None and len(fresh) >= limit:
+                break
+            parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+            published = datetime.fromtimestamp(calendar.timegm(parsed), tz=timezone.utc) if parsed else None
+            if self._is_stale(published, since):
+                if newest_first:
+                    break
+                continue
+            fresh.append(entry)
+        return fresh
+    
+    def _archive_posts(self, posts: List[Post]):
+        """Hand fetched posts (before keyword filtering) to the archive, if any."""
+        if self.archive is not None:
+            self.archive.add(posts)
+    
+    def _source_due(self, source: str, interval: Optional[float], jitter: float = 0.0) -> bool:
+        """
+        Check whether a single source (feed, channel...) is due for polling.
+        
+        Sources with a fixed interval use it; otherwise adaptive polling
+        (when enabled) sizes the interval to the source's change rate.
+        Adapters running without a scheduler poll every source every time.
+        """
+        if self.scheduler is None:
+            return True
+        name = f"{self.platform_name}:{source}"
+        if interval:
+            return self.scheduler.claim(name, interval, jitter)
+        if self.scheduler.adaptive:
+            return self.scheduler.claim_adaptive(name)
+        return True
+    
+    def _release_source(self, source: str):
+        """Hand back a `_source_due` claim after a failed poll so the source is retried next cycle."""
+        if self.scheduler is not None:
+            self.scheduler.release(f"{self.platform_name}:{source}")
+    
+    def _record_source_poll(self, source: str, posts: List[Post]):
+        """Report a source's poll result so adaptive polling can learn its change rate."""
+        if self.scheduler is not None and self.scheduler.adaptive:
+            self.scheduler.record_poll(f"{self.platform_name}:{source}", [p.id for p in posts if p])
+    
+    def _feed_needs_poll(self, feed_url: str) -> bool:
+        """False while pushed updates cover a feed (verified WebSub subscription)."""
+        return self.websub is None or self.websub.needs_poll(feed_url)
+    
+    def _watch_feed(
+        self,
+        feed_url: str,
+        feed: Any,
+        response: Any,
+        source: str,
+        to_post: Callable[[Dict, str], Optional[Post]],
+        limit: Optional[int] = None,
+    ):
+        """
+        After polling a feed, subscribe to the WebSub hub it advertises (if any).
+        
+        Pushed documents are parsed with feedparser and converted with
+        `to_post` - the adapter's own entry converter - then buffered for
+        the next cycle (see `_drain_pushed`).
+        
+        Args:
+            feed_url: URL that was polled
+            feed: Parsed feed (feedparser result)
+            response: HTTP response the feed came from (Link headers)
+            source: Source name passed to `to_post`
+            to_post: Entry -> Post converter, e.g. `self._entry_to_post`
+            limit: Entries taken per pushed document
+        """
+        if self.websub is None:
+            return
+        self.websub.mark_polled(feed_url)
+        from services.websub import discover_hub
+        
+        hub, topic = discover_hub(feed, response)
+        if not hub:
+            return
+        
+        def on_push(body: bytes):
+            import feedparser
+            
+            entries = feedparser.parse(body).entries[:limit]
+            posts = [post for post in (to_post(entry, source) for entry in entries) if post]
+            with self._pushed_lock:
+                self._pushed.extend((source, post) for post in posts)
+        
+        self.websub.subscribe(feed_url, hub, topic, on_push)
+    
+    def _drain_pushed(self) -> List[Tuple[str, Post]]:
+        """(source, post) pairs pushed since the last call."""
+        with self._pushed_lock:
+            pushed, self._pushed = self._pushed, []
+        return pushed
+    
     def is_enabled(self) -> bool:
         """Check if this adapter is enabled in config."""
         return self.enabled
@@ -1,9 +1,9 @@
 """Dev.to adapter using their free public API."""
 import logging
-import requests
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from typing import Any, Dict, List, Optional
 
+from . import http
 from .base import BaseAdapter, Post
 
 logger = logging.getLogger(__name__)
@@ -13,6 +13,7 @@ class DevToAdapter(BaseAdapter):
     """Adapter for Dev.to using their public API."""
     
     API_URL = "https://dev.to/api/articles"
+    LATEST_URL = "https://dev.to/api/articles/latest"  # Sorted by publication date, newest first
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
@@ -33,18 +34,21 @@ class DevToAdapter(BaseAdapter):
     def platform_name(self) -> str:
         return "devto"
     
-    def fetch_posts(self, keywords: List[str]) -> List[Post]:
-        """Fetch articles from Dev.to."""
+    def fetch_posts(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[Post]:
+        """Fetch articles from Dev.to (articles older than `since` are not parsed)."""
         if not self.enabled:
             return []
         
         posts = []
         seen_ids = set()
+        per_page = self._page_size(self.per_page, limit)
         
         # Search by tags
         for tag in self.tags:
             try:
-                tag_posts = self._fetch_by_tag(tag)
+                tag_posts = self._fetch_by_tag(tag, per_page, since)
                 for post in tag_posts:
                     if post.id not in seen_ids and self._matches_keywords(post, keywords):
                         seen_ids.add(post.id)
@@ -54,7 +58,7 @@ class DevToAdapter(BaseAdapter):
         
         # Also search latest articles matching keywords
         try:
-            latest = self._fetch_latest()
+            latest = self._fetch_latest(per_page, since)
             for post in latest:
                 if post.id not in seen_ids and self._matches_keywords(post, keywords):
                     seen_ids.add(post.id)
@@ -65,30 +69,46 @@ class DevToAdapter(BaseAdapter):
         logger.info(f"Dev.to: {len(posts)} articles found")
         return posts
     
-    def _fetch_by_tag(self, tag: str) -> List[Post]:
+    def _fetch_by_tag(self, tag: str, per_page: int, since: Optional[datetime]) -> List[Post]:
         """Fetch articles by tag."""
         params = {
             "tag": tag,
-            "per_page": self.per_page,
+            "per_page": per_page,
             "state": "rising",  # Get newer content
         }
         
-        response = requests.get(self.API_URL, params=params, timeout=10)
+        response = http.get(self.API_URL, params=params, timeout=10)
         response.raise_for_status()
         
-        return [self._article_to_post(a) for a in response.json() if a]
+        # Rising articles are not in date order: skip stale ones individually
+        return [self._article_to_post(a) for a in self._fresh(response.json(), since, newest_first=False)]
     
-    def _fetch_latest(self) -> List[Post]:
+    def _fetch_latest(self, per_page: int, since: Optional[datetime]) -> List[Post]:
         """Fetch latest articles."""
-        params = {
-            "per_page": self.per_page,
-            "state": "fresh",
-        }
+        params = {"per_page": per_page}
         
-        response = requests.get(self.API_URL, params=params, timeout=10)
+        response = http.get(self.LATEST_URL, params=params, timeout=10)
         response.raise_for_status()
         
-        return [self._article_to_post(a) for a in response.json() if a]
+        return [self._article_to_post(a) for a in self._fresh(response.json(), since, newest_first=True)]
+    
+    def _fresh(self, articles: List[Dict], since: Optional[datetime], newest_first: bool) -> List[Dict]:
+        """Raw articles published after `since`; a newest-first list is cut at the first stale one."""
+        fresh = []
+        for article in articles:
+            if not article:
+                continue
+            published = article.get("published_at")
+            try:
+                published_at = datetime.fromisoformat(published.replace("Z", "+00:00")) if published else None
+            except ValueError:
+                published_at = None
+            if self._is_stale(published_at, since):
+                if newest_first:
+                    break
+                continue
+            fresh.append(article)
+        return fresh
     
     def _article_to_post(self, article: Dict) -> Post:
         """Convert Dev.to article to Post object."""
@@ -121,8 +141,10 @@ class DevToAdapter(BaseAdapter):
     
     def _matches_keywords(self, post: Post, keywords: List[str]) -> bool:
         """Check if post matches any keywords."""
+        self.items_fetched += 1
         if not post:
             return False
+        self._archive_posts([post])
         text = f"{post.title} {post.content}".lower()
         tags = " ".join(post.metadata.get("tags", [])).lower()
         combined = f"{text} {tags}"
@@ -1,12 +1,28 @@
 """Discord adapter for monitoring channels."""
+import asyncio
 import logging
+import threading
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional
 
+from . import http
 from .base import BaseAdapter, Post
 
 logger = logging.getLogger(__name__)
 
+API_BASE = "https://discord.com/api/v10"
+
+# Discord's maximum for GET /channels/{id}/messages
+PAGE_SIZE = 100
+
+# Snowflake IDs carry their creation time as milliseconds since this epoch
+DISCORD_EPOCH_MS = 1420070400000
+
+
+def snowflake_time(snowflake: Any) -> datetime:
+    """Creation time encoded in a Discord snowflake ID."""
+    return datetime.fromtimestamp(((int(snowflake) >> 22) + DISCORD_EPOCH_MS) / 1000, tz=timezone.utc)
+
 
 class DiscordAdapter(BaseAdapter):
     """
@@ -16,20 +32,43 @@ class DiscordAdapter(BaseAdapter):
     1. Bot mode: Uses a Discord bot token to read channel messages
     2. Webhook mode: Receives messages via webhook (requires external setup)
     
+    In bot mode, messages are either polled over REST (only those after the
+    newest message already seen in each channel) or, with `gateway.enabled`,
+    streamed over one Gateway websocket and buffered until the next cycle.
+    
     Note: Bot mode requires the bot to be invited to the server with 
     message reading permissions.
     """
     
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.api_base = config.get("api_base", API_BASE).rstrip("/")
+        # Pages of 100 fetched per channel per poll when catching up
+        self.max_pages = config.get("max_pages", 10)
+        self.gateway_config = config.get("gateway", {})
+        
+        # channel ID -> newest message ID (snowflake) seen
+        self._cursors: Dict[str, int] = {}
+        self._cursor_lock = threading.Lock()
+        self._gateway = None
+        self._gateway_task = None
+        self._buffer = None
+    
     @property
     def platform_name(self) -> str:
         return "discord"
     
-    def fetch_posts(self, keywords: List[str]) -> List[Post]:
+    def fetch_posts(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[Post]:
         """
         Fetch messages from configured Discord channels.
         
         Args:
             keywords: Keywords for filtering
+            since: Skip messages created at or before this time (judged
+                from the message snowflake, before parsing)
+            limit: Messages to fetch on a channel's first REST poll
         
         Returns:
             List of Post objects matching keywords
@@ -49,12 +88,20 @@ class DiscordAdapter(BaseAdapter):
             logger.warning("Discord: No channel IDs configured, skipping")
             return []
         
+        if self.gateway_config.get("enabled", False):
+            all_messages = self._drain_gateway(bot_token, channel_ids)
+            if all_messages is not None:
+                all_messages = [m for m in all_messages if not self._is_stale(m.created_at, since)]
+                matched = self.filter_by_keywords(all_messages, keywords)
+                logger.info(f"Discord: {len(matched)} streamed messages matched keywords out of {len(all_messages)}")
+                return matched
+        
         # Try synchronous approach using requests
         all_messages = []
         
         for channel_id in channel_ids:
             try:
-                messages = self._fetch_channel_messages(bot_token, channel_id)
+                messages = self._fetch_channel_messages(bot_token, channel_id, limit or 50, since)
                 all_messages.extend(messages)
                 logger.debug(f"Fetched {len(messages)} messages from channel {channel_id}")
             except Exception as e:
@@ -70,43 +117,78 @@ class DiscordAdapter(BaseAdapter):
         self, 
         bot_token: str, 
         channel_id: str,
-        limit: int = 50
+        limit: int = 50,
+        since: Optional[datetime] = None
     ) -> List[Post]:
         """
-        Fetch recent messages from a Discord channel using the REST API.
+        Fetch new messages from a Discord channel using the REST API.
+        
+        The first poll of a channel takes the latest `limit` messages; later
+        polls ask only for messages after the newest one seen, up to
+        `max_pages` pages of 100, so bursts are not cut off and a quiet
+        channel costs one empty request.
         
         Args:
             bot_token: Discord bot token
             channel_id: Channel ID to fetch from
-            limit: Maximum messages to fetch
+            limit: Messages to fetch on the first poll
+            since: Skip messages created at or before this time
         
         Returns:
             List of Post objects
         """
-        import requests
+        channel_id = str(channel_id)
+        url = f"{self.api_base}/channels/{channel_id}/messages"
+        headers = self._headers(bot_token)
+        posts = []
+        
+        for params in self._page_params(channel_id, limit):
+            response = http.get(url, headers=headers, params=params, timeout=15)
+            response.raise_for_status()
+            page = response.json()
+            posts.extend(self._parse_page(page, channel_id, since))
+            if "after" not in params or len(page) < PAGE_SIZE:
+                break
         
-        url = f"https://discord.com/api/v10/channels/{channel_id}/messages"
-        headers = {
+        return posts
+    
+    @staticmethod
+    def _headers(bot_token: str) -> Dict[str, str]:
+        return {
             "Authorization": f"Bot {bot_token}",
             "Content-Type": "application/json"
         }
-        params = {"limit": limit}
-        
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        
-        messages_data = response.json()
+    
+    def _page_params(self, channel_id: str, limit: int) -> Iterable[Dict[str, Any]]:
+        """Query parameters for successive message pages, resuming from the channel's cursor."""
+        if channel_id not in self._cursors:
+            yield {"limit": limit}
+            return
+        for _ in range(self.max_pages):
+            # _parse_page advances the cursor between pages
+            yield {"limit": PAGE_SIZE, "after": str(self._cursors[channel_id])}
+    
+    def _parse_page(
+        self, messages_data: List[Dict[str, Any]], channel_id: str, since: Optional[datetime] = None
+    ) -> List[Post]:
+        """Parse a page of messages newer than `since` and advance the channel's cursor past all of them."""
         posts = []
-        
         for msg in messages_data:
             try:
-                post = self._parse_message(msg, channel_id)
-                posts.append(post)
+                self._advance_cursor(channel_id, msg["id"])
+                if self._is_stale(snowflake_time(msg["id"]), since):
+                    continue
+                posts.append(self._parse_message(msg, channel_id))
             except Exception as e:
                 logger.error(f"Error parsing Discord message: {e}")
-        
         return posts
     
+    def _advance_cursor(self, channel_id: str, message_id: str):
+        with self._cursor_lock:
+            snowflake = int(message_id)
+            if snowflake > self._cursors.get(channel_id, 0):
+                self._cursors[channel_id] = snowflake
+    
     def _parse_message(self, msg: Dict[str, Any], channel_id: str) -> Post:
         """
         Parse a Discord message into a Post object.
@@ -168,15 +250,86 @@ class DiscordAdapter(BaseAdapter):
             }
         )
     
-    async def fetch_posts_async(self, keywords: List[str]) -> List[Post]:
+    def _start_gateway(self, bot_token: str, channel_ids: List[str]):
+        """Create the Gateway client and its message buffer (not yet connected)."""
+        from .discord_gateway import DEFAULT_GATEWAY_URL, DEFAULT_INTENTS, DiscordGateway, MessageBuffer
+        
+        self._buffer = MessageBuffer(self.gateway_config.get("buffer_size", 10000))
+        
+        def on_message(msg: Dict[str, Any]):
+            channel_id = str(msg["channel_id"])
+            try:
+                self._buffer.append(self._parse_message(msg, channel_id))
+                self._advance_cursor(channel_id, msg["id"])
+            except Exception as e:
+                logger.error(f"Error parsing Discord message: {e}")
+        
+        async def backfill(session):
+            # Anything posted while no session was open; runs before live events resume
+            for channel_id in channel_ids:
+                channel_id = str(channel_id)
+                url = f"{self.api_base}/channels/{channel_id}/messages"
+                try:
+                    for params in self._page_params(channel_id, 50):
+                        async with session.get(url, headers=self._headers(bot_token), params=params) as response:
+                            response.raise_for_status()
+                            page = await response.json()
+                        for post in self._parse_page(page, channel_id):
+                            self._buffer.append(post)
+                        if "after" not in params or len(page) < PAGE_SIZE:
+                            break
+                except Exception as e:
+                    logger.warning(f"Discord backfill of channel {channel_id} failed: {e}")
+        
+        self._gateway = DiscordGateway(
+            bot_token,
+            channel_ids,
+            on_message=on_message,
+            backfill=backfill,
+            url=self.gateway_config.get("url", DEFAULT_GATEWAY_URL),
+            intents=self.gateway_config.get("intents", DEFAULT_INTENTS),
+        )
+    
+    def _drain_gateway(self, bot_token: str, channel_ids: List[str]) -> Optional[List[Post]]:
         """
-        Async version using discord.py library.
+        Messages streamed since the last cycle, connecting on first use.
         
-        This is more efficient for long-running daemon mode.
-        Requires discord.py to be installed.
+        Returns:
+            Posts (deduplicated, oldest first), or None if the gateway refused
+            the bot and REST polling should be used instead
+        """
+        if self._gateway is None:
+            self._start_gateway(bot_token, channel_ids)
+            self._gateway.start()
+            # The first cycle waits for the session and its backfill
+            self._gateway.ready.wait(self.gateway_config.get("ready_timeout_seconds", 15))
+        if self._gateway.fatal_error:
+            return None
+        return self._drain_buffer()
+    
+    def _drain_buffer(self) -> List[Post]:
+        if self._buffer.dropped:
+            logger.warning(f"Discord: stream buffer full, {self._buffer.dropped} messages dropped")
+            self._buffer.dropped = 0
+        # Backfill and live events can overlap around a reconnect
+        unique = {post.id: post for post in self._buffer.drain()}
+        return list(unique.values())
+    
+    async def fetch_posts_async(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[Post]:
+        """
+        Async version for callers running an event loop (long-running daemons).
+        
+        With `gateway.enabled` the Gateway connection runs as a task on the
+        caller's loop - one websocket for the life of the loop - and each
+        call returns the matching messages buffered since the previous one.
+        Otherwise the REST poll runs in a worker thread.
         
         Args:
             keywords: Keywords for filtering
+            since: Skip messages created at or before this time
+            limit: Messages to fetch on a channel's first REST poll
         
         Returns:
             List of Post objects matching keywords
@@ -184,12 +337,16 @@ class DiscordAdapter(BaseAdapter):
         if not self.is_enabled():
             return []
         
-        try:
-            import discord
-        except ImportError:
-            logger.error("Discord.py not installed for async mode")
-            return []
+        bot_token = self.config.get("bot_token", "")
+        channel_ids = self.config.get("channel_ids", [])
+        if not self.gateway_config.get("enabled", False) or not bot_token or not channel_ids:
+            return await asyncio.to_thread(self.fetch_posts, keywords, since, limit)
         
-        # Implementation would use discord.py Client
-        # For now, fall back to sync method
-        return self.fetch_posts(keywords)
+        if self._gateway is None:
+            self._start_gateway(bot_token, channel_ids)
+            self._gateway_task = asyncio.create_task(self._gateway.run())
+            await asyncio.to_thread(self._gateway.ready.wait, self.gateway_config.get("ready_timeout_seconds", 15))
+        if self._gateway.fatal_error:
+            return await asyncio.to_thread(self.fetch_posts, keywords, since, limit)
+        fresh = [post for post in self._drain_buffer() if not self._is_stale(post.created_at, since)]
+        return self.filter_by_keywords(fresh, keywords)
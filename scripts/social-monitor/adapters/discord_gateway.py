@@ -0,0 +1,279 @@
+"""Discord Gateway (websocket) client that buffers new channel messages."""
+import asyncio
+import json
+import logging
+import random
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GATEWAY_URL = "wss://gateway.discord.gg/?v=10&encoding=json"
+
+# Gateway opcodes
+OP_DISPATCH = 0
+OP_HEARTBEAT = 1
+OP_IDENTIFY = 2
+OP_RESUME = 6
+OP_RECONNECT = 7
+OP_INVALID_SESSION = 9
+OP_HELLO = 10
+OP_HEARTBEAT_ACK = 11
+
+# GUILDS | GUILD_MESSAGES | MESSAGE_CONTENT (privileged; enable it for the bot)
+DEFAULT_INTENTS = (1 << 0) | (1 << 9) | (1 << 15)
+
+# Close codes after which reconnecting cannot help
+FATAL_CLOSE_CODES = {4004, 4010, 4011, 4012, 4013, 4014}
+
+
+class GatewayFatalError(Exception):
+    """The gateway refused the bot (bad token, disallowed intents...)."""
+
+
+class DiscordGateway:
+    """
+    Keeps one Gateway connection open and buffers MESSAGE_CREATE events.
+
+    Runs its own event loop in a daemon thread (`start()`), or as a task on
+    the caller's loop (`run()`). Heartbeats are sent at the interval from
+    HELLO; a missed ACK or a dropped socket reconnects with RESUME, so the
+    gateway replays what was missed. When a new session has to be
+    identified instead (first connect, invalid session), `backfill` is
+    awaited so the adapter can fetch anything posted while disconnected
+    over REST.
+
+    Messages from channels outside `channel_ids` are ignored. The buffer
+    is bounded; the oldest messages are dropped (and counted) if the
+    monitor stops draining it.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        channel_ids: List[str],
+        on_message: Callable[[Dict[str, Any]], None],
+        backfill: Callable[[aiohttp.ClientSession], Awaitable[None]],
+        url: str = DEFAULT_GATEWAY_URL,
+        intents: int = DEFAULT_INTENTS,
+        max_backoff_seconds: float = 60.0,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            token: Bot token
+            channel_ids: Channels whose messages are kept
+            on_message: Called with each MESSAGE_CREATE payload from those channels
+            backfill: Awaited (with an HTTP session) after every new session
+            url: Gateway websocket URL
+            intents: Gateway intents bitmask
+            max_backoff_seconds: Cap on the delay between reconnect attempts
+        """
+        self.token = token
+        self.channel_ids: Set[str] = {str(c) for c in channel_ids}
+        self.on_message = on_message
+        self.backfill = backfill
+        self.url = url
+        self.intents = intents
+        self.max_backoff_seconds = max_backoff_seconds
+
+        self.session_id: Optional[str] = None
+        self.resume_url: Optional[str] = None
+        self.sequence: Optional[int] = None
+        self.connects = 0
+        self.resumes = 0
+        self.fatal_error: Optional[str] = None
+
+        self.ready = threading.Event()     # Set once the first session is up and backfilled
+        self._stop: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+
+    # ------------------------------------------------------------------ control
+
+    def start(self):
+        """Run the connection in a background thread with its own event loop."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=lambda: asyncio.run(self.run()), name="discord-gateway", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        if self._loop and self._stop:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread:
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None and not (self._stop and self._stop.is_set())
+
+    async def run(self):
+        """Connect and reconnect until stopped or the gateway refuses the bot."""
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        backoff = 1.0
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as http:
+            while not self._stop.is_set():
+                try:
+                    await self._connect(http)
+                    backoff = 1.0
+                except GatewayFatalError as e:
+                    self.fatal_error = str(e)
+                    logger.error(f"Discord gateway: {e}; streaming stopped")
+                    self.ready.set()
+                    break
+                except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError) as e:
+                    logger.warning(f"Discord gateway connection lost: {e}")
+                if self._stop.is_set():
+                    break
+                # Jittered exponential backoff between reconnects
+                delay = backoff * (0.5 + random.random() / 2)
+                backoff = min(backoff * 2, self.max_backoff_seconds)
+                try:
+                    await asyncio.wait_for(self._stop.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        self._loop = None
+
+    # -------------------------------------------------------------- connection
+
+    async def _connect(self, http: aiohttp.ClientSession):
+        resuming = bool(self.session_id and self.resume_url)
+        url = self.resume_url if resuming else self.url
+        async with http.ws_connect(url, heartbeat=None, max_msg_size=0) as ws:
+            self._ws = ws
+            self.connects += 1
+            hello = await self._receive(ws)
+            if hello is None or hello.get("op") != OP_HELLO:
+                raise ConnectionError("no HELLO from gateway")
+            interval = hello["d"]["heartbeat_interval"] / 1000
+            acked = asyncio.Event()
+            acked.set()
+            heartbeat = asyncio.create_task(self._heartbeat(ws, interval, acked))
+            try:
+                if resuming:
+                    await self._send(ws, OP_RESUME, {
+                        "token": self.token, "session_id": self.session_id, "seq": self.sequence,
+                    })
+                else:
+                    await self._identify(ws)
+                await self._read(ws, http, acked)
+            finally:
+                heartbeat.cancel()
+                self._ws = None
+            if ws.close_code in FATAL_CLOSE_CODES:
+                raise GatewayFatalError(f"closed with code {ws.close_code}")
+
+    async def _identify(self, ws):
+        await self._send(ws, OP_IDENTIFY, {
+            "token": self.token,
+            "intents": self.intents,
+            "properties": {"os": "linux", "browser": "social-monitor", "device": "social-monitor"},
+        })
+
+    async def _read(self, ws, http: aiohttp.ClientSession, acked: asyncio.Event):
+        stop_wait = asyncio.create_task(self._stop.wait())
+        try:
+            while True:
+                receive = asyncio.create_task(self._receive(ws))
+                done, _ = await asyncio.wait({receive, stop_wait}, return_when=asyncio.FIRST_COMPLETED)
+                if stop_wait in done:
+                    receive.cancel()
+                    await ws.close()
+                    return
+                payload = receive.result()
+                if payload is None:
+                    return
+                op = payload.get("op")
+                if payload.get("s") is not None:
+                    self.sequence = payload["s"]
+
+                if op == OP_DISPATCH:
+                    await self._dispatch(payload.get("t"), payload.get("d") or {}, http)
+                elif op == OP_HEARTBEAT_ACK:
+                    acked.set()
+                elif op == OP_HEARTBEAT:
+                    await self._send(ws, OP_HEARTBEAT, self.sequence)
+                elif op == OP_RECONNECT:
+                    logger.info("Discord gateway asked to reconnect")
+                    await ws.close(code=4000)
+                    return
+                elif op == OP_INVALID_SESSION:
+                    if not payload.get("d"):
+                        # Not resumable: the next connect identifies a new session
+                        self.session_id = self.resume_url = None
+                        self.sequence = None
+                    await ws.close(code=4000)
+                    return
+        finally:
+            stop_wait.cancel()
+
+    async def _dispatch(self, event: str, data: Dict[str, Any], http: aiohttp.ClientSession):
+        if event == "READY":
+            self.session_id = data.get("session_id")
+            resume = data.get("resume_gateway_url")
+            self.resume_url = f"{resume.rstrip('/')}/?v=10&encoding=json" if resume else self.url
+            logger.info("Discord gateway session ready; backfilling over REST")
+            try:
+                await self.backfill(http)
+            except Exception as e:
+                logger.warning(f"Discord backfill failed: {e}")
+            self.ready.set()
+        elif event == "RESUMED":
+            self.resumes += 1
+            logger.info("Discord gateway session resumed")
+        elif event == "MESSAGE_CREATE":
+            if str(data.get("channel_id")) in self.channel_ids:
+                self.on_message(data)
+
+    async def _heartbeat(self, ws, interval: float, acked: asyncio.Event):
+        # First beat after interval * jitter, as the gateway asks
+        await asyncio.sleep(interval * random.random())
+        while not ws.closed:
+            if not acked.is_set():
+                logger.warning("Discord gateway missed a heartbeat ACK; reconnecting")
+                await ws.close(code=4000)
+                return
+            acked.clear()
+            await self._send(ws, OP_HEARTBEAT, self.sequence)
+            await asyncio.sleep(interval)
+
+    @staticmethod
+    async def _send(ws, op: int, data: Any):
+        await ws.send_str(json.dumps({"op": op, "d": data}))
+
+    @staticmethod
+    async def _receive(ws) -> Optional[Dict[str, Any]]:
+        message = await ws.receive()
+        if message.type == aiohttp.WSMsgType.TEXT:
+            return json.loads(message.data)
+        if message.type == aiohttp.WSMsgType.BINARY:
+            return json.loads(message.data.decode("utf-8"))
+        return None
+
+
+class MessageBuffer:
+    """Thread-safe bounded buffer between the gateway thread and the fetch cycle."""
+
+    def __init__(self, maxlen: int = 10000):
+        self._items: Deque[Any] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def append(self, item: Any):
+        with self._lock:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+
+    def drain(self) -> List[Any]:
+        with self._lock:
+            items = list(self._items)
+            self._items.clear()
+        return items
@@ -1,66 +1,199 @@
 """Hacker News adapter using free Algolia API."""
+import json
 import logging
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
 
+from . import http
 from .base import BaseAdapter, Post
+from .query_planner import attribute_keywords
 
 logger = logging.getLogger(__name__)
 
+# Listing fields kept in two-phase mode: everything but the text (and no highlight copies)
+LISTING_ATTRIBUTES = [
+    "objectID", "title", "url", "author", "created_at_i", "_tags",
+    "points", "num_comments", "story_id", "story_title",
+]
+
 
 class HackerNewsAdapter(BaseAdapter):
-    """Adapter for Hacker News using Algolia search API."""
+    """
+    Adapter for Hacker News using Algolia search API.
+    
+    Algolia has no OR between phrases, so each keyword is one query, but
+    all search types are covered by one request (`tags=(story,comment)`).
+    With `algolia.app_id`/`algolia.api_key` configured, the per-keyword
+    queries are sent together through Algolia's multi-query endpoint.
+    
+    With `two_phase` (the default) searches return listings without text.
+    Each distinct hit's text is then looked up once on the HN item API
+    (cached across cycles); link stories have no text and are not looked up.
+    """
     
     SEARCH_URL = "https://hn.algolia.com/api/v1/search_by_date"
+    MULTI_QUERY_URL = "https://{}-dsn.algolia.net/1/indexes/*/queries"
     ITEM_URL = "https://news.ycombinator.com/item?id={}"
+    ITEM_API_URL = "https://hacker-news.firebaseio.com/v0/item/{}.json"
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.search_types = config.get("search_types", ["story", "comment"])
         self.results_per_search = config.get("results_per_search", 50)
+        self.algolia = config.get("algolia", {})
+        
+        # Listings first, text only for distinct hits not seen before
+        self.two_phase = config.get("two_phase", True)
+        self.body_workers = config.get("body_workers", 8)
+        self.body_cache_size = config.get("body_cache_size", 5000)
+        self._bodies: Dict[str, str] = {}  # objectID -> text
     
     @property
     def platform_name(self) -> str:
         return "hackernews"
     
-    def fetch_posts(self, keywords: List[str]) -> List[Post]:
-        """Fetch matching posts from Hacker News."""
+    def fetch_posts(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[Post]:
+        """Fetch matching posts from Hacker News (`since` is applied by Algolia)."""
         if not self.enabled:
             return []
         
         posts = []
-        seen_ids = set()
+        hits: Dict[str, Tuple[Dict, str]] = {}  # objectID -> (hit, first keyword that found it)
+        
+        for keyword, results in self._search_all(keywords, self._params(since, limit)):
+            self.items_fetched += len(results)
+            for item in results:
+                hits.setdefault(str(item.get("objectID", "")), (item, keyword))
+        
+        if self.two_phase:
+            self._fill_bodies([item for item, _ in hits.values()])
+        
+        for item, keyword in hits.values():
+            post = self._item_to_post(item, keyword)
+            if post:
+                # Credit every keyword the hit contains, not just the query's
+                post.matched_keywords = attribute_keywords(post.full_text, keywords) or [keyword]
+                posts.append(post)
+        
+        # Search hits already match their keyword
+        self._archive_posts(posts)
+        logger.info(f"Hacker News: {len(posts)} posts found")
+        return posts
+    
+    def _search_all(self, keywords: List[str], params: Dict[str, Any]) -> Iterator[Tuple[str, List[Dict]]]:
+        """Yield (keyword, hits) for every keyword, batched when Algolia credentials are set."""
+        if self.algolia.get("app_id") and self.algolia.get("api_key"):
+            batch_size = self.algolia.get("batch_size", 50)
+            pending = list(keywords)
+            while pending:
+                batch, pending = pending[:batch_size], pending[batch_size:]
+                try:
+                    yield from zip(batch, self._multi_search(batch, params))
+                except Exception as e:
+                    # Fall back to the public API for this batch and the rest
+                    logger.warning(f"HN multi-query failed, using per-keyword search: {e}")
+                    pending = batch + pending
+                    break
+            keywords = pending
         
-        # Search for each keyword
         for keyword in keywords:
             try:
-                for search_type in self.search_types:
-                    results = self._search(keyword, search_type)
-                    for item in results:
-                        post = self._item_to_post(item, keyword)
-                        if post and post.id not in seen_ids:
-                            seen_ids.add(post.id)
-                            posts.append(post)
+                yield keyword, self._search(keyword, params)
             except Exception as e:
                 logger.error(f"HN search error for '{keyword}': {e}")
-        
-        logger.info(f"Hacker News: {len(posts)} posts found")
-        return posts
     
-    def _search(self, query: str, tags: str) -> List[Dict]:
+    def _params(self, since: Optional[datetime], limit: Optional[int]) -> Dict[str, Any]:
+        """Search parameters shared by every keyword query of a cycle."""
+        # Algolia tag filters OR the types in parentheses: one request covers all of them
+        if len(self.search_types) == 1:
+            tags = self.search_types[0]
+        else:
+            tags = f"({','.join(self.search_types)})"
+        # Same quota as one request per type had; Algolia caps a page at 1000
+        hits = min(self._page_size(self.results_per_search * len(self.search_types), limit), 1000)
+        params = {"tags": tags, "hitsPerPage": hits}
+        if self.two_phase:
+            params["attributesToRetrieve"] = json.dumps(LISTING_ATTRIBUTES)
+            params["attributesToHighlight"] = "[]"
+        if since is not None:
+            params["numericFilters"] = f"created_at_i>{int(since.timestamp())}"
+        return params
+    
+    def _search(self, query: str, params: Dict[str, Any]) -> List[Dict]:
         """Search HN using Algolia API."""
-        params = {
-            "query": query,
-            "tags": tags,
-            "hitsPerPage": self.results_per_search,
-        }
+        params = {"query": query, **params}
         
-        response = requests.get(self.SEARCH_URL, params=params, timeout=15)
+        response = http.get(self.SEARCH_URL, params=params, timeout=15)
         response.raise_for_status()
         data = response.json()
         return data.get("hits", [])
     
+    def _multi_search(self, keywords: List[str], params: Dict[str, Any]) -> List[List[Dict]]:
+        """Run one query per keyword in a single Algolia multi-query request."""
+        index = self.algolia.get("index", "Item_production_sort_date")
+        requests = [
+            {"indexName": index, "params": urlencode({"query": keyword, **params})}
+            for keyword in keywords
+        ]
+        response = http.post(
+            self.MULTI_QUERY_URL.format(self.algolia["app_id"].lower()),
+            json={"requests": requests},
+            headers={
+                "X-Algolia-Application-Id": self.algolia["app_id"],
+                "X-Algolia-API-Key": self.algolia["api_key"],
+            },
+            timeout=30,
+        )
+        response.raise_for_status()
+        results = response.json().get("results", [])
+        if len(results) != len(keywords):
+            raise ValueError(f"{len(results)} results for {len(keywords)} queries")
+        return [result.get("hits", []) for result in results]
+    
+    def _fill_bodies(self, items: List[Dict]):
+        """Set the text of listed hits from the cache or HN item lookups (run concurrently)."""
+        missing = []
+        for item in items:
+            # Link stories carry no text of their own; skip hits that came with it anyway
+            if "story" in item.get("_tags", []) and item.get("url"):
+                continue
+            if item.get("comment_text") is not None or item.get("story_text") is not None:
+                continue
+            text = self._bodies.get(str(item.get("objectID")))
+            if text is None:
+                missing.append(item)
+            else:
+                self._set_text(item, text)
+        
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.body_workers) as pool:
+                for item, text in zip(missing, pool.map(self._fetch_text, missing)):
+                    if text is not None:
+                        self._bodies[str(item.get("objectID"))] = text
+                        self._set_text(item, text)
+        
+        # Oldest first out
+        while len(self._bodies) > self.body_cache_size:
+            del self._bodies[next(iter(self._bodies))]
+    
+    def _fetch_text(self, item: Dict) -> Optional[str]:
+        try:
+            response = http.get(self.ITEM_API_URL.format(item.get("objectID")), timeout=10)
+            response.raise_for_status()
+            return (response.json() or {}).get("text", "")
+        except Exception as e:
+            logger.debug(f"HN item {item.get('objectID')} lookup error: {e}")
+            return None
+    
+    @staticmethod
+    def _set_text(item: Dict, text: str):
+        is_comment = "comment" in item.get("_tags", [])
+        item["comment_text" if is_comment else "story_text"] = text
+    
     def _item_to_post(self, item: Dict, matched_keyword: str) -> Post:
         """Convert HN item to Post object."""
         try:
@@ -0,0 +1,66 @@
+"""Shared HTTP helpers for adapters (traced as `http` spans)."""
+from typing import Any
+from urllib.parse import urlsplit
+
+import feedparser
+import requests
+
+from services.cassette import get_cassette
+from services.tracing import get_tracer
+
+
+def _span_name(method: str, url: str) -> str:
+    parts = urlsplit(url)
+    return f"{method} {parts.netloc}{parts.path}"
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """`requests.get` wrapped in a tracing span (status and size recorded)."""
+    with get_tracer().span(_span_name("GET", url), "http", method="GET", url=url) as span:
+        cassette = get_cassette()
+        if cassette:
+            response = cassette.http("GET", url, lambda: requests.get(url, **kwargs), params=kwargs.get("params"))
+        else:
+            response = requests.get(url, **kwargs)
+        span.set(status=response.status_code, bytes=len(response.content))
+        if response.status_code >= 400:
+            span.outcome = "http_error"
+        return response
+
+
+def post(url: str, json: Any = None, **kwargs) -> requests.Response:
+    """`requests.post` with a JSON body, wrapped in a tracing span."""
+    with get_tracer().span(_span_name("POST", url), "http", method="POST", url=url) as span:
+        cassette = get_cassette()
+        send = lambda: requests.post(url, json=json, **kwargs)
+        if cassette:
+            response = cassette.http("POST", url, send, params=kwargs.get("params"), body=json)
+        else:
+            response = send()
+        span.set(status=response.status_code, bytes=len(response.content))
+        if response.status_code >= 400:
+            span.outcome = "http_error"
+        return response
+
+
+def parse_feed(url: str, **kwargs) -> Any:
+    """
+    `feedparser.parse` on a URL (feedparser does the fetch) wrapped in a span.
+    
+    With a cassette active the feed is fetched with `requests` (feedparser's
+    User-Agent) so the raw document can be recorded and replayed.
+    """
+    with get_tracer().span(_span_name("GET", url), "http", method="GET", url=url) as span:
+        cassette = get_cassette()
+        if cassette:
+            request_headers = {"User-Agent": feedparser.USER_AGENT}
+            response = cassette.http("GET", url, lambda: requests.get(url, headers=request_headers, timeout=30))
+            response_headers = {k.lower(): v for k, v in response.headers.items()}
+            feed = feedparser.parse(response.content, response_headers=response_headers, **kwargs)
+            feed["status"] = response.status_code
+        else:
+            feed = feedparser.parse(url, **kwargs)
+        span.set(status=feed.get("status"), entries=len(feed.entries))
+        if feed.bozo:
+            span.outcome = "parse_error"
+        return feed
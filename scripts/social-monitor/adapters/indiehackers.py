@@ -1,13 +1,13 @@
 """Indie Hackers adapter - startup/business leadership discussions."""
 import logging
 import feedparser
-import requests
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from typing import Any, Dict, List, Optional
 from email.utils import parsedate_to_datetime
 import re
 
-from .base import BaseAdapter, Post
+from . import http
+from .base import BaseAdapter, Post, stable_id
 
 logger = logging.getLogger(__name__)
 
@@ -26,22 +26,24 @@ class IndieHackersAdapter(BaseAdapter):
     def platform_name(self) -> str:
         return "indiehackers"
     
-    def fetch_posts(self, keywords: List[str]) -> List[Post]:
-        """Fetch posts from Indie Hackers."""
+    def fetch_posts(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[Post]:
+        """Fetch posts from Indie Hackers, reading the feed only down to `since`."""
         if not self.enabled:
             return []
         
         posts = []
         
         try:
-            response = requests.get(self.FEED_URL, timeout=15, headers={
+            response = http.get(self.FEED_URL, timeout=15, headers={
                 "User-Agent": "Mozilla/5.0 (compatible; LeaderReps/1.0)"
             })
             response.raise_for_status()
             
             feed = feedparser.parse(response.content)
             
-            for entry in feed.entries[:self.posts_limit]:
+            for entry in self._fresh_entries(feed.entries, since, self._page_size(self.posts_limit, limit)):
                 post = self._entry_to_post(entry)
                 if post and self._matches_keywords(post, keywords):
                     posts.append(post)
@@ -71,7 +73,7 @@ class IndieHackersAdapter(BaseAdapter):
                 content = re.sub(r'<[^>]+>', '', entry["summary"])[:500]
             
             return Post(
-                id=f"ih_{hash(post_id) % 10**10}",
+                id=f"ih_{stable_id(post_id)}",
                 platform="indiehackers",
                 title=entry.get("title", ""),
                 content=content,
@@ -86,7 +88,9 @@ class IndieHackersAdapter(BaseAdapter):
     
     def _matches_keywords(self, post: Post, keywords: List[str]) -> bool:
         """Check if post matches keywords."""
+        self.items_fetched += 1
         if not post:
             return False
+        self._archive_posts([post])
         text = f"{post.title} {post.content}".lower()
         return any(kw.lower() in text for kw in keywords)
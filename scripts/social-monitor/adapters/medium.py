@@ -1,12 +1,12 @@
 """Medium adapter using RSS feeds from leadership publications."""
 import logging
 import feedparser
-import requests
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from typing import Any, Dict, List, Optional
 from email.utils import parsedate_to_datetime
 
-from .base import BaseAdapter, Post
+from . import http
+from .base import BaseAdapter, Post, stable_id
 
 logger = logging.getLogger(__name__)
 
@@ -42,59 +42,92 @@ class MediumAdapter(BaseAdapter):
     def platform_name(self) -> str:
         return "medium"
     
-    def fetch_posts(self, keywords: List[str]) -> List[Post]:
-        """Fetch articles from Medium publications and tags."""
+    def fetch_posts(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[Post]:
+        """Fetch articles from Medium publications and tags, reading each feed only down to `since`."""
         if not self.enabled:
             return []
         
         posts = []
         seen_ids = set()
         
+        # Entries pushed by WebSub hubs since the last cycle (tag feeds are not keyword-filtered)
+        for source, post in self._drain_pushed():
+            if post.id in seen_ids or self._is_stale(post.created_at, since):
+                continue
+            if source.startswith("tag:"):
+                self._note_fetched(post)
+            elif not self._matches_keywords(post, keywords):
+                continue
+            seen_ids.add(post.id)
+            posts.append(post)
+        
         # Fetch from publications
         for pub in self.publications:
+            if not self._feed_needs_poll(self.FEED_URL.format(publication=pub)):
+                continue
+            if not self._source_due(pub, None):
+                continue
             try:
-                feed_posts = self._fetch_feed(self.FEED_URL.format(publication=pub), pub)
-                for post in feed_posts:
-                    if post.id not in seen_ids and self._matches_keywords(post, keywords):
-                        seen_ids.add(post.id)
-                        posts.append(post)
+                feed_posts = self._fetch_feed(self.FEED_URL.format(publication=pub), pub, since, limit)
             except Exception as e:
                 logger.debug(f"Medium pub '{pub}' error: {e}")
+                self._release_source(pub)
+                continue
+            self._record_source_poll(pub, feed_posts)
+            for post in feed_posts:
+                if post.id not in seen_ids and self._matches_keywords(post, keywords):
+                    seen_ids.add(post.id)
+                    posts.append(post)
         
         # Fetch from tags
         if self.include_tags:
             for tag in self.tags:
+                if not self._feed_needs_poll(self.TAG_FEED_URL.format(tag=tag)):
+                    continue
+                if not self._source_due(f"tag:{tag}", None):
+                    continue
                 try:
-                    feed_posts = self._fetch_feed(self.TAG_FEED_URL.format(tag=tag), f"tag:{tag}")
-                    for post in feed_posts:
-                        if post.id not in seen_ids:
-                            seen_ids.add(post.id)
-                            posts.append(post)
+                    feed_posts = self._fetch_feed(self.TAG_FEED_URL.format(tag=tag), f"tag:{tag}", since, limit)
                 except Exception as e:
                     logger.debug(f"Medium tag '{tag}' error: {e}")
+                    self._release_source(f"tag:{tag}")
+                    continue
+                self._record_source_poll(f"tag:{tag}", feed_posts)
+                for post in feed_posts:
+                    if post.id not in seen_ids:
+                        self._note_fetched(post)
+                        seen_ids.add(post.id)
+                        posts.append(post)
         
         logger.info(f"Medium: {len(posts)} articles found")
         return posts
     
-    def _fetch_feed(self, url: str, source: str) -> List[Post]:
-        """Fetch and parse an RSS feed."""
+    def _fetch_feed(
+        self, url: str, source: str, since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[Post]:
+        """
+        Fetch and parse an RSS feed (newest first), stopping at the first entry older than `since`.
+        
+        Raises:
+            requests.RequestException: If the feed could not be fetched
+        """
         posts = []
         
-        try:
-            response = requests.get(url, timeout=10, headers={
-                "User-Agent": "Mozilla/5.0 (compatible; LeaderReps/1.0)"
-            })
-            response.raise_for_status()
-            
-            feed = feedparser.parse(response.content)
-            
-            for entry in feed.entries[:20]:  # Limit per feed
-                post = self._entry_to_post(entry, source)
-                if post:
-                    posts.append(post)
-                    
-        except Exception as e:
-            logger.debug(f"Feed fetch error for {url}: {e}")
+        response = http.get(url, timeout=10, headers={
+            "User-Agent": "Mozilla/5.0 (compatible; LeaderReps/1.0)"
+        })
+        response.raise_for_status()
+        
+        feed = feedparser.parse(response.content)
+        
+        for entry in self._fresh_entries(feed.entries, since, self._page_size(20, limit)):  # Limit per feed
+            post = self._entry_to_post(entry, source)
+            if post:
+                posts.append(post)
+        
+        self._watch_feed(url, feed, response, source, self._entry_to_post, 20)
         
         return posts
     
@@ -122,7 +155,7 @@ class MediumAdapter(BaseAdapter):
                 content = re.sub(r'<[^>]+>', '', entry["summary"])[:500]
             
             return Post(
-                id=f"medium_{hash(post_id) % 10**10}",
+                id=f"medium_{stable_id(post_id)}",
                 platform="medium",
                 title=entry.get("title", ""),
                 content=content,
@@ -138,7 +171,13 @@ class MediumAdapter(BaseAdapter):
             logger.debug(f"Error parsing Medium entry: {e}")
             return None
     
+    def _note_fetched(self, post: Post):
+        """Count and archive a parsed article, whether or not it is keyword-filtered."""
+        self.items_fetched += 1
+        self._archive_posts([post])
+    
     def _matches_keywords(self, post: Post, keywords: List[str]) -> bool:
         """Check if post matches any keywords."""
+        self._note_fetched(post)
         text = f"{post.title} {post.content}".lower()
         return any(kw.lower() in text for kw in keywords)
@@ -0,0 +1,125 @@
+"""Keyword planning for search adapters: packed queries, hit attribution, listing pre-match."""
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional
+
+
+@dataclass
+class PlannedQuery:
+    """One search request and the keywords it covers."""
+
+    query: str
+    keywords: List[str] = field(default_factory=list)
+
+
+def _normalize(text: str) -> str:
+    # Search engines tokenize on punctuation: "first-time manager" matches "first time manager"
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def plan_or_queries(
+    keywords: Iterable[str],
+    max_length: int,
+    suffix: str = "",
+    max_terms: Optional[int] = None,
+    render: Callable[[str], str] = lambda kw: f'"{kw}"',
+    joiner: str = " OR ",
+) -> List[PlannedQuery]:
+    """
+    Pack keywords into as few OR queries as fit the API's limits.
+
+    Keywords are taken in order and added to the current query until the
+    next one would make it longer than `max_length` (suffix included) or
+    exceed `max_terms`. A keyword too long to fit on its own still gets a
+    query of its own, so no keyword is dropped.
+
+    Args:
+        keywords: Keywords to cover (duplicates are ignored)
+        max_length: Longest query string the API accepts
+        suffix: Operators appended to every query (e.g. " -is:retweet")
+        max_terms: Cap on keywords per query (None = length only)
+        render: Formats one keyword as a query term (quoted phrase by default)
+        joiner: Operator between terms
+
+    Returns:
+        Planned queries, each with the keywords it covers
+    """
+    plans: List[PlannedQuery] = []
+    terms: List[str] = []
+    covered: List[str] = []
+    seen = set()
+
+    def flush():
+        if terms:
+            plans.append(PlannedQuery(joiner.join(terms) + suffix, list(covered)))
+            terms.clear()
+            covered.clear()
+
+    for keyword in keywords:
+        if keyword.lower() in seen:
+            continue
+        seen.add(keyword.lower())
+        term = render(keyword)
+        length = len(joiner.join(terms + [term]) + suffix)
+        if terms and (length > max_length or (max_terms and len(terms) >= max_terms)):
+            flush()
+        terms.append(term)
+        covered.append(keyword)
+    flush()
+    return plans
+
+
+def attribute_keywords(text: str, keywords: Iterable[str]) -> List[str]:
+    """
+    Keywords a search hit actually contains.
+
+    Matching is case-insensitive and ignores punctuation, the way the
+    search APIs tokenize, so a hit returned by a packed query is credited
+    to every keyword it contains rather than to the query as a whole.
+
+    Args:
+        text: Hit text (title and body)
+        keywords: Candidate keywords
+
+    Returns:
+        Matching keywords, in the given order
+    """
+    haystack = f" {_normalize(text)} "
+    return [kw for kw in keywords if f" {_normalize(kw)} " in haystack]
+
+
+# Listing pre-match verdicts (see prematch)
+MATCH = "match"
+AMBIGUOUS = "ambiguous"
+MISS = "miss"
+
+# Keyword words shorter than this ("new", "360", "EQ") are too common to flag a listing
+MIN_SIGNIFICANT_WORD = 4
+
+
+def prematch(text: str, keywords: Iterable[str]) -> str:
+    """
+    Classify a listing (title, tags) before its body is downloaded.
+
+    MATCH: the listing already contains a keyword. AMBIGUOUS: it shares a
+    significant word with some keyword ("manager" for "new manager"), so
+    the body may complete the match. MISS: neither; the body is not
+    worth fetching.
+
+    Args:
+        text: Listing text (title and tags)
+        keywords: Keywords being matched
+
+    Returns:
+        MATCH, AMBIGUOUS or MISS
+    """
+    keywords = list(keywords)
+    if attribute_keywords(text, keywords):
+        return MATCH
+    # Substrings, like the adapters' own matching ("feedbacks" still flags "360 feedback")
+    haystack = _normalize(text)
+    for keyword in keywords:
+        words = [w for w in _normalize(keyword).split() if len(w) >= MIN_SIGNIFICANT_WORD] or [_normalize(keyword)]
+        if any(word and word in haystack for word in words):
+            return AMBIGUOUS
+    return MISS
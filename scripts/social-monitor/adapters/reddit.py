@@ -1,11 +1,10 @@
 """Reddit adapter using RSS feeds (no API key required)."""
 import logging
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterator, List, Optional
 from time import mktime
 
-import feedparser
-
+from . import http
 from .base import BaseAdapter, Post
 
 logger = logging.getLogger(__name__)
@@ -28,45 +27,70 @@ class RedditAdapter(BaseAdapter):
     def platform_name(self) -> str:
         return "reddit"
     
-    def fetch_posts(self, keywords: List[str]) -> List[Post]:
+    def fetch_posts(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[Post]:
         """
         Fetch posts from configured subreddits via RSS.
         
         Args:
             keywords: Keywords for filtering (filtering done after fetch)
+            since: Skip entries created at or before this time
+            limit: Most entries to take per subreddit
         
         Returns:
             List of Post objects matching keywords
         """
+        return list(self.iter_posts(keywords, since, limit))
+    
+    def iter_posts(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> Iterator[Post]:
+        """
+        Yield keyword-matched posts subreddit by subreddit.
+        
+        Args:
+            keywords: Keywords for filtering
+            since: Skip entries created at or before this time
+            limit: Most entries to take per subreddit
+        """
         if not self.is_enabled():
             logger.info("Reddit adapter is disabled")
-            return []
+            return
         
         subreddits = self.config.get("subreddits", [])
         feed_type = self.config.get("feed_type", "new")
-        posts_per_sub = self.config.get("posts_per_subreddit", 25)
+        posts_per_sub = self._page_size(self.config.get("posts_per_subreddit", 25), limit)
         
-        all_posts = []
+        total = 0
+        matched = 0
         
         for subreddit in subreddits:
+            if not self._source_due(subreddit, None):
+                continue
             try:
-                posts = self._fetch_subreddit(subreddit, feed_type, posts_per_sub)
-                all_posts.extend(posts)
+                posts = self._fetch_subreddit(subreddit, feed_type, posts_per_sub, since)
                 logger.debug(f"Fetched {len(posts)} posts from r/{subreddit}")
             except Exception as e:
                 logger.error(f"Error fetching r/{subreddit}: {e}")
-        
-        # Filter by keywords
-        matched = self.filter_by_keywords(all_posts, keywords)
-        logger.info(f"Reddit: {len(matched)} posts matched keywords out of {len(all_posts)} total")
-        
-        return matched
+                self._release_source(subreddit)
+                continue
+            self._record_source_poll(subreddit, posts)
+            
+            # Filter by keywords
+            hits = self.filter_by_keywords(posts, keywords)
+            total += len(posts)
+            matched += len(hits)
+            yield from hits
+        
+        logger.info(f"Reddit: {matched} posts matched keywords out of {total} total")
     
     def _fetch_subreddit(
         self, 
         subreddit: str, 
         feed_type: str, 
-        limit: int
+        limit: int,
+        since: Optional[datetime] = None
     ) -> List[Post]:
         """
         Fetch posts from a single subreddit.
@@ -75,6 +99,8 @@ class RedditAdapter(BaseAdapter):
             subreddit: Subreddit name (without /r/)
             feed_type: 'new' or 'hot'
             limit: Maximum posts to return
+            since: Skip entries created at or before this time (the
+                'new' feed is read only down to the first one)
         
         Returns:
             List of Post objects
@@ -82,15 +108,18 @@ class RedditAdapter(BaseAdapter):
         url = self.RSS_BASE_URL.format(subreddit=subreddit, feed_type=feed_type)
         
         # feedparser handles the HTTP request
-        feed = feedparser.parse(url)
+        feed = http.parse_feed(url)
         
+        if feed.bozo and not feed.entries:
+            # Nothing usable came back (network error, rate limit page...)
+            raise ValueError(f"unreadable feed: {feed.bozo_exception}")
         if feed.bozo:
             # bozo flag indicates parsing issues
             logger.warning(f"Feed parsing issue for r/{subreddit}: {feed.bozo_exception}")
         
         posts = []
         
-        for entry in feed.entries[:limit]:
+        for entry in self._fresh_entries(feed.entries, since, limit, newest_first=feed_type == "new"):
             try:
                 post = self._parse_entry(entry, subreddit)
                 posts.append(post)
@@ -0,0 +1,57 @@
+"""Adapter registry: config section -> adapter class, imported on first use."""
+import importlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Type
+
+from .base import BaseAdapter
+
+
+@dataclass(frozen=True)
+class AdapterSpec:
+    """How to find, enable and construct one adapter."""
+
+    section: str                      # Config section name
+    module: str                       # Module under adapters/
+    class_name: str
+    label: str                        # Shown in logs
+    enabled_by_default: bool = False
+    api_keys: Optional[str] = None    # api_keys.<name> passed in as config["api_keys"]
+
+    def load(self) -> Type[BaseAdapter]:
+        """Import the adapter module (and its dependencies) and return the class."""
+        module = importlib.import_module(f"{__package__}.{self.module}")
+        return getattr(module, self.class_name)
+
+    def is_enabled(self, config: Dict[str, Any]) -> bool:
+        return config.get(self.section, {}).get("enabled", self.enabled_by_default)
+
+    def create(self, config: Dict[str, Any]) -> BaseAdapter:
+        """Construct the adapter from the full monitor config."""
+        section = config.get(self.section, {})
+        if self.api_keys:
+            section["api_keys"] = config.get("api_keys", {}).get(self.api_keys, {})
+        return self.load()(section)
+
+
+# In polling order
+ADAPTERS: List[AdapterSpec] = [
+    AdapterSpec("reddit", "reddit", "RedditAdapter", "Reddit", enabled_by_default=True),
+    AdapterSpec("twitter", "twitter", "TwitterAdapter", "Twitter", api_keys="twitter"),
+    AdapterSpec("discord", "discord", "DiscordAdapter", "Discord"),
+    AdapterSpec("hackernews", "hackernews", "HackerNewsAdapter", "Hacker News"),
+    AdapterSpec("medium", "medium", "MediumAdapter", "Medium"),
+    AdapterSpec("devto", "devto", "DevToAdapter", "Dev.to"),
+    AdapterSpec("stackexchange", "stackexchange", "StackExchangeAdapter", "Stack Exchange"),
+    AdapterSpec("rss_feeds", "rssfeeds", "RSSAdapter", "RSS Feeds"),
+    AdapterSpec("indiehackers", "indiehackers", "IndieHackersAdapter", "Indie Hackers"),
+    # Load and soak testing only
+    AdapterSpec("synthetic", "synthetic", "SyntheticAdapter", "Synthetic"),
+]
+
+ADAPTERS_BY_SECTION: Dict[str, AdapterSpec] = {spec.section: spec for spec in ADAPTERS}
+ADAPTERS_BY_CLASS: Dict[str, AdapterSpec] = {spec.class_name: spec for spec in ADAPTERS}
+
+
+def create_enabled_adapters(config: Dict[str, Any]) -> List[BaseAdapter]:
+    """Import and construct only the adapters enabled in `config`, in registry order."""
+    return [spec.create(config) for spec in ADAPTERS if spec.is_enabled(config)]
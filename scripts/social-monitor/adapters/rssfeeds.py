@@ -1,13 +1,13 @@
 """Generic RSS adapter for leadership blogs and newsletters."""
 import logging
 import feedparser
-import requests
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterator, List, Optional
 from email.utils import parsedate_to_datetime
 import re
 
-from .base import BaseAdapter, Post
+from . import http
+from .base import BaseAdapter, Post, stable_id
 
 logger = logging.getLogger(__name__)
 
@@ -50,32 +50,69 @@ class RSSAdapter(BaseAdapter):
     def platform_name(self) -> str:
         return "rss"
     
-    def fetch_posts(self, keywords: List[str]) -> List[Post]:
+    def fetch_posts(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[Post]:
         """Fetch articles from RSS feeds."""
+        return list(self.iter_posts(keywords, since, limit))
+    
+    def iter_posts(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> Iterator[Post]:
+        """Yield matching articles feed by feed, reading each feed only down to `since`."""
         if not self.enabled:
-            return []
+            return
         
-        posts = []
+        count = 0
         seen_ids = set()
         
+        # Entries pushed by WebSub hubs since the last cycle
+        for _, post in self._drain_pushed():
+            if self._is_stale(post.created_at, since):
+                continue
+            if post.id not in seen_ids and self._matches_keywords(post, keywords):
+                seen_ids.add(post.id)
+                count += 1
+                yield post
+        
         for feed_config in self.feeds:
+            # Feeds with a verified WebSub subscription are pushed, not polled
+            if not self._feed_needs_poll(feed_config.get("url", "")):
+                continue
+            # Feeds may set their own polling interval (e.g. hourly for slow publishers)
+            if not self._source_due(
+                feed_config.get("url", ""),
+                feed_config.get("interval_seconds"),
+                feed_config.get("jitter_seconds", 0),
+            ):
+                continue
             try:
-                feed_posts = self._fetch_feed(feed_config)
-                for post in feed_posts:
-                    if post and post.id not in seen_ids:
-                        # For curated feeds, include all (they're pre-filtered by source)
-                        # But still filter by keywords for broader feeds
-                        if self._matches_keywords(post, keywords):
-                            seen_ids.add(post.id)
-                            posts.append(post)
+                feed_posts = self._fetch_feed(feed_config, since, limit)
             except Exception as e:
                 logger.debug(f"RSS feed '{feed_config.get('name', feed_config.get('url'))}' error: {e}")
+                self._release_source(feed_config.get("url", ""))
+                continue
+            self._record_source_poll(feed_config.get("url", ""), feed_posts)
+            for post in feed_posts:
+                if post and post.id not in seen_ids:
+                    # For curated feeds, include all (they're pre-filtered by source)
+                    # But still filter by keywords for broader feeds
+                    if self._matches_keywords(post, keywords):
+                        seen_ids.add(post.id)
+                        count += 1
+                        yield post
         
-        logger.info(f"RSS Feeds: {len(posts)} articles found")
-        return posts
+        logger.info(f"RSS Feeds: {count} articles found")
     
-    def _fetch_feed(self, feed_config: Dict) -> List[Post]:
-        """Fetch and parse an RSS feed."""
+    def _fetch_feed(
+        self, feed_config: Dict, since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[Post]:
+        """
+        Fetch and parse an RSS feed, stopping at the first entry older than `since`.
+        
+        Raises:
+            requests.RequestException: If the feed could not be fetched
+        """
         posts = []
         url = feed_config.get("url", "")
         name = feed_config.get("name", url)
@@ -83,21 +120,23 @@ class RSSAdapter(BaseAdapter):
         if not url:
             return posts
         
-        try:
-            response = requests.get(url, timeout=15, headers={
-                "User-Agent": "Mozilla/5.0 (compatible; LeaderReps/1.0)"
-            })
-            response.raise_for_status()
-            
-            feed = feedparser.parse(response.content)
-            
-            for entry in feed.entries[:self.posts_per_feed]:
-                post = self._entry_to_post(entry, name)
-                if post:
-                    posts.append(post)
-                    
-        except Exception as e:
-            logger.debug(f"Feed fetch error for {name}: {e}")
+        response = http.get(url, timeout=15, headers={
+            "User-Agent": "Mozilla/5.0 (compatible; LeaderReps/1.0)"
+        })
+        response.raise_for_status()
+        
+        feed = feedparser.parse(response.content)
+        
+        entries = self._fresh_entries(
+            feed.entries, since, self._page_size(self.posts_per_feed, limit),
+            newest_first=feed_config.get("newest_first", True),
+        )
+        for entry in entries:
+            post = self._entry_to_post(entry, name)
+            if post:
+                posts.append(post)
+        
+        self._watch_feed(url, feed, response, name, self._entry_to_post, self.posts_per_feed)
         
         return posts
     
@@ -130,7 +169,7 @@ class RSSAdapter(BaseAdapter):
                 content = re.sub(r'<[^>]+>', '', entry["description"])[:500]
             
             return Post(
-                id=f"rss_{hash(post_id) % 10**10}",
+                id=f"rss_{stable_id(post_id)}",
                 platform="rss",
                 title=entry.get("title", ""),
                 content=content,
@@ -148,8 +187,10 @@ class RSSAdapter(BaseAdapter):
     
     def _matches_keywords(self, post: Post, keywords: List[str]) -> bool:
         """Check if post matches any keywords (loose match for curated sources)."""
+        self.items_fetched += 1
         if not post:
             return False
+        self._archive_posts([post])
         # For RSS feeds from leadership sources, be more permissive
         # Include if it has ANY leadership-adjacent content
         text = f"{post.title} {post.content}".lower()
@@ -1,13 +1,17 @@
 """Stack Exchange adapter for Workplace and related sites."""
 import logging
-import requests
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from typing import Any, Dict, List, Optional, Tuple
 
+from . import http
 from .base import BaseAdapter, Post
+from .query_planner import MISS, prematch
 
 logger = logging.getLogger(__name__)
 
+# Ids per /questions/{ids} request (the API maximum)
+BODY_BATCH_SIZE = 100
+
 
 class StackExchangeAdapter(BaseAdapter):
     """Adapter for Stack Exchange sites (Workplace, PM, etc.)."""
@@ -27,6 +31,11 @@ class StackExchangeAdapter(BaseAdapter):
         self.pagesize = config.get("pagesize", 30)
         self.api_key = config.get("api_key", "")  # Optional, increases quota
         
+        # Listings first, bodies only for candidates (see fetch_posts)
+        self.two_phase = config.get("two_phase", True)
+        self.body_cache_size = config.get("body_cache_size", 5000)
+        self._bodies: Dict[Tuple[str, int], Tuple[Any, str]] = {}  # (site, id) -> (edit version, body)
+        
         # Leadership-relevant tags to monitor
         self.tags = config.get("tags", [
             "management",
@@ -43,75 +52,136 @@ class StackExchangeAdapter(BaseAdapter):
     def platform_name(self) -> str:
         return "stackexchange"
     
-    def fetch_posts(self, keywords: List[str]) -> List[Post]:
-        """Fetch questions from Stack Exchange sites."""
+    def fetch_posts(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[Post]:
+        """
+        Fetch questions from Stack Exchange sites (`since` is applied by the API).
+        
+        With `two_phase` (the default) listings come without bodies. Tag
+        listings are kept whole, but a newest question whose title and tags
+        rule it out (see `prematch`) never has its body downloaded. Bodies
+        for the rest are fetched afterwards in batches of 100 ids, and
+        bodies of unedited questions are reused from earlier cycles.
+        """
         if not self.enabled:
             return []
         
         posts = []
         seen_ids = set()
+        window = self._window(since, limit)
         
         for site in self.sites:
-            # Fetch by tags (more targeted)
+            # (question, keyword-filtered?) - tag listings are more targeted and kept whole
+            listed = []
             for tag in self.tags:
                 try:
-                    tag_posts = self._fetch_by_tag(site, tag)
-                    for post in tag_posts:
-                        if post and post.id not in seen_ids:
-                            seen_ids.add(post.id)
-                            posts.append(post)
+                    listed.extend((q, False) for q in self._fetch_listing(site, window, tag))
                 except Exception as e:
                     logger.debug(f"SE {site}/{tag} error: {e}")
             
             # Also fetch newest questions and filter by keywords
             try:
-                newest = self._fetch_newest(site)
-                for post in newest:
-                    if post and post.id not in seen_ids and self._matches_keywords(post, keywords):
-                        seen_ids.add(post.id)
-                        posts.append(post)
+                listed.extend((q, True) for q in self._fetch_listing(site, window))
             except Exception as e:
                 logger.debug(f"SE {site} newest error: {e}")
+            
+            # Phase 1: one entry per question; decide which bodies are worth downloading
+            candidates = {}
+            for question, keyword_filtered in listed:
+                question_id = question.get("question_id")
+                if question_id in candidates or f"se_{site}_{question_id}" in seen_ids:
+                    continue
+                candidates[question_id] = (question, keyword_filtered)
+            if self.two_phase:
+                self._fill_bodies(site, [
+                    q for q, keyword_filtered in candidates.values()
+                    if not keyword_filtered or prematch(self._listing_text(q), keywords) != MISS
+                ])
+            
+            # Phase 2: full match (title, body, tags) for the keyword-filtered ones
+            for question, keyword_filtered in candidates.values():
+                post = self._question_to_post(question, site)
+                if not post:
+                    continue
+                if not keyword_filtered:
+                    # Tag listings are not keyword-filtered but are archived all the same
+                    self._note_fetched(post)
+                elif not self._matches_keywords(post, keywords):
+                    continue
+                seen_ids.add(post.id)
+                posts.append(post)
         
         logger.info(f"Stack Exchange: {len(posts)} questions found")
         return posts
     
-    def _fetch_by_tag(self, site: str, tag: str) -> List[Post]:
-        """Fetch questions by tag."""
+    def _window(self, since: Optional[datetime], limit: Optional[int]) -> Dict[str, Any]:
+        """Page size and creation-date lower bound shared by a cycle's requests."""
+        params = {"pagesize": self._page_size(self.pagesize, limit)}
+        if since is not None:
+            # fromdate is inclusive; posts at the cutoff itself are not recent
+            params["fromdate"] = int(since.timestamp()) + 1
+        return params
+    
+    def _fetch_listing(self, site: str, window: Dict[str, Any], tag: Optional[str] = None) -> List[Dict]:
+        """Newest questions on a site (optionally with a tag); bodies only without two-phase fetch."""
         params = {
             "site": site,
-            "tagged": tag,
             "sort": "creation",
             "order": "desc",
-            "pagesize": self.pagesize,
-            "filter": "withbody",  # Include question body
+            # The default filter has ids, titles, tags, dates and owner but no body
+            "filter": "default" if self.two_phase else "withbody",
+            **window,
         }
+        if tag:
+            params["tagged"] = tag
         if self.api_key:
             params["key"] = self.api_key
         
-        response = requests.get(self.API_URL, params=params, timeout=10)
+        response = http.get(self.API_URL, params=params, timeout=10)
         response.raise_for_status()
-        data = response.json()
-        
-        return [self._question_to_post(q, site) for q in data.get("items", [])]
+        return response.json().get("items", [])
     
-    def _fetch_newest(self, site: str) -> List[Post]:
-        """Fetch newest questions."""
-        params = {
-            "site": site,
-            "sort": "creation",
-            "order": "desc",
-            "pagesize": self.pagesize,
-            "filter": "withbody",
-        }
-        if self.api_key:
-            params["key"] = self.api_key
+    def _fill_bodies(self, site: str, questions: List[Dict]):
+        """Set `body` on listed questions, from the cache or batched /questions/{ids} requests."""
+        missing = []
+        for question in questions:
+            key = (site, question.get("question_id"))
+            version = question.get("last_edit_date", question.get("creation_date"))
+            cached = self._bodies.get(key)
+            if cached and cached[0] == version:
+                question["body"] = cached[1]
+            else:
+                missing.append(question)
         
-        response = requests.get(self.API_URL, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        for i in range(0, len(missing), BODY_BATCH_SIZE):
+            batch = missing[i:i + BODY_BATCH_SIZE]
+            ids = ";".join(str(q["question_id"]) for q in batch)
+            params = {"site": site, "filter": "withbody", "pagesize": BODY_BATCH_SIZE}
+            if self.api_key:
+                params["key"] = self.api_key
+            try:
+                response = http.get(f"{self.API_URL}/{ids}", params=params, timeout=10)
+                response.raise_for_status()
+                bodies = {item["question_id"]: item.get("body", "") for item in response.json().get("items", [])}
+            except Exception as e:
+                logger.debug(f"SE {site} body fetch error: {e}")
+                continue
+            for question in batch:
+                body = bodies.get(question["question_id"])
+                if body is None:
+                    continue
+                question["body"] = body
+                version = question.get("last_edit_date", question.get("creation_date"))
+                self._bodies[(site, question["question_id"])] = (version, body)
         
-        return [self._question_to_post(q, site) for q in data.get("items", [])]
+        # Oldest first out
+        while len(self._bodies) > self.body_cache_size:
+            del self._bodies[next(iter(self._bodies))]
+    
+    @staticmethod
+    def _listing_text(question: Dict) -> str:
+        return " ".join([question.get("title", ""), *question.get("tags", [])])
     
     def _question_to_post(self, question: Dict, site: str) -> Post:
         """Convert SE question to Post object."""
@@ -148,10 +218,17 @@ class StackExchangeAdapter(BaseAdapter):
             logger.debug(f"Error parsing SE question: {e}")
             return None
     
+    def _note_fetched(self, post: Post):
+        """Count and archive a parsed question, whether or not it is keyword-filtered."""
+        self.items_fetched += 1
+        self._archive_posts([post])
+    
     def _matches_keywords(self, post: Post, keywords: List[str]) -> bool:
         """Check if post matches any keywords."""
         if not post:
+            self.items_fetched += 1
             return False
+        self._note_fetched(post)
         text = f"{post.title} {post.content}".lower()
         tags = " ".join(post.metadata.get("tags", [])).lower()
         combined = f"{text} {tags}"
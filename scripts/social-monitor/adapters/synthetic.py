@@ -0,0 +1,104 @@
+"""Synthetic load adapter - generates posts locally for load and soak testing."""
+import logging
+import os
+import random
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from .base import BaseAdapter, Post
+
+logger = logging.getLogger(__name__)
+
+# Filler vocabulary for generated titles and bodies
+WORDS = (
+    "team manager feedback meeting project deadline quarter budget hiring career growth "
+    "culture remote office product launch review process goal strategy client report "
+    "coffee weekend question advice help struggling lead delegate trust conversation "
+    "onboarding promotion conflict workload burnout priorities roadmap standup retro"
+).split()
+
+
+class SyntheticAdapter(BaseAdapter):
+    """
+    Generates fake posts at a configurable rate, size and match ratio.
+
+    Every poll emits the posts that "arrived" since the previous poll
+    (posts_per_minute x elapsed time), a share of which contain a keyword
+    and a share of which repeat earlier posts, so the whole pipeline -
+    dedupe, keyword matching, relevance, drafting, email fan-out - sees
+    realistic load without touching any real platform.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.posts_per_minute = config.get("posts_per_minute", 60)
+        self.min_words = config.get("min_words", 40)
+        self.max_words = config.get("max_words", 300)
+        self.keyword_hit_ratio = config.get("keyword_hit_ratio", 0.2)
+        self.duplicate_ratio = config.get("duplicate_ratio", 0.1)
+        # Posts generated on the first poll (no previous poll to measure from)
+        self.initial_posts = int(config.get("initial_posts", self.posts_per_minute * 5))
+        self.max_posts_per_poll = config.get("max_posts_per_poll", 10000)
+        self.platform_label = config.get("platform", "synthetic")
+
+        self._rng = random.Random(config.get("seed"))
+        self._next_id = 0
+        # Distinct IDs per run (and per queue worker process) so a persisted seen store doesn't swallow them
+        self._run_id = f"{int(time.time()):x}{os.getpid():x}"
+        self._last_poll = None
+        self._recent: Deque[Post] = deque(maxlen=config.get("duplicate_pool", 1000))
+
+    @property
+    def platform_name(self) -> str:
+        return "synthetic"
+
+    def fetch_posts(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[Post]:
+        """Generate the posts that arrived since the last poll and keyword-filter them (`since` is not applied)."""
+        if not self.enabled:
+            return []
+
+        now = time.time()
+        if self._last_poll is None:
+            count = self.initial_posts
+            window = max(60.0, count / max(self.posts_per_minute, 1e-9) * 60)
+        else:
+            window = now - self._last_poll
+            count = int(self._rng.random() + self.posts_per_minute * window / 60)
+        self._last_poll = now
+        count = self._page_size(min(count, self.max_posts_per_poll), limit)
+
+        posts = []
+        for _ in range(count):
+            if self._recent and self._rng.random() < self.duplicate_ratio:
+                posts.append(self._rng.choice(self._recent))
+            else:
+                post = self._generate(keywords, window)
+                self._recent.append(post)
+                posts.append(post)
+
+        matched = self.filter_by_keywords(posts, keywords)
+        logger.info(f"Synthetic: {count} generated, {len(matched)} matched")
+        return matched
+
+    def _text(self, keywords: List[str], n_words: int) -> str:
+        words = [self._rng.choice(WORDS) for _ in range(n_words)]
+        if keywords and self._rng.random() < self.keyword_hit_ratio:
+            words.insert(self._rng.randrange(len(words) + 1), self._rng.choice(keywords))
+        return " ".join(words)
+
+    def _generate(self, keywords: List[str], window: float) -> Post:
+        self._next_id += 1
+        post_id = f"synthetic_{self._run_id}_{self._next_id}"
+        return Post(
+            id=post_id,
+            platform=self.platform_label,
+            title=" ".join(self._rng.choice(WORDS) for _ in range(self._rng.randint(5, 12))),
+            content=self._text(keywords, self._rng.randint(self.min_words, self.max_words)),
+            author=f"user{self._rng.randint(1, 10000)}",
+            url=f"https://synthetic.invalid/{post_id}",
+            created_at=datetime.now(timezone.utc) - timedelta(seconds=self._rng.uniform(0, window)),
+        )
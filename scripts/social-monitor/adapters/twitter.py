@@ -1,9 +1,10 @@
 """Twitter/X adapter using the API v2."""
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
 
 from .base import BaseAdapter, Post
+from .query_planner import attribute_keywords, plan_or_queries
 
 logger = logging.getLogger(__name__)
 
@@ -19,12 +20,16 @@ class TwitterAdapter(BaseAdapter):
     def platform_name(self) -> str:
         return "twitter"
     
-    def fetch_posts(self, keywords: List[str]) -> List[Post]:
+    def fetch_posts(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[Post]:
         """
         Fetch tweets matching configured searches.
         
         Args:
             keywords: Keywords for search queries
+            since: Only tweets after this time (sent as `start_time`)
+            limit: Most tweets per search
         
         Returns:
             List of Post objects
@@ -52,26 +57,35 @@ class TwitterAdapter(BaseAdapter):
             
             # Search using configured queries
             search_queries = self.config.get("search_queries", [])
-            max_results = self.config.get("max_results", 50)
+            max_results = self._page_size(self.config.get("max_results", 50), limit)
+            start_time = self._start_time(since)
             
             for query in search_queries:
                 try:
-                    tweets = self._search_tweets(client, query, max_results)
+                    tweets = self._search_tweets(client, query, max_results, start_time)
                     all_tweets.extend(tweets)
                 except Exception as e:
                     logger.error(f"Twitter search error for '{query}': {e}")
             
             # Also search for keywords directly if no queries configured
             if not search_queries and keywords:
-                # Build a query from keywords
-                kw_query = " OR ".join([f'"{kw}"' for kw in keywords[:5]])  # Twitter has query limits
-                kw_query += " -is:retweet lang:en"
+                # Pack every keyword into as few OR queries as the length limit allows
+                plans = plan_or_queries(
+                    keywords,
+                    max_length=self.config.get("max_query_length", 512),
+                    suffix=" -is:retweet lang:en",
+                    max_terms=self.config.get("max_terms_per_query"),
+                )
+                logger.debug(f"Twitter: {len(keywords)} keywords in {len(plans)} queries")
                 
-                try:
-                    tweets = self._search_tweets(client, kw_query, max_results)
-                    all_tweets.extend(tweets)
-                except Exception as e:
-                    logger.error(f"Twitter keyword search error: {e}")
+                for plan in plans:
+                    try:
+                        tweets = self._search_tweets(client, plan.query, max_results, start_time)
+                        for tweet in tweets:
+                            tweet.matched_keywords = plan.keywords
+                        all_tweets.extend(tweets)
+                    except Exception as e:
+                        logger.error(f"Twitter keyword search error for '{plan.query}': {e}")
             
         except Exception as e:
             logger.error(f"Twitter client error: {e}")
@@ -89,10 +103,13 @@ class TwitterAdapter(BaseAdapter):
         if search_queries:
             matched = self.filter_by_keywords(unique_tweets, keywords)
         else:
+            self.items_fetched += len(unique_tweets)
+            self._archive_posts(unique_tweets)
             matched = unique_tweets
-            # Mark all keywords as matched since we searched for them
+            # Credit the keywords each tweet contains; Twitter's own matching
+            # (stemming, entities) can differ, so fall back to its query's keywords
             for tweet in matched:
-                tweet.matched_keywords = keywords[:5]
+                tweet.matched_keywords = attribute_keywords(tweet.full_text, keywords) or tweet.matched_keywords
         
         logger.info(f"Twitter: {len(matched)} tweets matched")
         
@@ -107,11 +124,22 @@ class TwitterAdapter(BaseAdapter):
             twitter_config = self.config
         return twitter_config
     
+    @staticmethod
+    def _start_time(since: Optional[datetime]) -> Optional[datetime]:
+        """`since` as a recent-search start_time, or None when outside the 7-day window."""
+        if since is None:
+            return None
+        # Recent search only covers the last 7 days; older start times are rejected
+        if since <= datetime.now(timezone.utc) - timedelta(days=7):
+            return None
+        return since
+    
     def _search_tweets(
         self, 
         client: Any, 
         query: str, 
-        max_results: int
+        max_results: int,
+        start_time: Optional[datetime] = None
     ) -> List[Post]:
         """
         Search for tweets using Twitter API v2.
@@ -120,6 +148,7 @@ class TwitterAdapter(BaseAdapter):
             client: Tweepy Client instance
             query: Twitter search query
             max_results: Maximum results to return
+            start_time: Oldest tweet time (None = API default, 7 days)
         
         Returns:
             List of Post objects
@@ -127,12 +156,14 @@ class TwitterAdapter(BaseAdapter):
         # Note: max_results must be between 10-100 for recent search
         max_results = min(max(max_results, 10), 100)
         
+        window = {"start_time": start_time} if start_time else {}
         response = client.search_recent_tweets(
             query=query,
             max_results=max_results,
             tweet_fields=["created_at", "author_id", "entities", "public_metrics"],
             user_fields=["username", "name"],
-            expansions=["author_id"]
+            expansions=["author_id"],
+            **window
         )
         
         if not response.data:
@@ -0,0 +1,123 @@
+"""
+Microbenchmarks for social-monitor hot paths.
+
+Run from this directory:
+    python -m pytest --corpus-size 1000
+    python -m pytest --benchmark-json new.json && python compare.py baseline.json new.json
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from adapters import (
+    DevToAdapter, IndieHackersAdapter, MediumAdapter, RedditAdapter, RSSAdapter, StackExchangeAdapter, Post
+)
+from monitor import SeenPostsStore
+from services import BatchEmailRenderer, EmailService
+
+# Matches monitor.max_posts_per_run, the usual size of one batch email
+EMAIL_BATCH = 20
+
+
+def bench_filter_by_keywords(benchmark, posts, keywords):
+    adapter = RedditAdapter({})
+    result = benchmark(adapter.filter_by_keywords, posts, keywords)
+    assert result
+
+
+@pytest.mark.parametrize("adapter_cls", [
+    DevToAdapter, MediumAdapter, RSSAdapter, StackExchangeAdapter, IndieHackersAdapter,
+])
+def bench_matches_keywords(benchmark, adapter_cls, posts, keywords):
+    adapter = adapter_cls({})
+
+    def run():
+        return sum(1 for post in posts if adapter._matches_keywords(post, keywords))
+
+    assert benchmark(run)
+
+
+def bench_strip_html(benchmark, html_snippets):
+    adapter = RedditAdapter({})
+
+    def run():
+        return [adapter._strip_html(text) for text in html_snippets]
+
+    assert benchmark(run)
+
+
+def _store(tmp_path, posts, expired_share: float = 0.0) -> SeenPostsStore:
+    """Store with every other corpus post seen; `expired_share` of them past max age."""
+    store = SeenPostsStore(tmp_path / "seen_posts.json")
+    old = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+    seen = posts[::2]
+    expired = int(len(seen) * expired_share)
+    for i, post in enumerate(seen):
+        store.mark_seen(post.id)
+        if i < expired:
+            store._seen[post.id] = old
+    return store
+
+
+def bench_seen_filter_unseen(benchmark, tmp_path, posts):
+    store = _store(tmp_path, posts)
+    result = benchmark(store.filter_unseen, posts)
+    assert len(result) == len(posts) - len(posts[::2])
+
+
+def bench_seen_cleanup_old(benchmark, tmp_path, posts):
+    benchmark.pedantic(
+        lambda store: store.cleanup_old(),
+        setup=lambda: ((_store(tmp_path, posts, expired_share=0.5),), {}),
+        rounds=20,
+    )
+
+
+def bench_seen_commit(benchmark, tmp_path, posts):
+    benchmark.pedantic(
+        lambda store: store.commit(),
+        setup=lambda: ((_store(tmp_path, posts, expired_share=0.5),), {}),
+        rounds=20,
+    )
+
+
+def bench_post_to_dict(benchmark, posts):
+    def run():
+        return [post.to_dict() for post in posts]
+
+    assert benchmark(run)
+
+
+def bench_post_from_dict(benchmark, posts):
+    dicts = [post.to_dict() for post in posts]
+
+    def run():
+        return [Post.from_dict(d) for d in dicts]
+
+    assert benchmark(run)
+
+
+def bench_build_batch_html_body(benchmark, posts):
+    email = EmailService({})
+    batch = posts[:EMAIL_BATCH]
+    responses = {p.id: "Thanks for sharing - here's what worked for our team..." for p in batch[::2]}
+    html = benchmark(email._build_batch_html_body, batch, responses)
+    assert "<html>" in html
+
+
+# Distinct subscriber platform selections in a multi-tenant fan-out
+FANOUT_SELECTIONS = [
+    {"reddit"}, {"reddit", "rss"}, {"medium", "devto", "hackernews"}, {"stackexchange"},
+    {"rss"}, {"devto"}, {"reddit", "devto"}, {"hackernews"},
+]
+
+
+def bench_fanout_for_platforms(benchmark, posts):
+    """Per-subscriber platform filtering over the whole corpus (renders stubbed out)."""
+    def run():
+        renderer = BatchEmailRenderer(posts, {})
+        renderer.render = lambda selected: ""
+        return [renderer.for_platforms(platforms)[0] for platforms in FANOUT_SELECTIONS]
+
+    selected = benchmark(run)
+    assert len(selected[0]) == sum(1 for p in posts if p.platform == "reddit")
@@ -0,0 +1,85 @@
+"""Memory footprint of Post objects at scale (tracemalloc bytes in extra_info)."""
+import gc
+import random
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Tuple
+
+from adapters.base import Post
+from conftest import WORDS
+
+MEMORY_CORPUS = 100_000
+PLATFORMS = ["reddit", "hackernews", "medium", "devto", "stackexchange", "rss"]
+SUBREDDITS = ["managers", "leadership", "careerguidance", "ExperiencedDevs"]
+
+
+def _fresh(value: str) -> str:
+    """A new string object with the same value, as a feed or JSON parser would return."""
+    return (value + " ")[:-1]
+
+
+def _ingest(n: int, seed: int = 1) -> List[Post]:
+    """Build posts the way adapters do: every field a freshly parsed string."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    # Slicing one long text gives fresh strings cheaply
+    text = " ".join(rng.choice(WORDS) for _ in range(80000))
+    posts = []
+    for i in range(n):
+        # ~1% of bodies are huge (pasted logs, long essays)
+        n_chars = rng.randint(15000, 150000) if rng.random() < 0.01 else rng.randint(250, 2000)
+        start = rng.randrange(len(text) // 2)
+        platform = PLATFORMS[i % len(PLATFORMS)]
+        posts.append(Post(
+            id=f"{platform}:{i}",
+            platform=_fresh(platform),
+            title=text[start:start + rng.randint(40, 90)],
+            content=text[start:start + n_chars],
+            author=f"user{rng.randint(1, 5000)}",
+            url=f"https://example.com/p/{i}",
+            created_at=now - timedelta(minutes=rng.randint(0, 1440)),
+            subreddit=_fresh(SUBREDDITS[i % len(SUBREDDITS)]) if platform == "reddit" else None,
+        ))
+    return posts
+
+
+def _traced(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """Run `build` and return its result with the net bytes it allocated."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def bench_post_memory_100k(benchmark):
+    """
+    Ingest 100k posts, keyword-match all of them (full_text), keep the ~20%
+    that match and render those (display_text), as one cycle does.
+    """
+    def run():
+        posts, ingested = _traced(lambda: _ingest(MEMORY_CORPUS))
+
+        def match_and_render():
+            survivors = []
+            for i, post in enumerate(posts):
+                post.full_text
+                if i % 5 == 0:
+                    survivors.append(post)
+            for post in survivors:
+                post.display_text
+            posts.clear()
+            return survivors
+
+        survivors, delta = _traced(match_and_render)
+        return ingested, ingested + delta, len(survivors)
+
+    ingested, retained, survivors = benchmark.pedantic(run, rounds=1, iterations=1)
+    benchmark.extra_info["posts"] = MEMORY_CORPUS
+    benchmark.extra_info["ingest_bytes_per_post"] = round(ingested / MEMORY_CORPUS)
+    benchmark.extra_info["ingest_mb"] = round(ingested / 1e6, 1)
+    benchmark.extra_info["retained_bytes_per_survivor"] = round(retained / survivors)
+    benchmark.extra_info["retained_mb"] = round(retained / 1e6, 1)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Compare two pytest-benchmark JSON files and flag regressions.
+
+Usage:
+    python compare.py baseline.json new.json [--threshold 0.25]
+
+Exits with status 1 if any benchmark's median got slower by more than
+the threshold (a fraction; 0.25 = 25%).
+"""
+import argparse
+import json
+import sys
+from typing import Dict
+
+
+def _medians(path: str) -> Dict[str, float]:
+    with open(path) as f:
+        data = json.load(f)
+    return {b["fullname"].split("::")[-1]: b["stats"]["median"] for b in data["benchmarks"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare pytest-benchmark results")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed median slowdown before failing (default: 0.25)")
+    args = parser.parse_args()
+
+    baseline = _medians(args.baseline)
+    current = _medians(args.current)
+
+    regressions = 0
+    print(f"{'benchmark':<48} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name in sorted(set(baseline) | set(current)):
+        old, new = baseline.get(name), current.get(name)
+        if old is None or new is None:
+            print(f"{name:<48} {'-' if old is None else f'{old * 1e3:.3f}ms':>12} "
+                  f"{'-' if new is None else f'{new * 1e3:.3f}ms':>12} {'n/a':>8}")
+            continue
+        change = (new - old) / old
+        flag = ""
+        if change > args.threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{name:<48} {old * 1e3:>10.3f}ms {new * 1e3:>10.3f}ms {change:>+7.0%}{flag}")
+
+    if regressions:
+        print(f"\n{regressions} benchmark(s) slower than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Shared fixtures for the hot-path microbenchmarks."""
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+import pytest
+import yaml
+
+SCRIPT_DIR = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from adapters.base import Post
+
+# Filler vocabulary; keyword phrases are mixed in at KEYWORD_RATE
+WORDS = (
+    "team manager feedback meeting project deadline quarter budget hiring career growth "
+    "culture remote office product launch review process goal strategy client report "
+    "coffee weekend question advice help struggling lead delegate trust conversation"
+).split()
+KEYWORD_RATE = 0.2
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--corpus-size", type=int, default=1000,
+        help="Number of synthetic posts in the benchmark corpus (default: 1000)"
+    )
+
+
+@pytest.fixture(scope="session")
+def corpus_size(request) -> int:
+    return request.config.getoption("--corpus-size")
+
+
+@pytest.fixture(scope="session")
+def keywords() -> List[str]:
+    """The keyword list shipped in config.example.yaml."""
+    with open(SCRIPT_DIR / "config.example.yaml") as f:
+        return yaml.safe_load(f)["keywords"]
+
+
+def _text(rng: random.Random, keywords: List[str], n_words: int) -> str:
+    words = [rng.choice(WORDS) for _ in range(n_words)]
+    if rng.random() < KEYWORD_RATE:
+        words.insert(rng.randrange(len(words)), rng.choice(keywords))
+    return " ".join(words)
+
+
+def make_posts(n: int, keywords: List[str], seed: int = 42) -> List[Post]:
+    """Deterministic synthetic posts with realistic title/body lengths."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    platforms = ["reddit", "hackernews", "medium", "devto", "stackexchange", "rss"]
+    return [
+        Post(
+            id=f"post_{i}",
+            platform=platforms[i % len(platforms)],
+            title=_text(rng, keywords, rng.randint(6, 14)),
+            content=_text(rng, keywords, rng.randint(40, 300)),
+            author=f"user{rng.randint(1, 5000)}",
+            url=f"https://example.com/p/{i}",
+            created_at=now - timedelta(minutes=rng.randint(0, 1440)),
+            subreddit="managers" if i % len(platforms) == 0 else None,
+            matched_keywords=[rng.choice(keywords)],
+            metadata={"tags": ["leadership", "management"], "score": rng.randint(0, 500)},
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture(scope="session")
+def posts(corpus_size, keywords) -> List[Post]:
+    return make_posts(corpus_size, keywords)
+
+
+@pytest.fixture(scope="session")
+def html_snippets(corpus_size, keywords) -> List[str]:
+    """Reddit-style HTML bodies for _strip_html."""
+    rng = random.Random(7)
+    return [
+        f'<!-- SC_OFF --><div class="md"><p>{_text(rng, keywords, rng.randint(40, 300))}</p>'
+        f'<p>&quot;quoted&quot; &amp; <a href="https://example.com">link</a> &#39;x&#39;</p></div>'
+        f'<!-- SC_ON --> &#32; submitted by <a href="https://www.reddit.com/user/u{i}">/u/u{i}</a>'
+        for i in range(corpus_size)
+    ]
+
+
+def pytest_benchmark_update_json(config, benchmarks, output_json):
+    """Keep saved results reviewable: summary stats only, no raw timings."""
+    for bench in output_json["benchmarks"]:
+        bench["stats"].pop("data", None)
@@ -0,0 +1 @@
+"""Local load/soak harness and stand-in services for the monitor."""
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Cold-start timing for the cron-driven CLI.
+
+Runs each scenario in a fresh interpreter several times and reports the
+median and minimum wall time, plus (with --importtime) the slowest
+imports behind `import monitor`. Scenarios run fully offline: the
+single-run scenario polls a small SyntheticAdapter with Firestore
+disabled and no Gemini key.
+
+Usage:
+    python harness/coldstart.py
+    python harness/coldstart.py --runs 20 --importtime --json coldstart.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import yaml
+
+SCRIPT_DIR = Path(__file__).parent.parent.absolute()
+
+
+def scenarios(config_path: Path) -> Dict[str, List[str]]:
+    monitor = str(SCRIPT_DIR / "monitor.py")
+    return {
+        "import monitor": [sys.executable, "-c", "import monitor"],
+        "monitor.py --help": [sys.executable, monitor, "--help"],
+        "monitor.py --check": [sys.executable, monitor, "--check", "--config", str(config_path)],
+        "monitor.py --test (single run)": [sys.executable, monitor, "--test", "--config", str(config_path)],
+    }
+
+
+def write_config(state_dir: Path) -> Path:
+    """Offline config: one small synthetic adapter, everything remote disabled."""
+    config = {
+        "keywords": ["manager"],
+        "reddit": {"enabled": False},
+        "firestore": {"enabled": False},
+        "synthetic": {"enabled": True, "initial_posts": 20, "seed": 1},
+        "monitor": {"state_dir": str(state_dir)},
+    }
+    path = state_dir / "coldstart-config.yaml"
+    path.write_text(yaml.safe_dump(config))
+    return path
+
+
+def time_command(command: List[str], runs: int) -> List[float]:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=SCRIPT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def slowest_imports(limit: int) -> List[Dict[str, float]]:
+    """Top cumulative import times (ms) for `import monitor` from -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import monitor"],
+        cwd=SCRIPT_DIR, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append({"module": name, "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure monitor.py cold-start time")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per scenario (default: 10)")
+    parser.add_argument("--importtime", action="store_true", help="Also list the slowest imports")
+    parser.add_argument("--top", type=int, default=15, help="Imports to list with --importtime")
+    parser.add_argument("--json", type=str, metavar="PATH", help="Write results as JSON")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory(prefix="social-monitor-coldstart-") as tmp:
+        config_path = write_config(Path(tmp))
+        for name, command in scenarios(config_path).items():
+            times = time_command(command, args.runs)
+            results[name] = {"median_ms": statistics.median(times) * 1000, "min_ms": min(times) * 1000}
+            print(f"{name:32} median {results[name]['median_ms']:7.1f} ms   min {results[name]['min_ms']:7.1f} ms")
+
+    output = {"python": sys.version.split()[0], "runs": args.runs, "scenarios": results}
+    if args.importtime:
+        output["slowest_imports"] = slowest_imports(args.top)
+        print("\nSlowest imports (cumulative):")
+        for row in output["slowest_imports"]:
+            print(f"  {row['cumulative_ms']:8.1f} ms  {row['module']}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(output, indent=2))
+
+
+if __name__ == "__main__":
+    main()
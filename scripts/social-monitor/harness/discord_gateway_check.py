@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+End-to-end check of Discord ingestion against a local fake gateway.
+
+Runs DiscordAdapter against StubDiscordGateway in both modes:
+
+    gateway   initial backfill, live MESSAGE_CREATE events, a quiet cycle,
+              a dropped connection that is resumed (missed events replayed),
+              and one that needs a new session (a 150-message burst
+              backfilled over REST with the `after` cursor)
+    REST      first poll, a burst larger than one page, a quiet poll
+
+Every step prints PASS or FAIL; the exit status is the number of failures.
+
+Usage:
+    python harness/discord_gateway_check.py
+    python harness/discord_gateway_check.py -v
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+SCRIPT_DIR = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from adapters.discord import DiscordAdapter
+from harness.stubs import StubDiscordGateway
+
+CHANNEL = "10"
+KEYWORDS = ["new manager"]
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 10.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check Discord streaming and REST ingestion against a fake gateway")
+    parser.add_argument("--verbose", "-v", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    gateway = StubDiscordGateway(heartbeat_interval_ms=500)
+    gateway.start()
+    failures = 0
+
+    def check(name: str, ok: bool, detail: str = ""):
+        nonlocal failures
+        failures += not ok
+        print(f"{'PASS' if ok else 'FAIL'}  {name}{f' ({detail})' if detail else ''}")
+
+    def burst(n: int, label: str):
+        for i in range(n):
+            gateway.post_message(CHANNEL, f"{label} {i}: advice for a new manager")
+
+    try:
+        gateway.post_message(CHANNEL, "hello there")
+        gateway.post_message(CHANNEL, "tips for a new manager?")
+        gateway.post_message("99", "new manager in another channel")
+
+        streaming = DiscordAdapter({
+            "bot_token": "stub", "channel_ids": [CHANNEL], "api_base": gateway.api_base,
+            "gateway": {"enabled": True, "url": gateway.gateway_url},
+        })
+        posts = streaming.fetch_posts(KEYWORDS)
+        check("first cycle backfills over REST", len(posts) == 1 and gateway.rest_requests == 1,
+              f"{len(posts)} posts, {gateway.rest_requests} requests")
+
+        burst(3, "live")
+        wait_for(lambda: len(streaming._buffer._items) == 3)
+        posts = streaming.fetch_posts(KEYWORDS)
+        check("live MESSAGE_CREATE events buffered", len(posts) == 3 and gateway.rest_requests == 1,
+              f"{len(posts)} posts")
+        gateway.post_message("99", "new manager elsewhere")
+        time.sleep(0.2)
+        posts = streaming.fetch_posts(KEYWORDS)
+        check("quiet cycle: no messages, no requests", not posts and gateway.rest_requests == 1)
+
+        gateway.drop_connections()
+        burst(5, "missed")
+        check("dropped connection resumed", wait_for(lambda: gateway.resumes == 1))
+        wait_for(lambda: len(streaming._buffer._items) == 5)
+        posts = streaming.fetch_posts(KEYWORDS)
+        check("missed events replayed on resume", len(posts) == 5 and gateway.identifies == 1,
+              f"{len(posts)} posts")
+
+        gateway.allow_resume = False
+        gateway.drop_connections()
+        burst(150, "burst")
+        requests_before = gateway.rest_requests
+        check("new session identified", wait_for(lambda: gateway.identifies == 2))
+        wait_for(lambda: len(streaming._buffer._items) >= 150)
+        posts = streaming.fetch_posts(KEYWORDS)
+        pages = gateway.rest_requests - requests_before
+        check("150-message burst backfilled with the after cursor", len(posts) == 150 and pages == 2,
+              f"{len(posts)} posts, {pages} requests")
+        streaming._gateway.stop()
+
+        polling = DiscordAdapter({"bot_token": "stub", "channel_ids": [CHANNEL], "api_base": gateway.api_base})
+        posts = polling.fetch_posts(KEYWORDS)
+        check("REST: first poll takes the latest 50", len(posts) == 50, f"{len(posts)} posts")
+        burst(120, "rest")
+        requests_before = gateway.rest_requests
+        posts = polling.fetch_posts(KEYWORDS)
+        pages = gateway.rest_requests - requests_before
+        check("REST: 120-message burst paged with after", len(posts) == 120 and pages == 2,
+              f"{len(posts)} posts, {pages} requests")
+        requests_before = gateway.rest_requests
+        posts = polling.fetch_posts(KEYWORDS)
+        check("REST: quiet poll is one empty request", not posts and gateway.rest_requests - requests_before == 1)
+    finally:
+        gateway.stop()
+
+    print(f"\n{failures} failure(s)")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(main())
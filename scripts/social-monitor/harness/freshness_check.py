@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Check freshness accounting when a post is fetched more than once in a cycle.
+
+Runs one SocialMonitor cycle (stub Gemini and SMTP, email sent inline)
+over an adapter that yields the same post twice, the second copy after
+the first has gone through the pipeline. The post must be counted once
+at every stage, with the times of its first copy.
+
+Every step prints PASS or FAIL; the exit status is the number of failures.
+
+Usage:
+    python harness/freshness_check.py
+    python harness/freshness_check.py -v
+"""
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import yaml
+
+SCRIPT_DIR = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from adapters.base import BaseAdapter, Post
+from harness.stubs import StubGeminiServer, StubSMTPServer
+from services.freshness import STAGES
+
+KEYWORDS = ["new manager"]
+POST_AGE = timedelta(minutes=5)
+
+
+class RepeatingAdapter(BaseAdapter):
+    """Yields one post, then the same post again after `gap` seconds."""
+
+    def __init__(self, config, gap: float = 0.5):
+        super().__init__(config)
+        self.gap = gap
+        self.created_at = datetime.now(timezone.utc) - POST_AGE
+
+    @property
+    def platform_name(self) -> str:
+        return "reddit"
+
+    def fetch_posts(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[Post]:
+        return list(self.iter_posts(keywords, since, limit))
+
+    def iter_posts(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> Iterator[Post]:
+        for copy in range(2):
+            if copy:
+                time.sleep(self.gap)
+            yield Post(
+                id="reddit_repeat", platform="reddit", title="Advice for a new manager",
+                content="First week as a new manager.", author="someone", created_at=self.created_at,
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check freshness accounting for posts fetched twice")
+    parser.add_argument("--verbose", "-v", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    gemini = StubGeminiServer(relevant_ratio=1.0)
+    smtp = StubSMTPServer()
+    gemini.start()
+    smtp.start()
+    state_dir = Path(tempfile.mkdtemp(prefix="freshness-check-"))
+    config_path = state_dir / "config.yaml"
+    config_path.write_text(yaml.safe_dump({
+        "api_keys": {"gemini": "stub"},
+        "keywords": KEYWORDS,
+        "gemini": {"api_url": gemini.api_url},
+        "email": {
+            "smtp_host": smtp.host, "smtp_port": smtp.port, "smtp_starttls": False,
+            "smtp_user": "check", "smtp_pass": "check",
+            "from_address": "monitor@check.invalid", "to_address": "inbox@check.invalid",
+        },
+        "outbox": {"enabled": False},
+        "firestore": {"enabled": False},
+        "monitor": {"state_dir": str(state_dir)},
+        "reddit": {"enabled": False},
+    }))
+    failures = 0
+
+    def check(name: str, ok: bool, detail: str = ""):
+        nonlocal failures
+        failures += not ok
+        print(f"{'PASS' if ok else 'FAIL'}  {name}{f' ({detail})' if detail else ''}")
+
+    try:
+        import monitor
+        if not args.verbose:
+            logging.getLogger().setLevel(logging.WARNING)
+        mon = monitor.SocialMonitor(config_path, state_dir=state_dir)
+        adapter = RepeatingAdapter({}, gap=0.5)
+        mon.adapters = [adapter]
+        processed = mon.run_once(mon.adapters)
+        check("post processed once", processed == 1, f"{processed} processed")
+
+        first_copy_age = POST_AGE.total_seconds() + adapter.gap
+        for stage in STAGES:
+            stats = mon.freshness.percentiles("reddit", stage) or {"count": 0, "p50": 0.0}
+            check(f"{stage}: counted once", stats["count"] == 1, f"{stats['count']} recorded")
+            if stage in ("fetched", "matched") and stats["count"]:
+                # Recorded before the second copy arrived
+                check(f"{stage}: first copy's time", stats["p50"] < first_copy_age,
+                      f"age {stats['p50']:.2f}s")
+    finally:
+        gemini.stop()
+        smtp.stop()
+
+    print(f"\n{failures} failure(s)")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(main())
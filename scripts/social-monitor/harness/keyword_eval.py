@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Offline keyword-set evaluator.
+
+Replays a corpus of archived posts (Post.to_dict JSON plus the recorded
+AI relevance verdict) through BaseAdapter.filter_by_keywords and scores
+the configured keyword set against a candidate set:
+
+    precision   relevant / matched posts that have a verdict
+    recall      relevant posts matched / all relevant posts in the corpus
+    LLM calls   projected relevance checks + drafts per day
+
+Each keyword's matches are kept as a bitset (a Python int, one bit per
+post), so once the corpus has been matched, scoring any keyword set is a
+handful of bitwise ORs and popcounts; the per-keyword table also shows
+how many relevant posts only that keyword finds.
+
+Recall is relative to the posts the AI has judged, i.e. what earlier
+keyword sets surfaced; matches of new keywords that were never judged are
+reported as "unlabeled".
+
+Usage:
+    python harness/keyword_eval.py --archive archive.db --export corpus.jsonl
+    python harness/keyword_eval.py --corpus corpus.jsonl --drop leadership --add "first-time manager"
+    python harness/keyword_eval.py --archive archive.db --keywords candidate.yaml --json eval.json
+"""
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import yaml
+
+SCRIPT_DIR = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from adapters.base import BaseAdapter, Post
+
+
+class CorpusAdapter(BaseAdapter):
+    """Adapter that only exists to run the shared keyword filter."""
+
+    platform_name = "corpus"
+
+    def fetch_posts(
+        self, keywords: List[str], since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[Post]:
+        return []
+
+
+@dataclass
+class Corpus:
+    posts: List[Post]
+    relevant: int    # Bitset of posts judged relevant
+    labeled: int     # Bitset of posts with any verdict
+    days: float      # Time span covered, for per-day projections
+
+
+def _bitset(indexes: Iterable[int], n: int) -> int:
+    bits = bytearray((n + 7) // 8)
+    for i in indexes:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little")
+
+
+def load_corpus(entries: Iterable[Dict[str, Any]], days: Optional[float] = None) -> Corpus:
+    """Build a corpus from Post.to_dict() entries carrying "relevant" (and "fetched_at")."""
+    posts, relevant, labeled, times = [], [], [], []
+    for i, entry in enumerate(entries):
+        post = Post.from_dict(entry)
+        posts.append(post)
+        verdict = entry.get("relevant")
+        if verdict is not None:
+            labeled.append(i)
+            if verdict:
+                relevant.append(i)
+        if entry.get("fetched_at"):
+            times.append(float(entry["fetched_at"]))
+        elif post.created_at:
+            created = post.created_at if post.created_at.tzinfo else post.created_at.replace(tzinfo=timezone.utc)
+            times.append(created.timestamp())
+    if days is None:
+        days = max((max(times) - min(times)) / 86400, 1.0) if times else 1.0
+    n = len(posts)
+    return Corpus(posts, _bitset(relevant, n), _bitset(labeled, n), days)
+
+
+def read_jsonl(path: Path) -> Iterable[Dict[str, Any]]:
+    with open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def keyword_hits(corpus: Corpus, keywords: List[str]) -> Dict[str, int]:
+    """Match every post once through filter_by_keywords; keyword -> bitset of matching posts."""
+    for post in corpus.posts:
+        post.matched_keywords = []
+    CorpusAdapter({}).filter_by_keywords(corpus.posts, keywords)
+
+    indexes: Dict[str, List[int]] = {kw: [] for kw in keywords}
+    for i, post in enumerate(corpus.posts):
+        for kw in post.matched_keywords:
+            indexes[kw].append(i)
+    n = len(corpus.posts)
+    return {kw: _bitset(rows, n) for kw, rows in indexes.items()}
+
+
+def score(corpus: Corpus, hits: Dict[str, int], keywords: List[str]) -> Dict[str, Any]:
+    """Precision, recall and projected daily LLM calls for one keyword set."""
+    matched = 0
+    for kw in keywords:
+        matched |= hits[kw]
+    n_matched = matched.bit_count()
+    n_labeled = (matched & corpus.labeled).bit_count()
+    true_pos = (matched & corpus.relevant).bit_count()
+    all_relevant = corpus.relevant.bit_count()
+    precision = true_pos / n_labeled if n_labeled else None
+
+    checks_per_day = n_matched / corpus.days
+    # One relevance check per new match, one draft per relevant post
+    drafts_per_day = checks_per_day * precision if precision is not None else checks_per_day
+    return {
+        "keywords": len(keywords),
+        "matched": n_matched,
+        "unlabeled": n_matched - n_labeled,
+        "relevant": true_pos,
+        "precision": precision,
+        "recall": true_pos / all_relevant if all_relevant else None,
+        "relevance_checks_per_day": checks_per_day,
+        "llm_calls_per_day": checks_per_day + drafts_per_day,
+    }
+
+
+def per_keyword(corpus: Corpus, hits: Dict[str, int], keywords: List[str]) -> List[Dict[str, Any]]:
+    """Per-keyword yield within the set, including relevant posts only that keyword finds."""
+    # Union of every other keyword's matches via prefix/suffix ORs
+    prefix, suffix = [0], [0]
+    for kw in keywords:
+        prefix.append(prefix[-1] | hits[kw])
+    for kw in reversed(keywords):
+        suffix.append(suffix[-1] | hits[kw])
+    suffix.reverse()
+
+    rows = []
+    for i, kw in enumerate(keywords):
+        own = hits[kw]
+        unique = own & ~(prefix[i] | suffix[i + 1])
+        labeled = (own & corpus.labeled).bit_count()
+        relevant = (own & corpus.relevant).bit_count()
+        rows.append({
+            "keyword": kw,
+            "matched": own.bit_count(),
+            "relevant": relevant,
+            "precision": relevant / labeled if labeled else None,
+            "unique_matched": unique.bit_count(),
+            "unique_relevant": (unique & corpus.relevant).bit_count(),
+            "checks_per_day": own.bit_count() / corpus.days,
+        })
+    rows.sort(key=lambda r: (r["unique_relevant"], r["precision"] or 0.0, -r["matched"]))
+    return rows
+
+
+def _pct(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1%}"
+
+
+def print_report(current: Dict[str, Any], candidate: Dict[str, Any], rows: List[Dict[str, Any]], corpus: Corpus):
+    print(f"Corpus: {len(corpus.posts)} posts over {corpus.days:.1f} days, "
+          f"{corpus.labeled.bit_count()} with verdicts, {corpus.relevant.bit_count()} relevant\n")
+    print(f"{'keyword (candidate set)':<32} {'matched':>8} {'relevant':>9} {'prec':>7} "
+          f"{'only-this':>10} {'checks/day':>11}")
+    for row in rows:
+        print(f"{row['keyword'][:32]:<32} {row['matched']:>8} {row['relevant']:>9} {_pct(row['precision']):>7} "
+              f"{row['unique_relevant']:>10} {row['checks_per_day']:>11.1f}")
+
+    print(f"\n{'':<12} {'keywords':>8} {'matched':>8} {'unlabeled':>10} {'precision':>10} {'recall':>8} "
+          f"{'LLM calls/day':>14}")
+    for name, result in (("current", current), ("candidate", candidate)):
+        print(f"{name:<12} {result['keywords']:>8} {result['matched']:>8} {result['unlabeled']:>10} "
+              f"{_pct(result['precision']):>10} {_pct(result['recall']):>8} {result['llm_calls_per_day']:>14.1f}")
+
+
+def load_keywords(path: Path) -> List[str]:
+    """Keywords from a YAML file (a list, or a config with a `keywords` list) or one per line."""
+    with open(path, "r") as f:
+        text = f.read()
+    if path.suffix in (".yaml", ".yml"):
+        data = yaml.safe_load(text)
+        return list(data.get("keywords", []) if isinstance(data, dict) else data)
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.startswith("#")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate keyword sets against archived posts and verdicts")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--archive", type=str, metavar="DB", help="Post archive (archive.db)")
+    source.add_argument("--corpus", type=str, metavar="JSONL", help="Corpus exported with --export")
+    parser.add_argument("--export", type=str, metavar="JSONL", help="Write the archive as a JSONL corpus and exit")
+    parser.add_argument("--since", type=str, metavar="DATE", help="Only posts fetched since this ISO date")
+    parser.add_argument("--config", type=str, default=str(SCRIPT_DIR / "config.yaml"),
+                        help="Config with the current keywords (default: config.yaml)")
+    parser.add_argument("--keywords", type=str, metavar="PATH", help="Candidate keyword set (YAML or one per line)")
+    parser.add_argument("--add", action="append", default=[], metavar="KEYWORD", help="Add to the candidate set")
+    parser.add_argument("--drop", action="append", default=[], metavar="KEYWORD", help="Remove from the candidate set")
+    parser.add_argument("--days", type=float, help="Days the corpus covers (default: its fetched_at span)")
+    parser.add_argument("--json", type=str, metavar="PATH", help="Write results as JSON")
+    args = parser.parse_args()
+
+    if args.archive:
+        from services.archive import PostArchive
+        since = datetime.fromisoformat(args.since) if args.since else None
+        archive = PostArchive(Path(args.archive))
+        entries = list(archive.iter_corpus(since))
+        archive.close()
+        if args.export:
+            with open(args.export, "w") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, default=str) + "\n")
+            print(f"Exported {len(entries)} posts to {args.export}")
+            return
+    else:
+        entries = read_jsonl(Path(args.corpus))
+
+    config_path = Path(args.config)
+    if not config_path.exists():
+        config_path = SCRIPT_DIR / "config.example.yaml"
+    current = load_keywords(config_path)
+    candidate = load_keywords(Path(args.keywords)) if args.keywords else list(current)
+    candidate = [kw for kw in candidate if kw not in args.drop]
+    candidate += [kw for kw in args.add if kw not in candidate]
+
+    start = time.perf_counter()
+    corpus = load_corpus(entries, args.days)
+    loaded = time.perf_counter()
+    hits = keyword_hits(corpus, list(dict.fromkeys(current + candidate)))
+    matched = time.perf_counter()
+    current_score = score(corpus, hits, current)
+    candidate_score = score(corpus, hits, candidate)
+    rows = per_keyword(corpus, hits, candidate)
+    scored = time.perf_counter()
+
+    print_report(current_score, candidate_score, rows, corpus)
+    print(f"\nLoad {loaded - start:.2f}s, keyword matching {matched - loaded:.2f}s, "
+          f"scoring {(scored - matched) * 1000:.1f} ms")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(
+            {"current": current_score, "candidate": candidate_score, "keywords": rows}, indent=2
+        ))
+
+
+if __name__ == "__main__":
+    main()
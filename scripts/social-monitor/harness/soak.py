@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Soak test: run the monitor daemon against synthetic load for hours.
+
+Everything is local - posts come from SyntheticAdapter, Gemini and SMTP
+are stub servers, Firestore is disabled, and all state lives in the
+output directory. Cycle times, RSS memory and throughput are written as
+CSV curves plus a JSON summary.
+
+Usage:
+    python harness/soak.py --duration 2h --rate 600 --out soak-results
+    python harness/soak.py --duration 10m --rate 6000 --interval 30 --gemini-latency 0.3
+    python harness/soak.py --duration 10m --rate 6000 --interval 30 --gemini-latency 0.3 --workers 4
+"""
+import argparse
+import csv
+import json
+import logging
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+SCRIPT_DIR = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from harness.stubs import StubGeminiServer, StubSMTPServer
+
+logger = logging.getLogger("soak")
+
+
+def parse_duration(value: str) -> float:
+    """'90', '90s', '15m', '2h' -> seconds."""
+    units = {"s": 1, "m": 60, "h": 3600}
+    if value and value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size (Linux /proc; peak RSS elsewhere)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        return None
+
+
+def build_config(args, gemini: StubGeminiServer, smtp: StubSMTPServer, out_dir: Path) -> Dict[str, Any]:
+    with open(SCRIPT_DIR / "config.example.yaml") as f:
+        keywords = yaml.safe_load(f)["keywords"]
+    min_words, max_words = (int(n) for n in args.words.split("-"))
+    return {
+        "api_keys": {"gemini": "stub"},
+        "keywords": keywords,
+        "gemini": {"api_url": gemini.api_url},
+        "email": {
+            "smtp_host": smtp.host,
+            "smtp_port": smtp.port,
+            "smtp_starttls": False,
+            "smtp_user": "soak",
+            "smtp_pass": "soak",
+            "from_address": "monitor@soak.invalid",
+            "to_address": "inbox@soak.invalid",
+        },
+        "outbox": {"enabled": True, "poll_interval_seconds": 1},
+        "firestore": {"enabled": False},
+        "monitor": {
+            "interval_seconds": args.interval,
+            "max_posts_per_run": args.max_posts,
+            "max_post_age_hours": 48,
+            "state_dir": str(out_dir / "state"),
+        },
+        "metrics": {"snapshot_path": str(out_dir / "metrics.json")},
+        "reddit": {"enabled": False},
+        "synthetic": {
+            "enabled": True,
+            "posts_per_minute": args.rate,
+            "min_words": min_words,
+            "max_words": max_words,
+            "keyword_hit_ratio": args.keyword_ratio,
+            "duplicate_ratio": args.duplicate_ratio,
+            "seed": args.seed,
+        },
+    }
+
+
+class SoakRecorder:
+    """Collects per-cycle rows and periodic resource samples."""
+
+    def __init__(self, out_dir: Path, gemini: StubGeminiServer, smtp: StubSMTPServer):
+        self.out_dir = out_dir
+        self.gemini = gemini
+        self.smtp = smtp
+        self.start = time.time()
+        self.cycles: List[Dict[str, Any]] = []
+        self.samples: List[Dict[str, Any]] = []
+        self._posts = 0
+        self._lock = threading.Lock()
+
+    def on_cycle(self, summary: Dict[str, Any]):
+        stages = {s["name"]: s for s in summary["stages"]}
+        row = {
+            "elapsed_s": round(summary["started_at"] - self.start, 1),
+            "duration_s": round(summary["duration"], 3),
+            "outcome": summary["outcome"],
+            "fetched": stages.get("fetch", {}).get("items_out", 0),
+            "new": stages.get("dedupe", {}).get("items_out", 0),
+            "notified": summary["new_posts"],
+            "rss_mb": round((rss_bytes() or 0) / 1e6, 1),
+        }
+        with self._lock:
+            self.cycles.append(row)
+            self._posts += summary["new_posts"]
+
+    def sample(self):
+        now = time.time()
+        with self._lock:
+            posts = self._posts
+            cycles = len(self.cycles)
+        self.samples.append({
+            "elapsed_s": round(now - self.start, 1),
+            "rss_mb": round((rss_bytes() or 0) / 1e6, 1),
+            "cycles": cycles,
+            "posts_notified": posts,
+            "gemini_requests": self.gemini.requests,
+            "emails_delivered": self.smtp.messages,
+            "threads": threading.active_count(),
+        })
+
+    def write(self) -> Dict[str, Any]:
+        for name, rows in (("cycles.csv", self.cycles), ("samples.csv", self.samples)):
+            if rows:
+                with open(self.out_dir / name, "w", newline="") as f:
+                    writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+                    writer.writeheader()
+                    writer.writerows(rows)
+
+        summary = self.summary()
+        with open(self.out_dir / "summary.json", "w") as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = time.time() - self.start
+        durations = sorted(c["duration_s"] for c in self.cycles)
+        rss = [(s["elapsed_s"], s["rss_mb"]) for s in self.samples if s["rss_mb"]]
+        # Skip the first tenth as warm-up before fitting the growth slope
+        steady = rss[len(rss) // 10:]
+        slope = None
+        if len(steady) >= 2:
+            xs, ys = [x for x, _ in steady], [y for _, y in steady]
+            mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+            var = sum((x - mean_x) ** 2 for x in xs)
+            if var:
+                slope = sum((x - mean_x) * (y - mean_y) for x, y in steady) / var * 3600
+
+        return {
+            "elapsed_s": round(elapsed, 1),
+            "cycles": len(self.cycles),
+            "failed_cycles": sum(1 for c in self.cycles if c["outcome"] != "ok"),
+            "posts_notified": self._posts,
+            "throughput_posts_per_min": round(self._posts / elapsed * 60, 2) if elapsed else 0,
+            "cycle_seconds": {
+                "p50": durations[len(durations) // 2] if durations else None,
+                "p95": durations[int(len(durations) * 0.95)] if durations else None,
+                "max": durations[-1] if durations else None,
+            },
+            "rss_mb": {
+                "start": rss[0][1] if rss else None,
+                "end": rss[-1][1] if rss else None,
+                "peak": max(y for _, y in rss) if rss else None,
+                "growth_mb_per_hour": round(slope, 2) if slope is not None else None,
+            },
+            "gemini_requests": self.gemini.requests,
+            "emails_delivered": self.smtp.messages,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak-test the monitor daemon against synthetic load")
+    parser.add_argument("--duration", default="1h", help="How long to run (e.g. 600, 15m, 4h)")
+    parser.add_argument("--rate", type=float, default=60, help="Synthetic posts per minute")
+    parser.add_argument("--interval", type=int, default=60, help="Seconds between cycles")
+    parser.add_argument("--words", default="40-300", help="Post body length range in words")
+    parser.add_argument("--keyword-ratio", type=float, default=0.2, help="Share of posts containing a keyword")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.1, help="Share of re-emitted posts")
+    parser.add_argument("--max-posts", type=int, default=1000, help="monitor.max_posts_per_run")
+    parser.add_argument("--gemini-latency", type=float, default=0.05, help="Stub Gemini latency (seconds)")
+    parser.add_argument("--relevant-ratio", type=float, default=0.7, help="Share judged relevant by stub Gemini")
+    parser.add_argument("--smtp-latency", type=float, default=0.01, help="Stub SMTP latency per message")
+    parser.add_argument("--workers", type=int, default=0, help="Queue worker processes (0 = in-process pipeline)")
+    parser.add_argument("--sample-interval", type=float, default=10, help="Seconds between resource samples")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default="soak-results", help="Output directory")
+    parser.add_argument("--verbose", "-v", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    logger.setLevel(logging.INFO)
+
+    out_dir = Path(args.out).absolute()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    gemini = StubGeminiServer(latency=args.gemini_latency, relevant_ratio=args.relevant_ratio)
+    smtp = StubSMTPServer(latency=args.smtp_latency)
+    gemini.start()
+    smtp.start()
+
+    config_path = out_dir / "soak-config.yaml"
+    with open(config_path, "w") as f:
+        yaml.safe_dump(build_config(args, gemini, smtp, out_dir), f)
+
+    import monitor
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    mon = monitor.SocialMonitor(config_path)
+    mon.start_metrics()
+    if args.workers:
+        mon.start_workers(args.workers)
+    recorder = SoakRecorder(out_dir, gemini, smtp)
+    mon.cycle_listeners.append(recorder.on_cycle)
+
+    duration = parse_duration(args.duration)
+    deadline = time.time() + duration
+
+    def sampler():
+        while time.time() < deadline and not stop.is_set():
+            recorder.sample()
+            stop.wait(args.sample_interval)
+        recorder.sample()
+        mon._running = False
+
+    stop = threading.Event()
+    sampler_thread = threading.Thread(target=sampler, name="soak-sampler", daemon=True)
+    logger.info(f"Soak: {duration:.0f}s at {args.rate:g} posts/min, results in {out_dir}")
+    sampler_thread.start()
+    try:
+        mon.run_daemon()
+    finally:
+        stop.set()
+        sampler_thread.join(5)
+        mon.stop_workers()
+        mon.stop_metrics()
+        gemini.stop()
+        smtp.stop()
+
+    summary = recorder.write()
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
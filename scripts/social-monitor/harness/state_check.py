@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Check that state persisted between runs still lines up in the next process.
+
+Each run is a separate Python process with its own hash seed, the way cron
+single runs and queue workers are. RSSAdapter polls a feed served by
+StubWebSubHub (plain, no hub) with adaptive polling, persisting the
+schedule state and the post archive between runs:
+
+    schedule  an unchanged feed is seen as unchanged by the next run and
+              backs off; one new item is counted as one
+    archive   every run archives the whole feed, but each article is
+              stored once
+
+Every step prints PASS or FAIL; the exit status is the number of failures.
+
+Usage:
+    python harness/state_check.py
+    python harness/state_check.py -v
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict
+
+SCRIPT_DIR = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from harness.stubs import StubWebSubHub
+from services.archive import PostArchive
+from services.scheduler import AdaptivePollPolicy
+
+KEYWORDS = ["new manager"]
+INITIAL_INTERVAL = 300
+
+
+def run_once(state_dir: Path, feed_url: str):
+    """One run (child process): poll the feed, archive it and save the schedule state."""
+    from adapters.rssfeeds import RSSAdapter
+    from services.scheduler import PollScheduler
+
+    scheduler = PollScheduler(
+        state_dir / "schedule_state.json",
+        adaptive=AdaptivePollPolicy(min_interval=60, max_interval=86400, initial_interval=INITIAL_INTERVAL),
+    )
+    adapter = RSSAdapter({"feeds": [{"url": feed_url, "name": "Stub"}]})
+    adapter.scheduler = scheduler
+    adapter.archive = PostArchive(state_dir / "archive.db")
+    adapter.fetch_posts(KEYWORDS)
+    adapter.archive.close()
+    scheduler.save()
+
+
+def spawn(state_dir: Path, feed_url: str, seed: int, verbose: bool):
+    """Run `run_once` in a fresh process with its own hash seed."""
+    env = dict(os.environ, PYTHONHASHSEED=str(seed))
+    command = [sys.executable, __file__, "--run-once", str(state_dir), feed_url] + (["-v"] if verbose else [])
+    subprocess.run(command, env=env, check=True)
+
+
+def source_state(state_dir: Path, feed_url: str) -> Dict[str, Any]:
+    """The feed's schedule and rate, made due again as if its interval had passed."""
+    path = state_dir / "schedule_state.json"
+    data = json.loads(path.read_text())
+    name = f"rss:{feed_url}"
+    schedule, rate = data["schedules"][name], data["rates"][name]
+    schedule["next_due"] = 0.0
+    path.write_text(json.dumps(data))
+    return {"interval": schedule["interval"], "new_per_poll": rate["new_per_poll"], "polls": rate["polls"]}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check state persisted across runs in separate processes")
+    parser.add_argument("--verbose", "-v", action="store_true")
+    parser.add_argument("--run-once", nargs=2, metavar=("STATE_DIR", "FEED_URL"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    if args.run_once:
+        run_once(Path(args.run_once[0]), args.run_once[1])
+        return 0
+
+    hub = StubWebSubHub()
+    hub.start()
+    state_dir = Path(tempfile.mkdtemp(prefix="state-check-"))
+    failures = 0
+
+    def check(name: str, ok: bool, detail: str = ""):
+        nonlocal failures
+        failures += not ok
+        print(f"{'PASS' if ok else 'FAIL'}  {name}{f' ({detail})' if detail else ''}")
+
+    try:
+        for i in range(3):
+            hub.publish(f"Advice {i} for a new manager")
+
+        seed = 0
+        for _ in range(4):
+            seed += 1
+            spawn(state_dir, hub.plain_feed_url, seed, args.verbose)
+            state = source_state(state_dir, hub.plain_feed_url)
+        check("schedule: unchanged feed is not new to the next run", state["new_per_poll"] < 0.5,
+              f"~{state['new_per_poll']:.2f} new/poll after {state['polls']} runs")
+        check("schedule: unchanged feed backs off", state["interval"] > INITIAL_INTERVAL,
+              f"interval {state['interval']:.0f}s")
+
+        quiet = state
+        hub.publish("One more for a new manager")
+        seed += 1
+        spawn(state_dir, hub.plain_feed_url, seed, args.verbose)
+        state = source_state(state_dir, hub.plain_feed_url)
+        smoothing = AdaptivePollPolicy().smoothing
+        expected = smoothing * 1 + (1 - smoothing) * quiet["new_per_poll"]
+        check("schedule: one new item counted once", abs(state["new_per_poll"] - expected) < 1e-6,
+              f"~{state['new_per_poll']:.2f} new/poll")
+
+        archive = PostArchive(state_dir / "archive.db")
+        stored = archive.count()
+        archive.close()
+        check("archive: each article stored once", stored == len(hub.items),
+              f"{stored} rows for {len(hub.items)} articles over {seed} runs")
+    finally:
+        hub.stop()
+
+    print(f"\n{failures} failure(s)")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,448 @@
+"""Local stand-ins for Gemini, SMTP, a WebSub hub and the Discord Gateway so tests never leave the machine."""
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import socketserver
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlencode
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class StubGeminiServer:
+    """
+    Minimal generateContent endpoint.
+
+    Relevance prompts get a deterministic YES/NO (by prompt hash, at
+    `relevant_ratio`); anything else gets a short canned draft. Responses
+    include usageMetadata so token metrics are exercised.
+    """
+
+    def __init__(self, latency: float = 0.0, relevant_ratio: float = 0.7, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.relevant_ratio = relevant_ratio
+        self.requests = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                try:
+                    prompt = json.loads(body)["contents"][0]["parts"][0]["text"]
+                except Exception:
+                    self.send_error(400)
+                    return
+                with stub._lock:
+                    stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                if "Reply with ONLY" in prompt:
+                    bucket = int(hashlib.md5(prompt.encode("utf-8")).hexdigest()[:8], 16) / 0xFFFFFFFF
+                    text = "YES - stub verdict" if bucket < stub.relevant_ratio else "NO - stub verdict"
+                else:
+                    text = "Thanks for sharing this. A stub draft reply would go here."
+                payload = json.dumps({
+                    "candidates": [{"content": {"parts": [{"text": text}]}}],
+                    "usageMetadata": {
+                        "promptTokenCount": len(prompt) // 4,
+                        "candidatesTokenCount": len(text) // 4,
+                    },
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address[:2]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def api_url(self) -> str:
+        """URL template for the `gemini.api_url` config setting."""
+        return f"http://{self.host}:{self.port}/v1beta/models/{{model}}:generateContent"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-gemini", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: EHLO, AUTH, MAIL, RCPT, DATA, NOOP, RSET, QUIT."""
+
+    def _reply(self, line: str):
+        self.wfile.write((line + "\r\n").encode("ascii"))
+
+    def handle(self):
+        stub = self.server.stub
+        self._reply("220 stub ESMTP ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("utf-8", "replace").strip().upper()
+            if command.startswith("EHLO"):
+                self.wfile.write(b"250-stub\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n")
+            elif command.startswith("HELO"):
+                self._reply("250 stub")
+            elif command.startswith("AUTH"):
+                self._reply("235 2.7.0 Authentication successful")
+            elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                self._reply("250 OK")
+            elif command == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                size = 0
+                while True:
+                    data = self.rfile.readline()
+                    if not data or data in (b".\r\n", b".\n"):
+                        break
+                    size += len(data)
+                if stub.latency:
+                    time.sleep(stub.latency)
+                with stub._lock:
+                    stub.messages += 1
+                    stub.bytes += size
+                self._reply("250 OK queued")
+            elif command == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class StubSMTPServer:
+    """Accepts and discards mail, counting messages and bytes."""
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.messages = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer((host, port), _SMTPHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self.host, self.port = self._server.server_address[:2]
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-smtp", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class StubWebSubHub:
+    """
+    A publisher and its WebSub hub in one server.
+
+    GET  /feed.xml   RSS feed advertising this hub (rel="hub") and itself (rel="self")
+    GET  /plain.xml  The same items without a hub, to exercise the polling fallback
+    POST /hub        Subscription requests; each is verified with a GET challenge
+                     on the callback (the subscriber must echo it)
+
+    `publish()` adds items and POSTs a feed of just those items to every
+    verified subscriber, signed with X-Hub-Signature (sha256) using the
+    subscriber's hub.secret.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, lease_seconds: Optional[int] = None):
+        self.lease_seconds = lease_seconds
+        self.items: List[Dict[str, str]] = []
+        self.feed_requests = 0
+        self.deliveries = 0
+        self.subscribers: Dict[str, Dict[str, str]] = {}  # callback -> {"topic", "secret"}
+        self._lock = threading.Lock()
+        hub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in ("/feed.xml", "/plain.xml"):
+                    self.send_error(404)
+                    return
+                with hub._lock:
+                    hub.feed_requests += 1
+                    items = list(hub.items)
+                body = hub.render(items, advertise=self.path == "/feed.xml")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+                form = {k: v[0] for k, v in parse_qs(body).items()}
+                if self.path != "/hub" or form.get("hub.mode") != "subscribe" or not form.get("hub.callback"):
+                    self.send_error(400)
+                    return
+                self.send_response(202)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                # Verify intent asynchronously, like real hubs
+                threading.Thread(target=hub._verify, args=(form,), daemon=True).start()
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address[:2]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def feed_url(self) -> str:
+        return f"http://{self.host}:{self.port}/feed.xml"
+
+    @property
+    def plain_feed_url(self) -> str:
+        return f"http://{self.host}:{self.port}/plain.xml"
+
+    @property
+    def hub_url(self) -> str:
+        return f"http://{self.host}:{self.port}/hub"
+
+    def render(self, items: List[Dict[str, str]], advertise: bool = True) -> bytes:
+        links = (
+            f'<atom:link rel="hub" href="{self.hub_url}"/><atom:link rel="self" href="{self.feed_url}"/>'
+            if advertise else ""
+        )
+        entries = "".join(
+            f"<item><title>{item['title']}</title><link>{item['link']}</link><guid>{item['link']}</guid>"
+            f"<description>{item['description']}</description><pubDate>{item['published']}</pubDate></item>"
+            for item in items
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>'
+            f"<title>Stub feed</title><link>http://{self.host}:{self.port}/</link>{links}{entries}"
+            "</channel></rss>"
+        ).encode("utf-8")
+
+    def _verify(self, form: Dict[str, str]):
+        challenge = secrets.token_hex(8)
+        params = {
+            "hub.mode": "subscribe",
+            "hub.topic": form.get("hub.topic", ""),
+            "hub.challenge": challenge,
+            "hub.lease_seconds": str(self.lease_seconds or form.get("hub.lease_seconds", 86400)),
+        }
+        try:
+            response = requests.get(f"{form['hub.callback']}?{urlencode(params)}", timeout=5)
+        except requests.RequestException as e:
+            logger.warning(f"Stub hub: verification of {form['hub.callback']} failed: {e}")
+            return
+        if response.status_code // 100 == 2 and response.text == challenge:
+            with self._lock:
+                self.subscribers[form["hub.callback"]] = {
+                    "topic": form.get("hub.topic", ""), "secret": form.get("hub.secret", "")
+                }
+
+    def publish(self, title: str, description: str = "", link: Optional[str] = None, sign: bool = True) -> int:
+        """
+        Add an item and push it to verified subscribers.
+
+        Args:
+            sign: Sign deliveries (False, or a wrong key, exercises rejection)
+
+        Returns:
+            Deliveries acknowledged with 2xx
+        """
+        item = {
+            "title": title,
+            "description": description,
+            "link": link or f"http://{self.host}:{self.port}/items/{len(self.items) + 1}",
+            "published": formatdate(usegmt=True),
+        }
+        with self._lock:
+            self.items.append(item)
+            subscribers = dict(self.subscribers)
+        body = self.render([item])
+        delivered = 0
+        for callback, sub in subscribers.items():
+            headers = {"Content-Type": "application/rss+xml"}
+            if sign and sub["secret"]:
+                digest = hmac.new(sub["secret"].encode("utf-8"), body, "sha256").hexdigest()
+                headers["X-Hub-Signature"] = f"sha256={digest}"
+            try:
+                if requests.post(callback, data=body, headers=headers, timeout=5).status_code // 100 == 2:
+                    delivered += 1
+            except requests.RequestException as e:
+                logger.warning(f"Stub hub: delivery to {callback} failed: {e}")
+        with self._lock:
+            self.deliveries += delivered
+        return delivered
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-websub-hub", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class StubDiscordGateway:
+    """
+    Fake Discord Gateway (websocket) and message history endpoint.
+
+    WS  /gateway                           HELLO; IDENTIFY -> READY; RESUME -> missed
+                                           events + RESUMED (or INVALID_SESSION when
+                                           `allow_resume` is False); heartbeat ACKs
+    GET /api/v10/channels/{id}/messages    History with `limit` / `after`, newest first
+
+    `post_message()` stores a message and dispatches MESSAGE_CREATE to every
+    session (queued for replay while a session is disconnected);
+    `drop_connections()` closes all sockets to force reconnects.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, heartbeat_interval_ms: int = 41250):
+        from aiohttp import web
+
+        self.host = host
+        self.heartbeat_interval_ms = heartbeat_interval_ms
+        self.allow_resume = True
+        self.messages: Dict[str, List[Dict[str, Any]]] = {}
+        self.rest_requests = 0
+        self.identifies = 0
+        self.resumes = 0
+        self._next_id = 0
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+
+        app = web.Application()
+        app.router.add_get("/gateway", self._gateway)
+        app.router.add_get("/gateway/", self._gateway)
+        app.router.add_get("/api/v10/channels/{channel_id}/messages", self._history)
+        self._runner = web.AppRunner(app)
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, host, port)
+        self._loop.run_until_complete(site.start())
+        self.port = self._runner.addresses[0][1]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def gateway_url(self) -> str:
+        return f"ws://{self.host}:{self.port}/gateway"
+
+    @property
+    def api_base(self) -> str:
+        return f"http://{self.host}:{self.port}/api/v10"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop.run_forever, name="stub-discord", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join(5)
+
+    def post_message(self, channel_id: str, content: str) -> Dict[str, Any]:
+        """Store a message and dispatch MESSAGE_CREATE to every session."""
+        return asyncio.run_coroutine_threadsafe(self._post(str(channel_id), content), self._loop).result(5)
+
+    def drop_connections(self):
+        asyncio.run_coroutine_threadsafe(self._drop(), self._loop).result(5)
+
+    async def _post(self, channel_id: str, content: str) -> Dict[str, Any]:
+        # Real snowflakes (timestamp in the high bits) so the adapter can age-filter them
+        self._next_id = max(self._next_id + 1, int(time.time() * 1000 - 1420070400000) << 22)
+        msg = {
+            "id": str(self._next_id),
+            "channel_id": channel_id,
+            "guild_id": "1",
+            "content": content,
+            "author": {"id": "2", "username": "stub"},
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+        self.messages.setdefault(channel_id, []).append(msg)
+        for session in self._sessions.values():
+            session["seq"] += 1
+            event = {"op": 0, "t": "MESSAGE_CREATE", "s": session["seq"], "d": msg}
+            if session["ws"] is not None and not session["ws"].closed:
+                await session["ws"].send_json(event)
+            else:
+                session["backlog"].append(event)
+        return msg
+
+    async def _drop(self):
+        for session in self._sessions.values():
+            if session["ws"] is not None:
+                await session["ws"].close(code=4000)
+                session["ws"] = None
+
+    async def _gateway(self, request):
+        from aiohttp import WSMsgType, web
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_json({"op": 10, "d": {"heartbeat_interval": self.heartbeat_interval_ms}})
+        session = None
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                continue
+            payload = json.loads(message.data)
+            op = payload.get("op")
+            if op == 1:
+                await ws.send_json({"op": 11})
+            elif op == 2:
+                self.identifies += 1
+                session = {"id": secrets.token_hex(8), "seq": 1, "ws": ws, "backlog": []}
+                self._sessions[session["id"]] = session
+                await ws.send_json({"op": 0, "t": "READY", "s": 1, "d": {
+                    "session_id": session["id"], "resume_gateway_url": self.gateway_url,
+                }})
+            elif op == 6:
+                resumed = self._sessions.get(payload["d"].get("session_id"))
+                if resumed is None or not self.allow_resume:
+                    await ws.send_json({"op": 9, "d": False})
+                    continue
+                self.resumes += 1
+                session = resumed
+                session["ws"] = ws
+                for event in session["backlog"]:
+                    if event["s"] > (payload["d"].get("seq") or 0):
+                        await ws.send_json(event)
+                session["backlog"] = []
+                session["seq"] += 1
+                await ws.send_json({"op": 0, "t": "RESUMED", "s": session["seq"], "d": {}})
+        if session is not None and session["ws"] is ws:
+            session["ws"] = None
+        return ws
+
+    async def _history(self, request):
+        from aiohttp import web
+
+        self.rest_requests += 1
+        messages = self.messages.get(request.match_info["channel_id"], [])
+        limit = min(int(request.query.get("limit", 50)), 100)
+        if "after" in request.query:
+            after = int(request.query["after"])
+            page = [m for m in messages if int(m["id"]) > after][:limit]
+        else:
+            page = messages[-limit:]
+        return web.json_response(list(reversed(page)))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+End-to-end check of WebSub push ingestion against a local hub stand-in.
+
+Runs RSSAdapter over two feeds served by StubWebSubHub - one advertising
+the hub, one without - with a WebSubSubscriber callback server on
+localhost, and walks through discovery, subscription verification, signed
+pushes, a forged push and the polling fallback. Every step prints PASS or
+FAIL; the exit status is the number of failures.
+
+Usage:
+    python harness/websub_check.py
+    python harness/websub_check.py -v
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+SCRIPT_DIR = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from adapters.rssfeeds import RSSAdapter
+from harness.stubs import StubWebSubHub
+from services.websub import WebSubSubscriber
+
+KEYWORDS = ["new manager"]
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check WebSub push ingestion against a local hub")
+    parser.add_argument("--verbose", "-v", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    hub = StubWebSubHub()
+    hub.start()
+    subscriber = WebSubSubscriber("http://127.0.0.1:0", host="127.0.0.1", port=0, fallback_poll_seconds=3600)
+    subscriber.start()
+    subscriber.callback_url = f"http://127.0.0.1:{subscriber.port}/websub"
+
+    adapter = RSSAdapter({"feeds": [
+        {"url": hub.feed_url, "name": "Stub (hub)"},
+        {"url": hub.plain_feed_url, "name": "Stub (no hub)"},
+    ]})
+    adapter.websub = subscriber
+    failures = 0
+
+    def check(name: str, ok: bool, detail: str = ""):
+        nonlocal failures
+        failures += not ok
+        print(f"{'PASS' if ok else 'FAIL'}  {name}{f' ({detail})' if detail else ''}")
+
+    try:
+        hub.publish("Advice for a new manager", "First week as a new manager")
+        posts = list(adapter.iter_posts(KEYWORDS))
+        check("first cycle polls both feeds", hub.feed_requests == 2, f"{hub.feed_requests} requests")
+        check("polled entry matched once across both feeds", len(posts) == 1, f"{len(posts)} posts")
+        check("hub verified the subscription", wait_for(lambda: subscriber.active_count() == 1))
+        check("feed without a hub not subscribed", len(hub.subscribers) == 1)
+
+        delivered = hub.publish("Coaching a new manager", "Pushed within seconds")
+        check("signed push acknowledged", delivered == 1)
+        hub.publish("Forged new manager update", "not signed", sign=False)
+        buffered = [post.title for _, post in adapter._pushed]
+        check("unsigned push ignored", buffered == ["Coaching a new manager"], ", ".join(buffered))
+
+        requests_before = hub.feed_requests
+        posts = {p.title: p for p in adapter.iter_posts(KEYWORDS)}
+        polled = hub.feed_requests - requests_before
+        check("second cycle polls only the feed without a hub", polled == 1, f"{polled} requests")
+        pushed = posts.get("Coaching a new manager")
+        check("pushed entry parsed by _entry_to_post and matched",
+              pushed is not None and pushed.platform == "rss" and pushed.metadata["source"] == "Stub (hub)")
+
+        subscriber.fallback_poll_seconds = 0
+        requests_before = hub.feed_requests
+        list(adapter.iter_posts(KEYWORDS))
+        polled = hub.feed_requests - requests_before
+        check("fallback poll of a subscribed feed when due", polled == 2, f"{polled} requests")
+    finally:
+        subscriber.stop()
+        hub.stop()
+
+    print(f"\n{failures} failure(s)")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,17 +9,25 @@ Usage:
     python monitor.py --test              # Test mode (print instead of email)
     python monitor.py --daemon            # Continuous monitoring
     python monitor.py --config custom.yaml  # Use custom config file
+    python monitor.py --daemon --metrics-port 9108  # Expose Prometheus metrics
 """
 
 import argparse
 import json
 import logging
+import math
+import shutil
 import signal
 import sys
+import tempfile
+import threading
 import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Any
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Set, Any
 
 import yaml
 
@@ -27,12 +35,21 @@ import yaml
 SCRIPT_DIR = Path(__file__).parent.absolute()
 sys.path.insert(0, str(SCRIPT_DIR))
 
-from adapters import (
-    RedditAdapter, TwitterAdapter, DiscordAdapter, HackerNewsAdapter,
-    MediumAdapter, DevToAdapter, StackExchangeAdapter, RSSAdapter,
-    IndieHackersAdapter, Post
+# Adapters and heavier services (Gemini/requests, SMTP, Firestore, cassettes,
+# profilers) are imported when first needed to keep cron cold starts fast
+from adapters import ADAPTERS, Post
+from services import (
+    NotificationOutbox, OutboxDispatcher, Pipeline, PollScheduler, AdaptivePollPolicy, Stage, StageStats,
+    MetricsServer, FreshnessTracker, KeywordYield, Span, configure_json_logging, get_firestore_service,
+    get_metrics, get_tracer
 )
-from services import GeminiService, EmailService, get_firestore_service
+from services.freshness import post_freshness_metadata
+
+if TYPE_CHECKING:
+    from services import (
+        BatchEmailRenderer, Cassette, CycleProfiler, EmailService, GeminiService, MemoryProfiler, PostArchive,
+        Task, TaskQueue, WebSubSubscriber, WorkerPool
+    )
 
 # Configure logging
 logging.basicConfig(
@@ -47,39 +64,59 @@ class SeenPostsStore:
     """
     Persistent storage for seen post IDs to avoid re-notifying.
     
-    Stores post IDs with timestamps, auto-cleans old entries.
+    Stores post IDs with timestamps, auto-cleans old entries. Posts that were
+    evaluated but rejected (e.g. by the AI relevance check) are tracked
+    separately so adapters polled on different cadences don't re-evaluate them.
     """
     
     def __init__(self, filepath: Path, max_age_days: int = 7):
         self.filepath = filepath
         self.max_age_days = max_age_days
         self._seen: Dict[str, str] = {}  # post_id -> timestamp
+        self._evaluated: Dict[str, str] = {}  # rejected post_id -> timestamp
+        self._mtime: Optional[float] = None
         self._load()
     
     def _load(self):
         """Load seen posts from file."""
         if self.filepath.exists():
             try:
+                self._mtime = self.filepath.stat().st_mtime
                 with open(self.filepath, "r") as f:
                     data = json.load(f)
                     self._seen = data.get("posts", {})
+                    self._evaluated = data.get("evaluated", {})
                     logger.debug(f"Loaded {len(self._seen)} seen posts")
             except Exception as e:
                 logger.warning(f"Error loading seen posts: {e}")
                 self._seen = {}
+                self._evaluated = {}
     
     def _save(self):
         """Save seen posts to file."""
         try:
             data = {
                 "posts": self._seen,
+                "evaluated": self._evaluated,
                 "updated": datetime.now(timezone.utc).isoformat()
             }
-            with open(self.filepath, "w") as f:
+            # Replace atomically; queue workers may be reading the file
+            tmp_path = self.filepath.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
                 json.dump(data, f, indent=2)
+            tmp_path.replace(self.filepath)
         except Exception as e:
             logger.error(f"Error saving seen posts: {e}")
     
+    def refresh(self):
+        """Reload if another process (the queue coordinator) saved since."""
+        try:
+            mtime = self.filepath.stat().st_mtime
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self._load()
+    
     def is_seen(self, post_id: str) -> bool:
         """Check if a post has been seen."""
         return post_id in self._seen
@@ -88,6 +125,14 @@ class SeenPostsStore:
         """Mark a post as seen."""
         self._seen[post_id] = datetime.now(timezone.utc).isoformat()
     
+    def mark_evaluated(self, post_id: str):
+        """Remember a post that was evaluated and rejected."""
+        self._evaluated[post_id] = datetime.now(timezone.utc).isoformat()
+    
+    def is_known(self, post_id: str) -> bool:
+        """Check if a post was already notified or already rejected."""
+        return post_id in self._seen or post_id in self._evaluated
+    
     def filter_unseen(self, posts: List[Post]) -> List[Post]:
         """Filter posts to only those not seen before."""
         return [p for p in posts if not self.is_seen(p.id)]
@@ -96,20 +141,23 @@ class SeenPostsStore:
         """Remove entries older than max_age_days."""
         cutoff = datetime.now(timezone.utc) - timedelta(days=self.max_age_days)
         
-        to_remove = []
-        for post_id, timestamp in self._seen.items():
-            try:
-                ts = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-                if ts < cutoff:
-                    to_remove.append(post_id)
-            except Exception:
-                pass
-        
-        for post_id in to_remove:
-            del self._seen[post_id]
+        removed = 0
+        for store in (self._seen, self._evaluated):
+            to_remove = []
+            for post_id, timestamp in store.items():
+                try:
+                    ts = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+                    if ts < cutoff:
+                        to_remove.append(post_id)
+                except Exception:
+                    pass
+            
+            for post_id in to_remove:
+                del store[post_id]
+            removed += len(to_remove)
         
-        if to_remove:
-            logger.info(f"Cleaned up {len(to_remove)} old seen posts")
+        if removed:
+            logger.info(f"Cleaned up {removed} old seen posts")
     
     def commit(self):
         """Save changes to disk."""
@@ -121,33 +169,82 @@ class SeenPostsStore:
         return len(self._seen)
 
 
+@dataclass
+class CycleState:
+    """State shared by the pipeline stages of one monitoring cycle."""
+    
+    age_cutoff: Optional[datetime]
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    seen_ids: Set[str] = field(default_factory=set)
+    sent_ids: Optional[Set[str]] = None
+    admitted: int = 0
+    over_limit: int = 0
+    rejected: List[str] = field(default_factory=list)
+    responses: Dict[str, Optional[str]] = field(default_factory=dict)
+    # Cycle span; pipeline threads don't inherit it, so stages pass it explicitly
+    span: Optional[Span] = None
+    # post ID -> {stage: epoch time reached}, for freshness measurement
+    stage_times: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    # post ID -> AI relevance verdict, recorded in the post archive
+    verdicts: Dict[str, bool] = field(default_factory=dict)
+
+
 class SocialMonitor:
     """
     Main social media monitoring orchestrator.
     """
     
-    def __init__(self, config_path: Path, test_mode: bool = False):
+    def __init__(
+        self,
+        config_path: Path,
+        test_mode: bool = False,
+        state_dir: Optional[Path] = None,
+        worker: bool = False,
+    ):
         """
         Initialize the monitor.
         
         Args:
             config_path: Path to config.yaml
             test_mode: If True, print instead of emailing
+            state_dir: Local state directory (overrides monitor.state_dir)
+            worker: Queue worker process (executes tasks; never notifies)
         """
         self.config_path = config_path
         self.test_mode = test_mode
+        self.worker = worker
         self.config = self._load_config()
+        if self.config.get("logging", {}).get("format") == "json":
+            configure_json_logging(logging.getLogger().level)
+        
+        # Bound post bodies at ingestion (before any adapter runs)
+        Post.max_content_chars = self.config.get("monitor", {}).get("max_content_chars", Post.max_content_chars)
+        
+        # Diagnostics (metrics snapshot, trace, profiles) always go to the
+        # configured directory, even when state_dir is a replay scratch copy
+        self.output_dir = SCRIPT_DIR / self.config.get("monitor", {}).get("state_dir", ".")
+        
+        # Local state (seen posts, schedules, outbox) lives here
+        self.state_dir = state_dir or self.output_dir
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Shared Firestore dedup/subscriptions (disable for isolated runs)
+        self.firestore_enabled = self.config.get("firestore", {}).get("enabled", True)
         
         # Initialize seen posts store
-        seen_path = SCRIPT_DIR / "seen_posts.json"
+        seen_path = self.state_dir / "seen_posts.json"
         self.seen_store = SeenPostsStore(seen_path)
         
         # Initialize adapters
         self.adapters = self._init_adapters()
         
+        # Post-to-inbox freshness (needed by the outbox dispatcher)
+        self.freshness = FreshnessTracker.from_config(self.config.get("freshness", {}))
+        
         # Initialize services
         self.gemini = self._init_gemini()
         self.email = self._init_email()
+        self.outbox, self.dispatcher = self._init_outbox()
         
         # Get keywords
         self.keywords = self.config.get("keywords", [])
@@ -157,6 +254,65 @@ class SocialMonitor:
         self.interval = monitor_config.get("interval_seconds", 300)
         self.max_posts = monitor_config.get("max_posts_per_run", 20)
         self.max_age_hours = monitor_config.get("max_post_age_hours", 24)
+        self.fetch_limit = monitor_config.get("fetch_limit")
+        
+        # Pipeline settings (stage concurrency and queue bounds)
+        pipeline_config = monitor_config.get("pipeline", {})
+        self.queue_size = pipeline_config.get("queue_size", 64)
+        self.fetch_workers = pipeline_config.get("fetch_workers", 4)
+        self.relevance_workers = pipeline_config.get("relevance_workers", 2)
+        self.draft_workers = pipeline_config.get("draft_workers", 2)
+        self.last_pipeline_stats: List[StageStats] = []
+        
+        # Per-adapter polling schedules (shared with adapters for per-feed schedules)
+        self.scheduler = self._init_scheduler()
+        
+        # Searchable archive of every fetched post (shared with adapters)
+        self.archive = self._init_archive()
+        
+        # Per-keyword matched / relevant / notified counts by day
+        self.keyword_yield = KeywordYield(
+            self.state_dir / "keyword_yield.json",
+            retention_days=self.config.get("keyword_yield", {}).get("retention_days", 90),
+        )
+        
+        # Queue-backed execution on worker processes (opt-in, see start_workers)
+        queue_config = self.config.get("queue", {})
+        self.queue_poll_interval = queue_config.get("poll_interval_seconds", 0.2)
+        self.queue_cycle_timeout = queue_config.get("cycle_timeout_seconds", 900)
+        self.task_queue: Optional["TaskQueue"] = self._init_task_queue() if worker else None
+        self.workers: Optional["WorkerPool"] = None
+        self.worker_id: Optional[str] = None
+        if worker:
+            # Per-source schedules live in the coordinator's state; workers poll every source
+            for adapter in self.adapters:
+                adapter.scheduler = None
+                if adapter.platform_name == "discord":
+                    # One Gateway session per bot token; workers poll over REST (see start_workers)
+                    adapter.gateway_config = {**adapter.gateway_config, "enabled": False}
+        
+        # Metrics (always collected; served over HTTP / dumped only if configured)
+        self._active_pipeline: Optional[Pipeline] = None
+        self.metrics_server: Optional[MetricsServer] = None
+        self.websub: Optional["WebSubSubscriber"] = None
+        self.metrics_snapshot_path: Optional[Path] = None
+        self._init_metrics()
+        
+        # Span tracing (exported only if configured)
+        self.tracer = get_tracer()
+        self.trace_path: Optional[Path] = None
+        
+        # Per-cycle tracemalloc diffs (opt-in)
+        self.memory_profiler: Optional["MemoryProfiler"] = None
+        
+        # CPU profiling of every Nth cycle (opt-in)
+        self.profiler: Optional["CycleProfiler"] = None
+        
+        # Fixed "now" for age filtering while replaying a cassette
+        self.clock_override: Optional[datetime] = None
+        
+        # Called with a summary dict after every cycle (soak harness, profiling)
+        self.cycle_listeners: List[Callable[[Dict[str, Any]], None]] = []
         
         # Daemon control
         self._running = False
@@ -172,77 +328,62 @@ class SocialMonitor:
             return yaml.safe_load(f)
     
     def _init_adapters(self) -> List:
-        """Initialize platform adapters based on config."""
+        """
+        Initialize platform adapters based on config.
+        
+        Only enabled adapters are imported (see adapters/registry.py), so a
+        disabled platform's client libraries are never loaded.
+        """
         adapters = []
+        for spec in ADAPTERS:
+            if not spec.is_enabled(self.config):
+                continue
+            try:
+                adapters.append(spec.create(self.config))
+                logger.info(f"{spec.label} adapter enabled")
+            except ImportError as e:
+                logger.error(f"{spec.label} adapter unavailable: {e}")
+        return adapters
+    
+    def _init_scheduler(self) -> PollScheduler:
+        """
+        Register a polling schedule for each adapter.
         
-        # Reddit adapter
-        reddit_config = self.config.get("reddit", {})
-        if reddit_config.get("enabled", True):
-            adapters.append(RedditAdapter(reddit_config))
-            logger.info("Reddit adapter enabled")
-        
-        # Twitter adapter
-        twitter_config = self.config.get("twitter", {})
-        if twitter_config.get("enabled", False):
-            twitter_config["api_keys"] = self.config.get("api_keys", {}).get("twitter", {})
-            adapters.append(TwitterAdapter(twitter_config))
-            logger.info("Twitter adapter enabled")
-        
-        # Discord adapter
-        discord_config = self.config.get("discord", {})
-        if discord_config.get("enabled", False):
-            adapters.append(DiscordAdapter(discord_config))
-            logger.info("Discord adapter enabled")
-        
-        # Hacker News adapter
-        hn_config = self.config.get("hackernews", {})
-        if hn_config.get("enabled", False):
-            adapters.append(HackerNewsAdapter(hn_config))
-            logger.info("Hacker News adapter enabled")
-        
-        # Medium adapter
-        medium_config = self.config.get("medium", {})
-        if medium_config.get("enabled", False):
-            adapters.append(MediumAdapter(medium_config))
-            logger.info("Medium adapter enabled")
-        
-        # Dev.to adapter
-        devto_config = self.config.get("devto", {})
-        if devto_config.get("enabled", False):
-            adapters.append(DevToAdapter(devto_config))
-            logger.info("Dev.to adapter enabled")
-        
-        # Stack Exchange adapter
-        se_config = self.config.get("stackexchange", {})
-        if se_config.get("enabled", False):
-            adapters.append(StackExchangeAdapter(se_config))
-            logger.info("Stack Exchange adapter enabled")
-        
-        # Leadership RSS feeds adapter
-        rss_config = self.config.get("rss_feeds", {})
-        if rss_config.get("enabled", False):
-            adapters.append(RSSAdapter(rss_config))
-            logger.info("RSS Feeds adapter enabled")
-        
-        # Indie Hackers adapter
-        ih_config = self.config.get("indiehackers", {})
-        if ih_config.get("enabled", False):
-            adapters.append(IndieHackersAdapter(ih_config))
-            logger.info("Indie Hackers adapter enabled")
+        Adapters default to the global interval; a `schedule` block in the
+        adapter's config section overrides interval, jitter and priority.
+        With adaptive polling enabled, individual feeds and subreddits are
+        additionally polled at a rate matched to how often they change.
+        """
+        adaptive_config = self.config.get("monitor", {}).get("adaptive_polling", {})
+        adaptive = None
+        if adaptive_config.get("enabled", False):
+            adaptive = AdaptivePollPolicy.from_config(adaptive_config, self.interval)
         
-        return adapters
+        scheduler = PollScheduler(self.state_dir / "schedule_state.json", adaptive=adaptive)
+        for adapter in self.adapters:
+            schedule_config = adapter.config.get("schedule", {})
+            scheduler.add(
+                adapter.platform_name,
+                interval=schedule_config.get("interval_seconds", self.interval),
+                jitter=schedule_config.get("jitter_seconds", 0),
+                priority=schedule_config.get("priority", 0),
+            )
+            adapter.scheduler = scheduler
+        return scheduler
     
-    def _init_gemini(self) -> Optional[GeminiService]:
+    def _init_gemini(self) -> Optional["GeminiService"]:
         """Initialize Gemini service."""
         api_key = self.config.get("api_keys", {}).get("gemini", "")
         if not api_key or api_key == "YOUR_GEMINI_API_KEY":
             logger.warning("No Gemini API key configured, responses won't be generated")
             return None
         
+        from services import GeminiService
+        
         gemini_config = self.config.get("gemini", {})
         return GeminiService(gemini_config, api_key)
     
-    def _init_email(self) -> Optional[EmailService]:
+    def _init_email(self) -> Optional["EmailService"]:
         """Initialize email service."""
         email_config = self.config.get("email", {})
         
@@ -251,8 +392,261 @@ class SocialMonitor:
             logger.warning("No SMTP credentials configured, emails won't be sent")
             return None
         
+        from services import EmailService
+        
         return EmailService(email_config)
     
+    def _init_archive(self) -> Optional["PostArchive"]:
+        """Open the local post archive and attach it to every adapter."""
+        archive_config = self.config.get("archive", {})
+        if not archive_config.get("enabled", True):
+            return None
+        from services import PostArchive
+        
+        try:
+            archive = PostArchive(
+                self.state_dir / archive_config.get("path", "archive.db"),
+                batch_size=archive_config.get("batch_size", 500),
+                retention_days=archive_config.get("retention_days", 365),
+            )
+        except Exception as e:
+            logger.error(f"Post archive unavailable: {e}")
+            return None
+        for adapter in self.adapters:
+            adapter.archive = archive
+        return archive
+    
+    def _init_task_queue(self) -> "TaskQueue":
+        """Open the shared task queue (coordinator and workers each open their own)."""
+        from services import TaskQueue
+        
+        queue_config = self.config.get("queue", {})
+        return TaskQueue(
+            self.state_dir / queue_config.get("path", "tasks.db"),
+            lease_seconds=queue_config.get("lease_seconds", 300),
+            max_attempts=queue_config.get("max_attempts", 3),
+            base_backoff_seconds=queue_config.get("base_backoff_seconds", 5),
+        )
+    
+    def _init_outbox(self):
+        """
+        Initialize the durable notification outbox and its dispatcher.
+        
+        Returns:
+            (NotificationOutbox, OutboxDispatcher), or (None, None) when emails
+            are sent inline (test mode, no SMTP, or outbox disabled)
+        """
+        outbox_config = self.config.get("outbox", {})
+        if self.test_mode or self.worker or not self.email or not outbox_config.get("enabled", True):
+            return None, None
+        
+        outbox = NotificationOutbox(
+            self.state_dir / outbox_config.get("path", "outbox.db"),
+            max_attempts=outbox_config.get("max_attempts", 8),
+            base_backoff_seconds=outbox_config.get("base_backoff_seconds", 30),
+            max_backoff_seconds=outbox_config.get("max_backoff_seconds", 3600),
+        )
+        purged = outbox.purge_sent(outbox_config.get("retention_days", 7))
+        if purged:
+            logger.debug(f"Purged {purged} delivered outbox messages")
+        
+        dispatcher = OutboxDispatcher(
+            outbox,
+            send=lambda m: self.email.deliver_html(m.recipient, m.subject, m.html_body),
+            session=self.email.session,
+            poll_interval=outbox_config.get("poll_interval_seconds", 5),
+            on_sent=self._record_sent,
+        )
+        self.outbox_flush_timeout = outbox_config.get("flush_timeout_seconds", 120)
+        return outbox, dispatcher
+    
+    def _init_metrics(self):
+        """Register monitor-level metrics and scrape-time gauges."""
+        metrics = get_metrics()
+        self._m_fetch_latency = metrics.histogram(
+            "adapter_fetch_seconds", "Time to fetch from one adapter", ("adapter",)
+        )
+        self._m_fetch_errors = metrics.counter("adapter_fetch_errors_total", "Adapter fetch failures", ("adapter",))
+        self._m_items_fetched = metrics.counter(
+            "items_fetched_total", "Raw items examined before keyword filtering", ("adapter",)
+        )
+        self._m_items_matched = metrics.counter("items_matched_total", "Keyword-matched items", ("adapter",))
+        self._m_items_deduped = metrics.counter(
+            "items_deduplicated_total", "Recent items dropped as already seen or sent"
+        )
+        self._m_dedupe_ratio = metrics.gauge(
+            "dedupe_ratio", "Share of recent items dropped as duplicates in the last cycle"
+        )
+        self._m_posts_processed = metrics.counter("posts_processed_total", "New posts notified")
+        self._m_cycles = metrics.counter("cycles_total", "Monitoring cycles run", ("outcome",))
+        self._m_cycle_seconds = metrics.histogram("cycle_duration_seconds", "Monitoring cycle duration")
+        
+        outbox_depth = metrics.gauge("outbox_messages", "Notifications in the outbox by status", ("status",))
+        if self.outbox:
+            outbox_depth.set_function(
+                lambda: {(status,): n for status, n in self.outbox.counts().items()}
+            )
+        metrics.gauge(
+            "pipeline_queue_depth", "Items queued in front of each pipeline stage", ("stage",)
+        ).set_function(
+            lambda: {(name,): n for name, n in self._active_pipeline.queue_depths().items()}
+            if self._active_pipeline else {}
+        )
+    
+    def _record_sent(self, message):
+        """Outbox callback: measure post-to-inbox age for each delivered post."""
+        now = time.time()
+        for info in message.metadata.get("freshness", {}).values():
+            self.freshness.record(info["platform"], "sent", info.get("created_at"), now)
+    
+    def _record_freshness(self, posts: List[Post], cycle: "CycleState"):
+        """Feed the stage times of notified posts to the freshness tracker."""
+        for post in posts:
+            for stage, at in cycle.stage_times.get(post.id, {}).items():
+                self.freshness.mark(post, stage, at)
+    
+    def start_metrics(self, port: Optional[int] = None, snapshot_path: Optional[str] = None):
+        """
+        Start the metrics endpoint and/or JSON snapshots if configured.
+        
+        Args:
+            port: Serve /metrics on this port (overrides config)
+            snapshot_path: Write a JSON snapshot here after each cycle (overrides config)
+        """
+        metrics_config = self.config.get("metrics", {})
+        snapshot_path = snapshot_path or metrics_config.get("snapshot_path")
+        if snapshot_path:
+            self.metrics_snapshot_path = Path(snapshot_path)
+            if not self.metrics_snapshot_path.is_absolute():
+                self.metrics_snapshot_path = self.output_dir / self.metrics_snapshot_path
+        
+        if port is None and not metrics_config.get("enabled", False):
+            return
+        server = MetricsServer(
+            get_metrics(),
+            host=metrics_config.get("host", "127.0.0.1"),
+            port=port if port is not None else metrics_config.get("port", 9108),
+        )
+        try:
+            server.start()
+            self.metrics_server = server
+        except OSError as e:
+            logger.error(f"Could not start metrics endpoint: {e}")
+    
+    def stop_metrics(self):
+        """Stop the endpoint and write a final snapshot."""
+        self.dump_metrics()
+        if self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
+    
+    def start_websub(self):
+        """
+        Receive pushed feed updates from WebSub hubs, if configured (daemon mode).
+        
+        Feed adapters subscribe to the hubs their feeds advertise and stop
+        polling those feeds once a subscription is verified.
+        """
+        websub_config = self.config.get("websub", {})
+        if not websub_config.get("enabled", False):
+            return
+        if self.workers:
+            # Feeds are fetched in the worker processes, which the callback server can't reach
+            logger.warning("WebSub push is not available with queue workers; polling instead")
+            return
+        callback_url = websub_config.get("callback_url")
+        if not callback_url:
+            logger.warning("websub.callback_url not set; polling instead")
+            return
+        
+        from services import WebSubSubscriber
+        
+        subscriber = WebSubSubscriber(
+            callback_url,
+            host=websub_config.get("host", "0.0.0.0"),
+            port=websub_config.get("port", 8088),
+            lease_seconds=websub_config.get("lease_seconds", 86400),
+            fallback_poll_seconds=websub_config.get("fallback_poll_seconds", 21600),
+        )
+        try:
+            subscriber.start()
+        except OSError as e:
+            logger.error(f"Could not start WebSub callback server: {e}")
+            return
+        self.websub = subscriber
+        for adapter in self.adapters:
+            adapter.websub = subscriber
+    
+    def stop_websub(self):
+        if self.websub:
+            self.websub.stop()
+            for adapter in self.adapters:
+                adapter.websub = None
+            self.websub = None
+    
+    def dump_metrics(self):
+        if self.metrics_snapshot_path:
+            get_metrics().dump_json(self.metrics_snapshot_path)
+    
+    def start_tracing(self, path: Optional[str] = None):
+        """
+        Record spans and export them as a Chrome trace after each cycle.
+        
+        Args:
+            path: Trace file (overrides config)
+        """
+        tracing_config = self.config.get("tracing", {})
+        if path is None and not tracing_config.get("enabled", False):
+            return
+        self.trace_path = Path(path or tracing_config.get("output", "trace.json"))
+        if not self.trace_path.is_absolute():
+            self.trace_path = self.output_dir / self.trace_path
+        self.tracer.enable(tracing_config.get("max_spans"))
+        logger.info(f"Tracing enabled, writing {self.trace_path}")
+    
+    def export_trace(self):
+        if self.trace_path:
+            self.tracer.export_chrome(self.trace_path)
+    
+    def start_memory_tracing(self, force: bool = False):
+        """
+        Diff tracemalloc snapshots at every cycle boundary.
+        
+        Args:
+            force: Enable even if memory.enabled is false in config
+        """
+        memory_config = self.config.get("memory", {})
+        if not force and not memory_config.get("enabled", False):
+            return
+        from services import MemoryProfiler
+        
+        self.memory_profiler = MemoryProfiler.from_config(memory_config, self.output_dir)
+        self.memory_profiler.start()
+        self.cycle_listeners.append(self.memory_profiler.on_cycle)
+    
+    def start_profiling(self, output_dir: Optional[str] = None, every: Optional[int] = None):
+        """
+        Profile cycles and write collapsed stacks / hot-function tables.
+        
+        Args:
+            output_dir: Profile directory (overrides config; enables profiling)
+            every: Profile every Nth cycle (overrides config; enables profiling)
+        """
+        profiling_config = dict(self.config.get("profiling", {}))
+        if output_dir is None and every is None and not profiling_config.get("enabled", False):
+            return
+        if output_dir:
+            profiling_config["output_dir"] = output_dir
+        if every:
+            profiling_config["every"] = every
+        from services import CycleProfiler
+        
+        self.profiler = CycleProfiler.from_config(profiling_config, self.output_dir)
+        logger.info(
+            f"Profiling every {self.profiler.every} cycle(s) ({self.profiler.mode}), "
+            f"writing {self.profiler.output_dir}"
+        )
+    
     def fetch_all_posts(self) -> List[Post]:
         """
         Fetch posts from all enabled adapters.
@@ -264,7 +658,7 @@ class SocialMonitor:
         
         for adapter in self.adapters:
             try:
-                posts = adapter.fetch_posts(self.keywords)
+                posts = adapter.fetch_posts(self.keywords, since=self._age_cutoff(), limit=self.fetch_limit)
                 all_posts.extend(posts)
                 logger.info(f"{adapter.platform_name}: {len(posts)} matches")
             except Exception as e:
@@ -272,22 +666,22 @@ class SocialMonitor:
         
         return all_posts
     
+    def _age_cutoff(self) -> Optional[datetime]:
+        """Oldest creation time still considered recent (None = no limit)."""
+        if not self.max_age_hours:
+            return None
+        now = self.clock_override or datetime.now(timezone.utc)
+        return now - timedelta(hours=self.max_age_hours)
+    
+    @staticmethod
+    def _is_recent(post: Post, cutoff: Optional[datetime]) -> bool:
+        # Include posts without timestamps
+        return cutoff is None or post.created_at is None or post.created_at > cutoff
+    
     def filter_by_age(self, posts: List[Post]) -> List[Post]:
         """Filter posts to only recent ones."""
-        if not self.max_age_hours:
-            return posts
-        
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=self.max_age_hours)
-        
-        filtered = []
-        for post in posts:
-            if post.created_at is None:
-                # Include posts without timestamps
-                filtered.append(post)
-            elif post.created_at > cutoff:
-                filtered.append(post)
-        
-        return filtered
+        cutoff = self._age_cutoff()
+        return [post for post in posts if self._is_recent(post, cutoff)]
     
     def process_posts(self, posts: List[Post]) -> Dict[str, Optional[str]]:
         """
@@ -316,7 +710,9 @@ class SocialMonitor:
         """
         Send notifications for matched posts.
         
-        In test mode, prints to console instead of emailing.
+        In test mode, prints to console instead of emailing. With the outbox
+        enabled, emails are rendered and queued here and delivered by the
+        dispatcher, so a slow SMTP server never blocks the cycle.
         """
         if not posts:
             return
@@ -380,12 +776,22 @@ class SocialMonitor:
             self._send_to_single_recipient(posts, responses)
             return
         
-        # Send to each subscriber with their filtered platforms
-        for sub in subscriptions:
-            self._send_to_subscriber(sub, posts, responses)
+        # Send to each subscriber with their filtered platforms, reusing one
+        # authenticated SMTP connection for the whole fan-out. With the outbox
+        # this loop only enqueues; the dispatcher thread holds its own session.
+        renderer = self.email.fanout_renderer(posts, responses)
+        with nullcontext() if self.outbox else self.email.session():
+            for sub in subscriptions:
+                self._send_to_subscriber(sub, posts, responses, renderer)
+        
+        logger.debug(
+            f"Email render cache: {renderer.cache_hits} hits, {renderer.cache_misses} misses"
+        )
     
     def _get_subscriptions(self) -> List[Dict[str, Any]]:
         """Fetch subscriptions from Firestore."""
+        if not self.firestore_enabled:
+            return []
         try:
             firestore = get_firestore_service()
             return firestore.get_subscriptions()
@@ -395,6 +801,21 @@ class SocialMonitor:
     
     def _send_to_single_recipient(self, posts: List[Post], responses: Dict[str, Optional[str]]):
         """Send to the single recipient configured in config.yaml."""
+        if self.outbox:
+            recipient = self.email.to_address
+            if not recipient:
+                logger.warning("No recipient email configured, skipping")
+                return
+            if len(posts) > 1:
+                subject, html_body = self.email.render_batch(posts, responses)
+            else:
+                subject, html_body = self.email.render_notification(posts[0], responses.get(posts[0].id))
+            if self.outbox.enqueue(
+                recipient, subject, html_body, [p.id for p in posts], post_freshness_metadata(posts)
+            ):
+                logger.info(f"Queued notification for {len(posts)} posts to {recipient}")
+            return
+        
         if len(posts) > 1:
             success = self.email.send_batch_notification(posts, responses)
             if success:
@@ -410,7 +831,8 @@ class SocialMonitor:
         self, 
         subscription: Dict[str, Any], 
         all_posts: List[Post], 
-        responses: Dict[str, Optional[str]]
+        responses: Dict[str, Optional[str]],
+        renderer: Optional["BatchEmailRenderer"] = None
     ):
         """Send filtered posts to a specific subscriber."""
         email = subscription.get("email")
@@ -431,84 +853,251 @@ class SocialMonitor:
         }
         
         # Filter posts to only those from subscriber's selected platforms
-        subscriber_platforms = set(platform_map.get(p, p) for p in platforms)
-        filtered_posts = [p for p in all_posts if p.platform in subscriber_platforms]
+        subscriber_platforms = frozenset(platform_map.get(p, p) for p in platforms)
+        if renderer is not None:
+            # Subscribers with the same platform selection share one render
+            filtered_posts, html_body = renderer.for_platforms(subscriber_platforms)
+        else:
+            filtered_posts = [p for p in all_posts if p.platform in subscriber_platforms]
+            html_body = None
         
         if not filtered_posts:
             logger.debug(f"No posts for {email} (platforms: {platforms})")
             return
         
+        if self.outbox:
+            subject, html_body = self.email.render_batch(filtered_posts, responses, html_body)
+            if self.outbox.enqueue(
+                email, subject, html_body, [p.id for p in filtered_posts],
+                post_freshness_metadata(filtered_posts)
+            ):
+                logger.info(f"Queued {len(filtered_posts)} posts for {email} ({', '.join(platforms)})")
+            return
+        
         # Send the email
-        success = self.email.send_batch_notification(filtered_posts, responses, recipient=email)
+        success = self.email.send_batch_notification(
+            filtered_posts, responses, recipient=email, html_body=html_body
+        )
         if success:
             logger.info(f"Sent {len(filtered_posts)} posts to {email} ({', '.join(platforms)})")
         else:
             logger.error(f"Failed to send email to {email}")
     
-    def run_once(self) -> int:
+    def _build_pipeline(self, cycle: "CycleState") -> Pipeline:
+        """Assemble the streaming stages for one monitoring cycle."""
+        return Pipeline([
+            Stage("fetch", partial(self._stage_fetch, cycle=cycle), workers=self.fetch_workers),
+            Stage("normalize", partial(self._stage_normalize, cycle=cycle)),
+            Stage("dedupe", partial(self._stage_dedupe, cycle=cycle)),
+            Stage("keyword", partial(self._stage_keyword, cycle=cycle)),
+            Stage("relevance", partial(self._stage_relevance, cycle=cycle), workers=self.relevance_workers),
+            Stage("draft", partial(self._stage_draft, cycle=cycle), workers=self.draft_workers),
+        ], queue_size=self.queue_size)
+    
+    def _stage_fetch(self, adapter, cycle: "CycleState") -> Iterator[Post]:
+        """Stream matched posts out of one adapter."""
+        name = adapter.platform_name
+        start = time.perf_counter()
+        fetched_before = adapter.items_fetched
+        count = 0
+        with self.tracer.span(name, "adapter", parent=cycle.span, adapter=name) as span:
+            try:
+                # Adapters push the age cutoff into their queries; normalize re-checks it
+                for post in adapter.iter_posts(self.keywords, since=cycle.age_cutoff, limit=self.fetch_limit):
+                    count += 1
+                    # A duplicate fetched later in the cycle keeps the first post's times
+                    cycle.stage_times.setdefault(post.id, {}).setdefault("fetched", time.time())
+                    yield post
+            except Exception as e:
+                self._m_fetch_errors.inc(adapter=name)
+                span.outcome = "error"
+                span.set(error=str(e)[:200])
+                logger.error(f"Error fetching from {name}: {e}")
+            fetched = max(adapter.items_fetched - fetched_before, count)
+            span.set(fetched=fetched, matched=count)
+        elapsed = time.perf_counter() - start
+        self._m_fetch_latency.observe(elapsed, adapter=name)
+        self._m_items_fetched.inc(fetched, adapter=name)
+        self._m_items_matched.inc(count, adapter=name)
+        logger.info(f"{name}: {count} matches ({elapsed:.1f}s)")
+    
+    def _stage_normalize(self, post: Post, cycle: "CycleState") -> Optional[List[Post]]:
+        """Normalize timestamps and drop posts older than the age cutoff."""
+        if post.created_at is not None and post.created_at.tzinfo is None:
+            post.created_at = post.created_at.replace(tzinfo=timezone.utc)
+        if not self._is_recent(post, cycle.age_cutoff):
+            return None
+        return [post]
+    
+    def _stage_dedupe(self, post: Post, cycle: "CycleState") -> Optional[List[Post]]:
+        """Drop duplicates within the cycle and posts already seen or sent."""
+        with cycle.lock:
+            if post.id in cycle.seen_ids:
+                return None
+            cycle.seen_ids.add(post.id)
+            if cycle.sent_ids is None:
+                # Loaded on first use so the Firestore read overlaps with fetching
+                cycle.sent_ids = self._load_sent_ids()
+        
+        # Filter using BOTH local store AND Firestore (shared with Cloud Function)
+        if self.seen_store.is_known(post.id) or post.id in cycle.sent_ids:
+            return None
+        return [post]
+    
+    def _stage_keyword(self, post: Post, cycle: "CycleState") -> Optional[List[Post]]:
+        """Record matched keywords and enforce the per-run post limit."""
+        if not post.matched_keywords:
+            text = post.full_text.lower()
+            post.matched_keywords = [kw for kw in self.keywords if kw.lower() in text]
+        
+        with cycle.lock:
+            if cycle.admitted >= self.max_posts:
+                cycle.over_limit += 1
+                return None
+            cycle.admitted += 1
+        cycle.stage_times.setdefault(post.id, {})["matched"] = time.time()
+        self.keyword_yield.record("matched", post.matched_keywords)
+        return [post]
+    
+    def _stage_relevance(self, post: Post, cycle: "CycleState") -> Optional[List[Post]]:
+        """AI relevance check - keep only truly leadership-relevant posts."""
+        if not self.gemini:
+            self.keyword_yield.record("relevant", post.matched_keywords)
+            return [post]
+        with self.tracer.span(
+            "relevance", "post", parent=cycle.span, post_id=post.id, platform=post.platform
+        ) as span:
+            try:
+                verdict = self.gemini.check_relevance(post)
+                if verdict is None:
+                    # No verdict (API error, unclear reply): include, but record no label
+                    span.outcome = "unchecked"
+                    return [post]
+                if verdict:
+                    span.outcome = "relevant"
+                    cycle.stage_times.setdefault(post.id, {})["relevant"] = time.time()
+                    cycle.verdicts[post.id] = True
+                    self.keyword_yield.record("relevant", post.matched_keywords)
+                    return [post]
+                span.outcome = "rejected"
+                with cycle.lock:
+                    cycle.rejected.append(post.id)
+                    cycle.verdicts[post.id] = False
+                return None
+            except Exception as e:
+                span.outcome = "error"
+                logger.warning(f"Relevance check failed for {post.id}, including: {e}")
+                return [post]
+    
+    def _stage_draft(self, post: Post, cycle: "CycleState") -> List[Post]:
+        """Generate a response draft for a post."""
+        with self.tracer.span(
+            "draft", "post", parent=cycle.span, post_id=post.id, platform=post.platform
+        ) as span:
+            responses = self.process_posts([post])
+            if not responses.get(post.id):
+                span.outcome = "no_draft"
+        cycle.stage_times.setdefault(post.id, {})["drafted"] = time.time()
+        with cycle.lock:
+            cycle.responses.update(responses)
+        return [post]
+    
+    def _load_sent_ids(self) -> Set[str]:
+        """Load post IDs already sent by any runner (Firestore)."""
+        if not self.firestore_enabled:
+            return set()
+        try:
+            firestore_svc = get_firestore_service()
+            return firestore_svc.get_sent_post_ids()
+        except Exception as e:
+            logger.warning(f"Firestore dedup unavailable, using local only: {e}")
+            return set()
+    
+    def run_once(self, adapters: Optional[List] = None) -> int:
         """
         Run a single monitoring cycle.
         
+        Posts stream through fetch -> normalize -> dedupe -> keyword ->
+        relevance -> draft as soon as each adapter yields them, then the
+        survivors are notified as one batch.
+        
+        Args:
+            adapters: Adapters to poll (default: all enabled adapters)
+        
         Returns:
             Number of new posts processed
         """
         logger.info("Starting monitoring cycle...")
-        
-        # Fetch all posts
-        posts = self.fetch_all_posts()
-        logger.info(f"Total matched posts: {len(posts)}")
-        
-        # Filter by age
-        posts = self.filter_by_age(posts)
-        logger.info(f"After age filter: {len(posts)}")
-        
-        # Filter out seen posts (using BOTH local store AND Firestore)
-        new_posts = self.seen_store.filter_unseen(posts)
-        
-        # Also filter using Firestore (shared with Cloud Function)
+        started_at = time.time()
+        start = time.perf_counter()
+        adapters = self.adapters if adapters is None else adapters
+        count, outcome = 0, "error"
         try:
-            firestore_svc = get_firestore_service()
-            new_posts = firestore_svc.filter_unsent_posts(new_posts)
-        except Exception as e:
-            logger.warning(f"Firestore dedup unavailable, using local only: {e}")
+            with self.profiler.cycle() if self.profiler else nullcontext():
+                with self.tracer.span("cycle", "cycle", adapters=[a.platform_name for a in adapters]) as span:
+                    count = self._run_cycle(adapters, span)
+                    span.set(new_posts=count)
+            outcome = "ok"
+        finally:
+            duration = time.perf_counter() - start
+            self._m_cycle_seconds.observe(duration)
+            self._m_cycles.inc(outcome=outcome)
+            self._m_posts_processed.inc(count)
+            self._notify_cycle_listeners({
+                "started_at": started_at,
+                "duration": duration,
+                "outcome": outcome,
+                "new_posts": count,
+                "stages": [s.as_dict() for s in self.last_pipeline_stats] if outcome == "ok" else [],
+            })
+        return count
+    
+    def _notify_cycle_listeners(self, summary: Dict[str, Any]):
+        for listener in self.cycle_listeners:
+            try:
+                listener(summary)
+            except Exception as e:
+                logger.warning(f"Cycle listener failed: {e}")
+    
+    def _run_cycle(self, adapters: List, span) -> int:
+        """Body of run_once (see there)."""
+        cycle = CycleState(age_cutoff=self._age_cutoff(), span=span if isinstance(span, Span) else None)
+        if self.workers:
+            new_posts = self._collect_queued(adapters, cycle)
+        else:
+            new_posts = self._collect_pipelined(adapters, cycle)
+        
+        # Remember rejected posts so other adapters' cycles don't re-check them
+        for post_id in cycle.rejected:
+            self.seen_store.mark_evaluated(post_id)
         
-        logger.info(f"New (unseen) posts: {len(new_posts)}")
+        # Verdicts label the archive for offline keyword evaluation
+        if self.archive:
+            self.archive.record_verdicts(cycle.verdicts)
         
         if not new_posts:
+            if cycle.rejected:
+                self.seen_store.commit()
+            self.keyword_yield.save()
             logger.info("No new posts to process")
             return 0
         
-        # Limit number of posts
-        if len(new_posts) > self.max_posts:
-            logger.info(f"Limiting to {self.max_posts} posts")
-            new_posts = new_posts[:self.max_posts]
+        # Send notifications
+        notify_start = time.perf_counter()
+        with self.tracer.span("notify", "notify", posts=len(new_posts)):
+            self.notify(new_posts, cycle.responses)
+        for post in new_posts:
+            self.keyword_yield.record("notified", post.matched_keywords)
+        self.keyword_yield.save()
         
-        # AI Relevance Check - filter to only truly leadership-relevant posts
-        if self.gemini:
-            logger.info("Checking AI relevance of posts...")
-            relevant_posts = []
+        self._record_freshness(new_posts, cycle)
+        if not self.outbox and not self.test_mode and self.email:
+            # Sent inline; queued notifications are measured on delivery instead
+            sent_at = time.time()
             for post in new_posts:
-                try:
-                    if self.gemini.check_relevance(post):
-                        relevant_posts.append(post)
-                except Exception as e:
-                    logger.warning(f"Relevance check failed for {post.id}, including: {e}")
-                    relevant_posts.append(post)
-            
-            filtered_count = len(new_posts) - len(relevant_posts)
-            if filtered_count > 0:
-                logger.info(f"AI filtered out {filtered_count} irrelevant posts")
-            new_posts = relevant_posts
-            
-            if not new_posts:
-                logger.info("No posts passed AI relevance check")
-                return 0
-        
-        # Generate responses
-        responses = self.process_posts(new_posts)
-        
-        # Send notifications
-        self.notify(new_posts, responses)
+                self.freshness.mark(post, "sent", sent_at)
+        self.freshness.log_summary()
+        self.freshness.check_slo()
         
         # Mark as seen (both local AND Firestore)
         for post in new_posts:
@@ -517,21 +1106,358 @@ class SocialMonitor:
         # Save seen posts locally
         self.seen_store.commit()
         
+        # Queued notifications are durable now; let the dispatcher deliver them
+        if self.dispatcher:
+            self.dispatcher.wake()
+        
         # Also save to Firestore (shared with Cloud Function)
-        try:
-            firestore_svc = get_firestore_service()
-            firestore_svc.mark_posts_as_sent([p.id for p in new_posts], user_email="python-script")
-        except Exception as e:
-            logger.warning(f"Failed to save to Firestore: {e}")
+        if self.firestore_enabled:
+            try:
+                firestore_svc = get_firestore_service()
+                firestore_svc.mark_posts_as_sent([p.id for p in new_posts], user_email="python-script")
+            except Exception as e:
+                logger.warning(f"Failed to save to Firestore: {e}")
         
+        logger.info(f"Notify stage: {time.perf_counter() - notify_start:.2f}s")
         logger.info(f"Processed {len(new_posts)} posts")
         return len(new_posts)
     
+    def _collect_pipelined(self, adapters: List, cycle: "CycleState") -> List[Post]:
+        """Stream the cycle through the in-process pipeline; returns the posts to notify."""
+        pipeline = self._build_pipeline(cycle)
+        self._active_pipeline = pipeline
+        try:
+            new_posts = pipeline.run(adapters)
+        finally:
+            self._active_pipeline = None
+            if self.archive:
+                self.archive.flush()
+        self.last_pipeline_stats = pipeline.stats
+        
+        fetched, recent, unseen, admitted, relevant, _ = [s.items_out for s in pipeline.stats]
+        self._m_items_deduped.inc(recent - unseen)
+        self._m_dedupe_ratio.set((recent - unseen) / recent if recent else 0.0)
+        logger.info(
+            f"Matched {fetched}, recent {recent}, new {unseen}, "
+            f"admitted {admitted}, relevant {relevant}"
+        )
+        if cycle.over_limit:
+            logger.info(f"Limited to {self.max_posts} posts ({cycle.over_limit} deferred to next run)")
+        if admitted > relevant:
+            logger.info(f"AI filtered out {admitted - relevant} irrelevant posts")
+        logger.info(f"Cycle stages: {pipeline.summary()}")
+        return new_posts
+    
+    def _collect_queued(self, adapters: List, cycle: "CycleState") -> List[Post]:
+        """
+        Run the cycle's fetches and AI calls as tasks on the worker processes.
+        
+        One fetch task per adapter returns its recent, not-yet-seen matches.
+        As each completes, its posts are deduplicated across adapters and
+        against Firestore, limited to max_posts_per_run, and queued as one
+        LLM task (relevance check + draft) per post. LLM tasks are keyed by
+        post ID, so a post left over from an interrupted cycle reuses its
+        stored result instead of being judged again.
+        
+        Returns:
+            Posts to notify, in completion order
+        """
+        from services.taskqueue import STATUS_DEAD
+        
+        queue = self.task_queue
+        self.workers.ensure_running()
+        self.last_pipeline_stats = []
+        cycle.sent_ids = self._load_sent_ids()
+        
+        batch = f"{time.time_ns():x}"
+        pending: Set[int] = {
+            queue.enqueue("fetch", f"{batch}:fetch:{a.platform_name}", {"adapter": a.platform_name})
+            for a in adapters
+        }
+        llm_posts: Dict[int, Post] = {}
+        new_posts: List[Post] = []
+        matched = recent_new = 0
+        deadline = time.time() + self.queue_cycle_timeout
+        
+        while pending:
+            for task in queue.finished(pending):
+                pending.discard(task.id)
+                if task.kind == "fetch":
+                    if task.status == STATUS_DEAD:
+                        self._m_fetch_errors.inc(adapter=task.payload["adapter"])
+                        logger.error(f"Error fetching from {task.payload['adapter']}: {task.last_error}")
+                        continue
+                    matched += task.result["matched"]
+                    recent_new += len(task.result["posts"])
+                    self._record_fetch_task(task)
+                    for data in task.result["posts"]:
+                        post = Post.from_dict(data)
+                        if not self._admit_queued(post, cycle):
+                            continue
+                        times = cycle.stage_times.setdefault(post.id, {})
+                        times.setdefault("fetched", task.result["fetched_at"])
+                        times.setdefault("matched", time.time())
+                        task_id = queue.enqueue("llm", f"llm:{post.id}", data)
+                        llm_posts[task_id] = post
+                        pending.add(task_id)
+                    continue
+                
+                post = llm_posts[task.id]
+                result = task.result or {}
+                if task.status == STATUS_DEAD:
+                    # Same as a failed relevance check in-process: include without a draft
+                    logger.warning(f"AI task failed for {post.id}, including: {task.last_error}")
+                elif result.get("checked"):
+                    cycle.verdicts[post.id] = result["relevant"]
+                if not result.get("relevant", True):
+                    cycle.rejected.append(post.id)
+                    continue
+                if result.get("checked") or not self.gemini:
+                    self.keyword_yield.record("relevant", post.matched_keywords)
+                times = cycle.stage_times.setdefault(post.id, {})
+                for stage in ("relevant", "drafted"):
+                    if result.get(f"{stage}_at"):
+                        times[stage] = result[f"{stage}_at"]
+                cycle.responses[post.id] = result.get("response")
+                new_posts.append(post)
+            
+            if pending:
+                if time.time() > deadline:
+                    logger.warning(
+                        f"Cycle timed out with {len(pending)} tasks unfinished; "
+                        "their posts are picked up next cycle"
+                    )
+                    break
+                # Replace crashed workers mid-cycle; their tasks come back when the lease expires
+                self.workers.ensure_running()
+                time.sleep(self.queue_poll_interval)
+        
+        unseen = len(cycle.seen_ids)
+        self._m_items_deduped.inc(recent_new - unseen)
+        logger.info(
+            f"Matched {matched}, recent and new {recent_new}, unique {unseen}, "
+            f"admitted {cycle.admitted}, relevant {len(new_posts)}"
+        )
+        if cycle.over_limit:
+            logger.info(f"Limited to {self.max_posts} posts ({cycle.over_limit} deferred to next run)")
+        if cycle.rejected:
+            logger.info(f"AI filtered out {len(cycle.rejected)} irrelevant posts")
+        return new_posts
+    
+    def _record_fetch_task(self, task: "Task"):
+        """Fetch metrics for an adapter polled by a worker."""
+        name = task.payload["adapter"]
+        result = task.result
+        self._m_fetch_latency.observe(result["seconds"], adapter=name)
+        self._m_items_fetched.inc(result["fetched"], adapter=name)
+        self._m_items_matched.inc(result["matched"], adapter=name)
+        logger.info(f"{name}: {result['matched']} matches ({result['seconds']:.1f}s, worker {task.result['worker']})")
+    
+    def _admit_queued(self, post: Post, cycle: "CycleState") -> bool:
+        """Cycle-wide dedupe and post limit for posts returned by fetch tasks."""
+        if post.id in cycle.seen_ids:
+            return False
+        cycle.seen_ids.add(post.id)
+        # Workers filter against their copy of the seen store; recheck the authoritative one
+        if self.seen_store.is_known(post.id) or post.id in cycle.sent_ids:
+            return False
+        if cycle.admitted >= self.max_posts:
+            cycle.over_limit += 1
+            return False
+        cycle.admitted += 1
+        self.keyword_yield.record("matched", post.matched_keywords)
+        return True
+    
+    def start_workers(self, size: Optional[int] = None):
+        """
+        Run fetches and AI calls on worker processes via the task queue.
+        
+        Args:
+            size: Worker processes (default: queue.workers)
+        """
+        from services import WorkerPool
+        
+        queue_config = self.config.get("queue", {})
+        if self.config.get("discord", {}).get("gateway", {}).get("enabled", False):
+            # Every worker would open its own session for the same bot and see every message
+            logger.warning("Discord gateway is not available with queue workers; polling instead")
+        self.task_queue = self._init_task_queue()
+        purged = self.task_queue.purge_finished(queue_config.get("retention_days", 2))
+        if purged:
+            logger.debug(f"Purged {purged} finished tasks")
+        self.workers = WorkerPool(
+            run_worker,
+            args=(str(self.config_path), self.test_mode, str(self.state_dir)),
+            size=size or queue_config.get("workers", 4),
+        )
+        self.workers.start()
+    
+    def stop_workers(self):
+        if self.workers:
+            self.workers.stop()
+            self.workers = None
+        if self.task_queue:
+            self.task_queue.close()
+            self.task_queue = None
+    
+    def work(self, worker_id: str, stop_event):
+        """
+        Lease and execute queued tasks until `stop_event` is set (worker processes).
+        
+        Failed tasks are retried with backoff by the queue; a task whose
+        lease expired while running (and was re-leased) has its result dropped.
+        """
+        handlers = {"fetch": self._run_fetch_task, "llm": self._run_llm_task}
+        self.worker_id = worker_id
+        self._adapters_by_name = {a.platform_name: a for a in self.adapters}
+        logger.info(f"Worker {worker_id} ready")
+        while not stop_event.is_set():
+            tasks = self.task_queue.lease(worker_id)
+            if not tasks:
+                stop_event.wait(self.queue_poll_interval)
+                continue
+            task = tasks[0]
+            try:
+                result = handlers[task.kind](task.payload)
+            except Exception as e:
+                retrying = self.task_queue.fail(task, worker_id, str(e))
+                logger.error(f"Task {task.key} failed ({'will retry' if retrying else 'giving up'}): {e}")
+                continue
+            if not self.task_queue.complete(task, worker_id, result):
+                logger.warning(f"Lease on {task.key} expired before it finished; result dropped")
+        if self.archive:
+            self.archive.close()
+        self.task_queue.close()
+    
+    def _run_fetch_task(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Poll one adapter; returns its recent matches not yet seen."""
+        adapter = self._adapters_by_name[payload["adapter"]]
+        start = time.perf_counter()
+        fetched_before = adapter.items_fetched
+        # Pick up posts the coordinator marked seen since the last task
+        self.seen_store.refresh()
+        state = CycleState(age_cutoff=self._age_cutoff())
+        posts, matched = [], 0
+        for post in adapter.iter_posts(self.keywords, since=state.age_cutoff, limit=self.fetch_limit):
+            matched += 1
+            if self._stage_normalize(post, state) and not self.seen_store.is_known(post.id):
+                posts.append(post.to_dict())
+        if self.archive:
+            self.archive.flush()
+        return {
+            "posts": posts,
+            "matched": matched,
+            "fetched": max(adapter.items_fetched - fetched_before, matched),
+            "fetched_at": time.time(),
+            "seconds": time.perf_counter() - start,
+            "worker": self.worker_id,
+        }
+    
+    def _run_llm_task(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Relevance check and, if relevant, response draft for one post."""
+        post = Post.from_dict(payload)
+        result: Dict[str, Any] = {"relevant": True, "checked": False, "response": None}
+        if self.gemini:
+            try:
+                verdict = self.gemini.check_relevance(post)
+                # None = no verdict reached: include the post, but it is not a label
+                result["relevant"] = verdict is not False
+                result["checked"] = verdict is not None
+                result["relevant_at"] = time.time()
+            except Exception as e:
+                logger.warning(f"Relevance check failed for {post.id}, including: {e}")
+        if result["relevant"]:
+            result["response"] = self.process_posts([post]).get(post.id)
+            result["drafted_at"] = time.time()
+        return result
+    
+    def due_adapters(self, single_run: bool = False) -> List:
+        """
+        Adapters whose polling schedule is due, highest priority first.
+        
+        Args:
+            single_run: In cron-driven single runs only adapters with an
+                explicit `schedule` are gated; the rest run every time.
+        """
+        by_name = {a.platform_name: a for a in self.adapters}
+        due = [by_name[s.name] for s in self.scheduler.due(list(by_name))]
+        if single_run:
+            due += [a for a in self.adapters if not a.config.get("schedule") and a not in due]
+        return due
+    
+    def run_due(self, single_run: bool = False) -> int:
+        """
+        Run one cycle over the adapters that are currently due.
+        
+        Returns:
+            Number of new posts processed
+        """
+        adapters = self.due_adapters(single_run)
+        if not adapters:
+            logger.info("No adapters due for polling")
+            return 0
+        
+        logger.info(f"Polling: {', '.join(a.platform_name for a in adapters)}")
+        try:
+            return self.run_once(adapters)
+        finally:
+            self.scheduler.mark_ran([a.platform_name for a in adapters])
+            self.scheduler.save()
+            self.dump_metrics()
+            self.export_trace()
+    
+    def run_cassette(self, cassette: "Cassette") -> int:
+        """
+        Run one full cycle over all adapters, recording to or replaying from a cassette.
+        
+        Per-source schedules are bypassed so every source is polled in both
+        modes. Recording snapshots the seen-posts state first; replaying
+        sends mail to a null transport, drops Firestore writes and filters
+        post age as of the recording time.
+        
+        Args:
+            cassette: Cassette opened in "record" or "replay" mode
+        
+        Returns:
+            Number of new posts processed
+        """
+        from services.cassette import NullSMTP, use_cassette
+        
+        if cassette.replaying:
+            self.clock_override = cassette.recorded_at
+            if self.email:
+                self.email.connection_factory = NullSMTP
+        else:
+            cassette.state_dir.mkdir(parents=True, exist_ok=True)
+            seen_path = self.state_dir / "seen_posts.json"
+            if seen_path.exists():
+                shutil.copy2(seen_path, cassette.state_dir / seen_path.name)
+        
+        for adapter in self.adapters:
+            adapter.scheduler = None
+        
+        use_cassette(cassette)
+        try:
+            count = self.run_once()
+            self.flush_outbox()
+        finally:
+            use_cassette(None)
+            cassette.close()
+            self.dump_metrics()
+            self.export_trace()
+        
+        if cassette.replaying:
+            logger.info(f"Replay: {cassette.hits} exchanges served, {cassette.misses} not in cassette")
+        return count
+    
     def run_daemon(self):
         """
         Run in daemon mode (continuous monitoring).
+        
+        Each adapter is polled on its own schedule; a cycle runs whenever
+        at least one adapter is due.
         """
-        logger.info(f"Starting daemon mode (interval: {self.interval}s)")
+        logger.info(f"Starting daemon mode (default interval: {self.interval}s)")
         logger.info("Press Ctrl+C to stop")
         
         self._running = True
@@ -544,27 +1470,54 @@ class SocialMonitor:
         signal.signal(signal.SIGINT, handle_signal)
         signal.signal(signal.SIGTERM, handle_signal)
         
+        if self.dispatcher:
+            self.dispatcher.start()
+        
+        adapter_names = [a.platform_name for a in self.adapters]
         cycle = 0
         while self._running:
-            cycle += 1
-            logger.info(f"=== Cycle {cycle} ===")
-            
-            try:
-                count = self.run_once()
-                logger.info(f"Cycle {cycle} complete: {count} new posts")
-            except Exception as e:
-                logger.error(f"Error in cycle {cycle}: {e}")
+            if self.scheduler.due(adapter_names):
+                cycle += 1
+                logger.info(f"=== Cycle {cycle} ===")
+                
+                try:
+                    count = self.run_due()
+                    logger.info(f"Cycle {cycle} complete: {count} new posts")
+                except Exception as e:
+                    logger.error(f"Error in cycle {cycle}: {e}")
             
             if self._running:
-                logger.info(f"Sleeping for {self.interval} seconds...")
+                wait = self.scheduler.seconds_until_next(adapter_names)
+                wait = self.interval if wait is None else wait
+                logger.info(f"Next poll in {wait:.0f} seconds...")
                 # Sleep in small intervals to allow quick shutdown
-                for _ in range(self.interval):
+                for _ in range(max(1, math.ceil(wait))):
                     if not self._running:
                         break
                     time.sleep(1)
         
+        if self.dispatcher:
+            self.dispatcher.stop()
+        self.stop_metrics()
+        
         logger.info("Daemon stopped")
     
+    def flush_outbox(self):
+        """Deliver queued notifications before a one-shot run exits."""
+        if not self.dispatcher:
+            return
+        
+        attempted = self.dispatcher.drain(self.outbox_flush_timeout)
+        counts = self.outbox.counts()
+        logger.info(
+            f"Outbox flushed: {attempted} attempted, {counts.get('pending', 0)} pending retry, "
+            f"{counts.get('dead', 0)} dead"
+        )
+        if attempted:
+            # Deliveries happened after the cycle summary; report post-to-inbox ages now
+            self.freshness.log_summary()
+            self.freshness.check_slo()
+    
     def test_connections(self):
         """Test all configured service connections."""
         print("\n🔍 Testing connections...\n")
@@ -600,6 +1553,112 @@ class SocialMonitor:
         print()
 
 
+def run_worker(config_path: str, test_mode: bool, state_dir: str, worker_id: str, stop_event):
+    """Entry point of a queue worker process (see SocialMonitor.start_workers)."""
+    # Ctrl+C reaches the whole process group; the coordinator stops workers via stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        monitor = SocialMonitor(Path(config_path), test_mode=test_mode, state_dir=Path(state_dir), worker=True)
+    except Exception as e:
+        logger.error(f"Worker {worker_id} failed to initialize: {e}")
+        sys.exit(1)
+    monitor.work(worker_id, stop_event)
+
+
+def _parse_when(value: Optional[str]) -> Optional[datetime]:
+    """Parse a `search --since/--until` value: "30d", "12h" or an ISO date."""
+    if not value:
+        return None
+    units = {"d": "days", "h": "hours", "m": "minutes"}
+    if value[-1] in units and value[:-1].isdigit():
+        return datetime.now(timezone.utc) - timedelta(**{units[value[-1]]: int(value[:-1])})
+    when = datetime.fromisoformat(value)
+    return when if when.tzinfo else when.replace(tzinfo=timezone.utc)
+
+
+def _load_cli_config(config_path: Path):
+    """
+    Config and state directory for the read-only subcommands.
+    
+    Returns:
+        (config dict, state dir); an empty config if the file is missing
+    """
+    config: Dict[str, Any] = {}
+    if config_path.exists():
+        with open(config_path, "r") as f:
+            config = yaml.safe_load(f) or {}
+    return config, SCRIPT_DIR / config.get("monitor", {}).get("state_dir", ".")
+
+
+def keyword_report(config_path: Path, args: argparse.Namespace) -> int:
+    """
+    Run `monitor.py keywords`: per-keyword yield recorded by past cycles.
+    
+    Returns:
+        Process exit status
+    """
+    config, state_dir = _load_cli_config(config_path)
+    path = state_dir / "keyword_yield.json"
+    if not path.exists():
+        logger.error(f"No keyword yield at {path} (it is written by monitoring runs)")
+        return 1
+    print(KeywordYield(path).report(config.get("keywords", []), days=args.days))
+    return 0
+
+
+def search_archive(config_path: Path, args: argparse.Namespace) -> int:
+    """
+    Run `monitor.py search` against the local post archive.
+    
+    Only reads the config for the archive location; adapters and services
+    are never started.
+    
+    Returns:
+        Process exit status
+    """
+    import sqlite3
+    from services import PostArchive
+    
+    config, state_dir = _load_cli_config(config_path)
+    path = state_dir / config.get("archive", {}).get("path", "archive.db")
+    if not path.exists():
+        logger.error(f"No post archive at {path} (it is written by monitoring runs)")
+        return 1
+    
+    try:
+        since, until = _parse_when(args.since), _parse_when(args.until)
+    except ValueError as e:
+        logger.error(f"Invalid --since/--until: {e}")
+        return 2
+    
+    archive = PostArchive(path)
+    try:
+        start = time.perf_counter()
+        hits = archive.search(
+            args.query, platforms=args.platform, since=since, until=until,
+            limit=args.limit, newest_first=args.newest,
+        )
+        elapsed = time.perf_counter() - start
+    except sqlite3.OperationalError as e:
+        logger.error(f"Invalid search query: {e}")
+        return 2
+    finally:
+        archive.close()
+    
+    for hit in hits:
+        post = hit.post
+        if args.json:
+            print(json.dumps(post.to_dict(), default=str))
+            continue
+        created = post.created_at.strftime("%Y-%m-%d %H:%M") if post.created_at else "unknown date"
+        print(f"[{post.platform}] {created}  {post.title or '(untitled)'}")
+        print(f"  {post.url}")
+        print(f"  {hit.snippet}\n")
+    if not args.json:
+        print(f"{len(hits)} hits in {elapsed * 1000:.1f} ms")
+    return 0
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -611,9 +1670,70 @@ Examples:
   %(prog)s --daemon            Continuous monitoring
   %(prog)s --check             Test API connections only
   %(prog)s --config my.yaml    Use custom config file
+  %(prog)s -d --metrics-port 9108  Daemon with Prometheus metrics
+  %(prog)s --record cassettes/slow   Record one cycle's traffic
+  %(prog)s --replay cassettes/slow   Re-run that cycle offline
+  %(prog)s -d --workers 4      Daemon with fetches and AI calls on 4 processes
+  %(prog)s search '"new manager" OR delegat* NOT hiring' --since 90d
+  %(prog)s keywords --days 7          Per-keyword yield and AI pass rate
         """
     )
     
+    subcommands = parser.add_subparsers(dest="command", metavar="{search,keywords}")
+    search_parser = subcommands.add_parser(
+        "search",
+        help="Search the local archive of fetched posts",
+        description="Full-text search over every post the monitor has fetched (SQLite FTS5).",
+    )
+    search_parser.add_argument(
+        "query",
+        help='FTS5 query: words, "phrases", AND/OR/NOT, prefix*, NEAR(a b, 5), title:word'
+    )
+    search_parser.add_argument(
+        "--platform",
+        action="append",
+        metavar="NAME",
+        help="Only posts from this platform (repeatable)"
+    )
+    search_parser.add_argument(
+        "--since",
+        metavar="WHEN",
+        help="Posts created since WHEN: 30d, 12h or an ISO date"
+    )
+    search_parser.add_argument(
+        "--until",
+        metavar="WHEN",
+        help="Posts created before WHEN: 30d, 12h or an ISO date"
+    )
+    search_parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="Maximum results (default: 20)"
+    )
+    search_parser.add_argument(
+        "--newest",
+        action="store_true",
+        help="Newest first instead of best match"
+    )
+    search_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print one JSON post per line"
+    )
+    
+    keywords_parser = subcommands.add_parser(
+        "keywords",
+        help="Per-keyword matches, relevance passes and notifications",
+        description="Keyword yield recorded by past cycles, lowest AI pass rate first.",
+    )
+    keywords_parser.add_argument(
+        "--days",
+        type=int,
+        default=30,
+        help="Window in days (default: 30)"
+    )
+    
     parser.add_argument(
         "--test", "-t",
         action="store_true",
@@ -639,6 +1759,83 @@ Examples:
         help="Path to config file (default: config.yaml)"
     )
     
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics"
+    )
+    
+    parser.add_argument(
+        "--metrics-json",
+        type=str,
+        metavar="PATH",
+        help="Write a JSON metrics snapshot to PATH after each cycle"
+    )
+    
+    parser.add_argument(
+        "--trace",
+        type=str,
+        metavar="PATH",
+        help="Record spans and write a Chrome trace (chrome://tracing, Perfetto) to PATH"
+    )
+    
+    parser.add_argument(
+        "--log-json",
+        action="store_true",
+        help="Structured JSON log lines (requires structlog)"
+    )
+    
+    parser.add_argument(
+        "--record",
+        type=str,
+        metavar="DIR",
+        help="Run one full cycle, recording adapter, Gemini and Firestore traffic to DIR"
+    )
+    
+    parser.add_argument(
+        "--replay",
+        type=str,
+        metavar="DIR",
+        help="Run one full cycle offline from a cassette recorded with --record"
+    )
+    
+    parser.add_argument(
+        "--replay-latency",
+        choices=["realistic", "none"],
+        default="realistic",
+        help="Replay with the recorded latencies or none (default: realistic)"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        type=str,
+        nargs="?",
+        const="profiles",
+        metavar="DIR",
+        help="Profile cycles; write collapsed stacks and top functions to DIR (default: profiles)"
+    )
+    
+    parser.add_argument(
+        "--profile-every",
+        type=int,
+        metavar="N",
+        help="Profile every Nth cycle (implies --profile)"
+    )
+    
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Log per-cycle memory growth and top allocation sites (tracemalloc)"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        help="Run fetches and AI calls on N worker processes via the task queue"
+    )
+    
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -650,27 +1847,85 @@ Examples:
     # Configure logging level
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
+    if args.log_json:
+        configure_json_logging(logging.getLogger().level)
     
     # Resolve config path
     config_path = Path(args.config)
     if not config_path.is_absolute():
         config_path = SCRIPT_DIR / config_path
     
+    if args.command == "search":
+        sys.exit(search_archive(config_path, args))
+    if args.command == "keywords":
+        sys.exit(keyword_report(config_path, args))
+    
+    # Open a cassette; replays run on a scratch copy of the recorded state
+    cassette, state_dir = None, None
+    try:
+        if args.record or args.replay:
+            from services import Cassette
+
+        if args.record:
+            cassette = Cassette(Path(args.record), "record")
+        elif args.replay:
+            cassette = Cassette(Path(args.replay), "replay", latency=args.replay_latency)
+            state_dir = Path(tempfile.mkdtemp(prefix="social-monitor-replay-"))
+            if cassette.state_dir.exists():
+                shutil.copytree(cassette.state_dir, state_dir, dirs_exist_ok=True)
+    except Exception as e:
+        logger.error(f"Failed to open cassette: {e}")
+        sys.exit(1)
+    
     # Initialize monitor
     try:
-        monitor = SocialMonitor(config_path, test_mode=args.test)
+        monitor = SocialMonitor(config_path, test_mode=args.test, state_dir=state_dir)
     except Exception as e:
         logger.error(f"Failed to initialize monitor: {e}")
         sys.exit(1)
     
+    # Queue-backed worker processes (not for cassette runs: the cassette is in-process)
+    queue_config = monitor.config.get("queue", {})
+    use_workers = not cassette and not args.check and (args.workers or queue_config.get("enabled", False))
+    if use_workers:
+        monitor.start_workers(args.workers)
+    
     # Run based on mode
-    if args.check:
+    if cassette:
+        monitor.start_metrics(args.metrics_port, args.metrics_json)
+        monitor.start_tracing(args.trace)
+        monitor.start_memory_tracing(args.trace_memory)
+        monitor.start_profiling(args.profile, args.profile_every)
+        count = monitor.run_cassette(cassette)
+        monitor.stop_metrics()
+        if state_dir:
+            shutil.rmtree(state_dir, ignore_errors=True)
+        print(f"\nProcessed {count} new posts")
+    elif args.check:
         monitor.test_connections()
     elif args.daemon:
+        monitor.start_metrics(args.metrics_port, args.metrics_json)
+        monitor.start_tracing(args.trace)
+        monitor.start_memory_tracing(args.trace_memory)
+        monitor.start_profiling(args.profile, args.profile_every)
+        monitor.start_websub()
         monitor.run_daemon()
+        monitor.stop_websub()
+        if use_workers:
+            monitor.stop_workers()
     else:
         # Single run
-        count = monitor.run_once()
+        monitor.start_metrics(args.metrics_port, args.metrics_json)
+        monitor.start_tracing(args.trace)
+        monitor.start_memory_tracing(args.trace_memory)
+        monitor.start_profiling(args.profile, args.profile_every)
+        try:
+            count = monitor.run_due(single_run=True)
+        finally:
+            if use_workers:
+                monitor.stop_workers()
+        monitor.flush_outbox()
+        monitor.stop_metrics()
         print(f"\nProcessed {count} new posts")
 
 
@@ -1,6 +1,114 @@
-"""Services for social media monitoring."""
-from .gemini import GeminiService
-from .email import EmailService
-from .firestore_service import FirestoreService, get_firestore_service
+"""Services for social media monitoring.
 
-__all__ = ["GeminiService", "EmailService", "FirestoreService", "get_firestore_service"]
+Names are imported from their submodules on first access, so e.g.
+firebase_admin is only loaded once Firestore is actually used.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .gemini import GeminiService
+    from .email import EmailService
+    from .email_render import BatchEmailRenderer
+    from .smtp_pool import SMTPSessionPool
+    from .outbox import NotificationOutbox, OutboxDispatcher
+    from .archive import ArchiveHit, PostArchive
+    from .taskqueue import Task, TaskQueue, WorkerPool
+    from .websub import WebSubSubscriber
+    from .pipeline import Pipeline, Stage, StageStats
+    from .scheduler import PollScheduler, PollSchedule, AdaptivePollPolicy
+    from .metrics import MetricsRegistry, MetricsServer, get_metrics
+    from .freshness import FreshnessTracker
+    from .keyword_yield import KeywordYield
+    from .memory import MemoryProfiler
+    from .profiling import CycleProfiler, StackSampler
+    from .cassette import Cassette, get_cassette, use_cassette
+    from .tracing import Span, Tracer, configure_json_logging, get_tracer
+    from .firestore_service import FirestoreService, get_firestore_service
+
+# Public name -> submodule
+_LAZY = {
+    "GeminiService": "gemini",
+    "EmailService": "email",
+    "BatchEmailRenderer": "email_render",
+    "SMTPSessionPool": "smtp_pool",
+    "NotificationOutbox": "outbox",
+    "OutboxDispatcher": "outbox",
+    "ArchiveHit": "archive",
+    "PostArchive": "archive",
+    "Task": "taskqueue",
+    "TaskQueue": "taskqueue",
+    "WorkerPool": "taskqueue",
+    "WebSubSubscriber": "websub",
+    "Pipeline": "pipeline",
+    "Stage": "pipeline",
+    "StageStats": "pipeline",
+    "PollScheduler": "scheduler",
+    "PollSchedule": "scheduler",
+    "AdaptivePollPolicy": "scheduler",
+    "MetricsRegistry": "metrics",
+    "MetricsServer": "metrics",
+    "get_metrics": "metrics",
+    "FreshnessTracker": "freshness",
+    "KeywordYield": "keyword_yield",
+    "MemoryProfiler": "memory",
+    "CycleProfiler": "profiling",
+    "StackSampler": "profiling",
+    "Cassette": "cassette",
+    "get_cassette": "cassette",
+    "use_cassette": "cassette",
+    "Span": "tracing",
+    "Tracer": "tracing",
+    "configure_json_logging": "tracing",
+    "get_tracer": "tracing",
+    "FirestoreService": "firestore_service",
+    "get_firestore_service": "firestore_service",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    "GeminiService",
+    "EmailService",
+    "BatchEmailRenderer",
+    "SMTPSessionPool",
+    "NotificationOutbox",
+    "OutboxDispatcher",
+    "ArchiveHit",
+    "PostArchive",
+    "Task",
+    "TaskQueue",
+    "WorkerPool",
+    "WebSubSubscriber",
+    "Pipeline",
+    "Stage",
+    "StageStats",
+    "PollScheduler",
+    "PollSchedule",
+    "AdaptivePollPolicy",
+    "MetricsRegistry",
+    "MetricsServer",
+    "get_metrics",
+    "FreshnessTracker",
+    "KeywordYield",
+    "MemoryProfiler",
+    "CycleProfiler",
+    "StackSampler",
+    "Cassette",
+    "get_cassette",
+    "use_cassette",
+    "Span",
+    "Tracer",
+    "configure_json_logging",
+    "get_tracer",
+    "FirestoreService",
+    "get_firestore_service",
+]
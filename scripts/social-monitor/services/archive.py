@@ -0,0 +1,262 @@
+"""Local SQLite archive of every fetched post, with FTS5 full-text search."""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from adapters.base import Post
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    platform TEXT NOT NULL,
+    created_at REAL,
+    fetched_at REAL NOT NULL,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    data TEXT NOT NULL,
+    relevant INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_posts_platform_created ON posts (platform, created_at);
+CREATE INDEX IF NOT EXISTS idx_posts_created ON posts (created_at);
+CREATE INDEX IF NOT EXISTS idx_posts_fetched ON posts (fetched_at);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+    title, content, content='posts', content_rowid='rowid', tokenize='unicode61', prefix='2 3 4'
+);
+CREATE TRIGGER IF NOT EXISTS posts_ai AFTER INSERT ON posts BEGIN
+    INSERT INTO posts_fts (rowid, title, content) VALUES (new.rowid, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_ad AFTER DELETE ON posts BEGIN
+    INSERT INTO posts_fts (posts_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+END;
+"""
+
+
+@dataclass
+class ArchiveHit:
+    """One search result."""
+
+    post: Post
+    rank: float          # bm25 score (lower is better)
+    snippet: str         # Matching excerpt with [hits] bracketed
+    fetched_at: float
+
+
+def _epoch(created_at: Optional[datetime]) -> Optional[float]:
+    if created_at is None:
+        return None
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at.timestamp()
+
+
+class PostArchive:
+    """
+    Append-only archive of every post the adapters fetch, before keyword
+    filtering, so history can be searched and new keywords tried offline.
+
+    Adapters call `add()` from the fetch workers; posts are buffered and
+    written in batches (`flush()` runs at the end of every cycle). A post
+    is stored once, the first time it is seen.
+    """
+
+    def __init__(self, path: Path, batch_size: int = 500, retention_days: int = 0):
+        """
+        Initialize the archive.
+
+        Args:
+            path: SQLite database file
+            batch_size: Buffered posts that trigger a write
+            retention_days: Drop posts fetched longer ago than this (0 = keep forever)
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.retention_days = retention_days
+        self.written = 0
+
+        self._lock = threading.Lock()
+        self._pending: List[Post] = []
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate_fts()
+        self._conn.executescript(_SCHEMA)
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(posts)")}
+        if "relevant" not in columns:
+            # Archives created before relevance verdicts were recorded
+            self._conn.execute("ALTER TABLE posts ADD COLUMN relevant INTEGER")
+        self._conn.commit()
+
+    def _migrate_fts(self):
+        """Rebuild a stemmed (porter) index from older archives: stemming breaks prefix queries."""
+        row = self._conn.execute("SELECT sql FROM sqlite_master WHERE name = 'posts_fts'").fetchone()
+        if row is None or "porter" not in row["sql"]:
+            return
+        logger.info("Rebuilding archive search index without stemming")
+        self._conn.execute("DROP TABLE posts_fts")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute("INSERT INTO posts_fts (posts_fts) VALUES ('rebuild')")
+        self._conn.commit()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def add(self, posts: Iterable[Post]):
+        """Queue fetched posts for archiving (thread-safe)."""
+        with self._lock:
+            self._pending.extend(posts)
+            if len(self._pending) >= self.batch_size:
+                self._write_pending()
+
+    def flush(self):
+        """Write buffered posts and apply retention."""
+        with self._lock:
+            self._write_pending()
+            if self.retention_days:
+                cutoff = time.time() - self.retention_days * 86400
+                self._conn.execute("DELETE FROM posts WHERE fetched_at < ?", (cutoff,))
+                self._conn.commit()
+
+    def _write_pending(self):
+        if not self._pending:
+            return
+        now = time.time()
+        rows = []
+        for post in self._pending:
+            data = post.to_dict()
+            del data["title"], data["content"]
+            rows.append((
+                post.id, post.platform, _epoch(post.created_at), now, post.title or "", post.content or "",
+                json.dumps(data, default=str),
+            ))
+        self._pending = []
+        try:
+            cursor = self._conn.executemany(
+                """INSERT OR IGNORE INTO posts (id, platform, created_at, fetched_at, title, content, data)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                rows,
+            )
+            self._conn.commit()
+            self.written += cursor.rowcount
+        except sqlite3.Error as e:
+            logger.error(f"Error writing post archive: {e}")
+
+    def record_verdicts(self, verdicts: Dict[str, bool]):
+        """Store AI relevance verdicts (post ID -> relevant) for archived posts."""
+        if not verdicts:
+            return
+        with self._lock:
+            self._write_pending()
+            try:
+                self._conn.executemany(
+                    "UPDATE posts SET relevant = ? WHERE id = ?",
+                    [(int(relevant), post_id) for post_id, relevant in verdicts.items()],
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error recording relevance verdicts: {e}")
+
+    def iter_corpus(self, since: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield archived posts as Post.to_dict() dicts plus "fetched_at" (epoch)
+        and "relevant" (True/False, None if never checked), oldest first.
+        """
+        sql = "SELECT * FROM posts"
+        params: list = []
+        if since:
+            sql += " WHERE fetched_at >= ?"
+            params.append(_epoch(since))
+        with self._lock:
+            cursor = self._conn.execute(sql + " ORDER BY fetched_at, rowid", params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(1000)
+            if not rows:
+                return
+            for row in rows:
+                yield self._corpus_entry(row)
+
+    @staticmethod
+    def _corpus_entry(row: sqlite3.Row) -> Dict[str, Any]:
+        data = json.loads(row["data"])
+        data["title"] = row["title"]
+        data["content"] = row["content"]
+        data["fetched_at"] = row["fetched_at"]
+        data["relevant"] = None if row["relevant"] is None else bool(row["relevant"])
+        return data
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def search(
+        self,
+        query: str,
+        platforms: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 20,
+        newest_first: bool = False,
+    ) -> List[ArchiveHit]:
+        """
+        Full-text search over archived titles and content.
+
+        Args:
+            query: FTS5 query - words, "exact phrases", AND/OR/NOT, prefix*,
+                NEAR(a b, 5), column filters like title:manager
+            platforms: Only these platforms
+            since: Only posts created at or after this time
+            until: Only posts created before this time
+            limit: Maximum hits
+            newest_first: Order by creation time instead of relevance
+
+        Returns:
+            Matching posts, best (or newest) first
+
+        Raises:
+            sqlite3.OperationalError: The query is not valid FTS5 syntax
+        """
+        sql = [
+            """SELECT posts.*, bm25(posts_fts) AS rank,
+                      snippet(posts_fts, -1, '[', ']', '...', 16) AS snippet
+               FROM posts_fts JOIN posts ON posts.rowid = posts_fts.rowid
+               WHERE posts_fts MATCH ?"""
+        ]
+        params: list = [query]
+        if platforms:
+            sql.append(f"AND posts.platform IN ({', '.join('?' * len(platforms))})")
+            params.extend(platforms)
+        if since:
+            sql.append("AND posts.created_at >= ?")
+            params.append(_epoch(since))
+        if until:
+            sql.append("AND posts.created_at < ?")
+            params.append(_epoch(until))
+        sql.append("ORDER BY posts.created_at DESC" if newest_first else "ORDER BY rank")
+        sql.append("LIMIT ?")
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute("\n".join(sql), params).fetchall()
+        return [self._hit(row) for row in rows]
+
+    @staticmethod
+    def _hit(row: sqlite3.Row) -> ArchiveHit:
+        data = json.loads(row["data"])
+        data["title"] = row["title"]
+        data["content"] = row["content"]
+        return ArchiveHit(
+            post=Post.from_dict(data), rank=row["rank"], snippet=row["snippet"], fetched_at=row["fetched_at"]
+        )
@@ -0,0 +1,298 @@
+"""Record/replay of external exchanges (adapter HTTP, Gemini, Firestore) for offline cycles."""
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+EXCHANGES_FILE = "exchanges.jsonl.gz"
+META_FILE = "meta.json"
+
+# Never written to a cassette
+_SECRET_PARAMS = {"key", "api_key", "access_token", "token"}
+_SECRET_HEADERS = {"authorization", "cookie", "set-cookie", "x-goog-api-key"}
+_SECRET_IN_TEXT = re.compile(r"\b(" + "|".join(sorted(_SECRET_PARAMS)) + r")=[^&\s'\"]+")
+
+
+class CassetteMiss(LookupError):
+    """Replay found no recorded exchange for a request."""
+
+
+class RecordedError(RuntimeError):
+    """Replays an exception raised during recording (timeout, connection error...)."""
+
+
+def _request_key(method: str, url: str, params: Optional[Dict[str, Any]], body: Any) -> str:
+    query = sorted((k, str(v)) for k, v in (params or {}).items() if k not in _SECRET_PARAMS)
+    key = f"{method} {url}"
+    if query:
+        key += "?" + "&".join(f"{k}={v}" for k, v in query)
+    if body is not None:
+        digest = hashlib.sha1(json.dumps(body, sort_keys=True, default=str).encode()).hexdigest()
+        key += f" #{digest[:16]}"
+    return key
+
+
+def _redact_url(url: str) -> str:
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in _SECRET_PARAMS]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _encode_response(response: "requests.Response") -> Dict[str, Any]:
+    data = {
+        "status": response.status_code,
+        "url": _redact_url(response.url or ""),
+        "headers": {k: v for k, v in response.headers.items() if k.lower() not in _SECRET_HEADERS},
+        "encoding": response.encoding,
+    }
+    try:
+        data["text"] = response.content.decode("utf-8")
+    except UnicodeDecodeError:
+        data["body_b64"] = base64.b64encode(response.content).decode("ascii")
+    return data
+
+
+def _decode_response(data: Dict[str, Any]) -> "requests.Response":
+    import requests
+    from requests.structures import CaseInsensitiveDict
+
+    response = requests.Response()
+    response.status_code = data["status"]
+    response.url = data.get("url", "")
+    response.headers = CaseInsensitiveDict(data.get("headers", {}))
+    response.encoding = data.get("encoding")
+    if "text" in data:
+        response._content = data["text"].encode("utf-8")
+    else:
+        response._content = base64.b64decode(data.get("body_b64", ""))
+    return response
+
+
+class Cassette:
+    """
+    A directory of recorded exchanges.
+
+    In "record" mode live calls go through and their results are appended
+    (gzip JSON lines) to the cassette; in "replay" mode nothing touches the
+    network and each request is answered with the next recorded result for
+    the same request key (method, URL, non-secret params, body hash), so
+    replays don't depend on thread scheduling. Replay latency is either the
+    recorded duration ("realistic") or none.
+    """
+
+    def __init__(self, directory: Path, mode: str, latency: str = "realistic"):
+        """
+        Open a cassette.
+
+        Args:
+            directory: Cassette directory (created when recording)
+            mode: "record" or "replay"
+            latency: Replay latency, "realistic" or "none"
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.directory = Path(directory)
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self._file = None
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+        if mode == "record":
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.recorded_at = datetime.now(timezone.utc)
+            self._file = gzip.open(self.directory / EXCHANGES_FILE, "wt", encoding="utf-8")
+        else:
+            self.recorded_at = self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @property
+    def state_dir(self) -> Path:
+        """Local state (seen posts) captured at record time."""
+        return self.directory / "state"
+
+    def _load(self) -> datetime:
+        path = self.directory / EXCHANGES_FILE
+        if not path.exists():
+            raise FileNotFoundError(f"No cassette at {path}")
+        count = 0
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                self._entries[f"{entry['channel']} {entry['key']}"].append(entry)
+                count += 1
+        meta = json.loads((self.directory / META_FILE).read_text()) if (self.directory / META_FILE).exists() else {}
+        logger.info(f"Loaded cassette {self.directory} ({count} exchanges)")
+        recorded_at = meta.get("recorded_at")
+        return datetime.fromisoformat(recorded_at) if recorded_at else datetime.now(timezone.utc)
+
+    def close(self):
+        """Finish recording (flush exchanges and write metadata)."""
+        if self._file is None:
+            return
+        with self._lock:
+            self._file.close()
+            self._file = None
+        meta = {"recorded_at": self.recorded_at.isoformat(), "exchanges": self.recorded}
+        (self.directory / META_FILE).write_text(json.dumps(meta, indent=2))
+        logger.info(f"Recorded {self.recorded} exchanges to {self.directory}")
+
+    def exchange(
+        self,
+        channel: str,
+        key: str,
+        live: Callable[[], Any],
+        encode: Callable[[Any], Any] = lambda value: value,
+        decode: Callable[[Any], Any] = lambda value: value,
+    ) -> Any:
+        """
+        Record or replay one call.
+
+        Args:
+            channel: Exchange family ("http", "firestore")
+            key: Request identity within the channel
+            live: Performs the real call (record mode only)
+            encode: Result -> JSON-serializable value
+            decode: Recorded value -> result
+
+        Returns:
+            The live or recorded result; recorded exceptions are re-raised
+            as RecordedError
+        """
+        if self.replaying:
+            return self._replay(channel, key, decode)
+
+        start = time.perf_counter()
+        entry: Dict[str, Any] = {"channel": channel, "key": key}
+        try:
+            result = live()
+            entry["result"] = encode(result)
+            return result
+        except Exception as e:
+            # Exception messages often quote the full URL
+            entry["error"] = _SECRET_IN_TEXT.sub(r"\1=REDACTED", f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            entry["elapsed"] = round(time.perf_counter() - start, 4)
+            line = json.dumps(entry, default=str)
+            with self._lock:
+                if self._file is not None:
+                    self._file.write(line + "\n")
+                    self.recorded += 1
+
+    def _replay(self, channel: str, key: str, decode: Callable[[Any], Any]) -> Any:
+        full_key = f"{channel} {key}"
+        with self._lock:
+            queue = self._entries.get(full_key)
+            if queue:
+                entry = queue.popleft()
+                self._last[full_key] = entry
+            else:
+                # Repeated requests beyond the recording get the last answer
+                entry = self._last.get(full_key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if entry is None:
+            raise CassetteMiss(f"No recorded exchange for {full_key}")
+        if self.latency == "realistic":
+            time.sleep(entry.get("elapsed", 0.0))
+        if "error" in entry:
+            raise RecordedError(entry["error"])
+        return decode(entry.get("result"))
+
+    def http(
+        self,
+        method: str,
+        url: str,
+        send: Callable[[], "requests.Response"],
+        params: Optional[Dict[str, Any]] = None,
+        body: Any = None,
+    ) -> "requests.Response":
+        """Record or replay an HTTP exchange made with `requests`."""
+        return self.exchange(
+            "http", _request_key(method, url, params, body), send, _encode_response, _decode_response
+        )
+
+
+class FirestoreCassette:
+    """
+    FirestoreService stand-in that records or replays its reads.
+
+    Writes (mark_posts_as_sent) go through when recording and are dropped
+    on replay.
+    """
+
+    def __init__(self, service: Any, cassette: Cassette):
+        self._service = service
+        self._cassette = cassette
+
+    def get_subscriptions(self) -> List[Dict[str, Any]]:
+        return self._cassette.exchange("firestore", "get_subscriptions", self._service.get_subscriptions)
+
+    def get_subscription_emails(self) -> List[str]:
+        return self._cassette.exchange("firestore", "get_subscription_emails", self._service.get_subscription_emails)
+
+    def get_sent_post_ids(self) -> set:
+        return self._cassette.exchange(
+            "firestore", "get_sent_post_ids", self._service.get_sent_post_ids, sorted, set
+        )
+
+    def mark_posts_as_sent(self, post_ids: List[str], user_email: str = "python-script"):
+        if not self._cassette.replaying:
+            self._service.mark_posts_as_sent(post_ids, user_email=user_email)
+
+    def filter_unsent_posts(self, posts: List[Any]) -> List[Any]:
+        sent_ids = self.get_sent_post_ids()
+        return [p for p in posts if p.id not in sent_ids]
+
+
+class NullSMTP:
+    """SMTP connection that accepts and discards everything (replays send no mail)."""
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        return {}
+
+    def noop(self):
+        return (250, b"OK")
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+# Active cassette (None = live traffic only)
+_cassette: Optional[Cassette] = None
+
+def get_cassette() -> Optional[Cassette]:
+    return _cassette
+
+
+def use_cassette(cassette: Optional[Cassette]):
+    """Route adapter, Gemini and Firestore calls through `cassette` (None to stop)."""
+    global _cassette
+    _cassette = cassette
@@ -1,12 +1,16 @@
 """Email service using Gmail SMTP (nodemailer-compatible)."""
 import logging
 import smtplib
+import threading
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Dict, Any, List, Optional
-from datetime import datetime
 
 from adapters.base import Post
+from .email_render import BatchEmailRenderer
+from .metrics import get_metrics
+from .smtp_pool import SMTPSessionPool
 
 logger = logging.getLogger(__name__)
 
@@ -35,14 +39,80 @@ class EmailService:
         # Gmail SMTP settings
         self.smtp_host = config.get("smtp_host", "smtp.gmail.com")
         self.smtp_port = config.get("smtp_port", 587)
+        self.smtp_starttls = config.get("smtp_starttls", True)
+        
+        # Connection pooling (Gmail caps messages per connection)
+        self.max_messages_per_connection = config.get("max_messages_per_connection", 90)
+        self.smtp_max_retries = config.get("smtp_max_retries", 2)
+        # Per-thread session pool: the outbox dispatcher and the main thread never share a connection
+        self._local = threading.local()
+        # Replaces the SMTP connection (replays use a null transport)
+        self.connection_factory = self._create_connection
+        
+        metrics = get_metrics()
+        self._sends = metrics.counter("email_sends_total", "Notification emails sent", ("outcome",))
+        self._send_latency = metrics.histogram("email_send_seconds", "SMTP send latency including connect")
     
     def _create_connection(self):
         """Create SMTP connection to Gmail."""
         server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-        server.starttls()
+        if self.smtp_starttls:
+            server.starttls()
         server.login(self.smtp_user, self.smtp_pass)
         return server
     
+    def _new_pool(self) -> SMTPSessionPool:
+        return SMTPSessionPool(
+            self.connection_factory,
+            max_messages_per_connection=self.max_messages_per_connection,
+            max_retries=self.smtp_max_retries,
+        )
+    
+    @property
+    def _pool(self) -> Optional[SMTPSessionPool]:
+        """The calling thread's open session pool, if any."""
+        return getattr(self._local, "pool", None)
+    
+    @contextmanager
+    def session(self):
+        """
+        Reuse one authenticated SMTP connection for every send in the block.
+        
+        Sessions are per thread; nested sessions share the outermost connection.
+        """
+        pool = self._pool
+        if pool is not None:
+            yield pool
+            return
+        
+        pool = self._local.pool = self._new_pool()
+        try:
+            yield pool
+        finally:
+            self._local.pool = None
+            pool.close()
+            if pool.timings:
+                stats = pool.stats()
+                logger.info(
+                    f"SMTP session: {stats['sent']} sent, {stats['failed']} failed over "
+                    f"{stats['connections']} connection(s), avg {stats['avg_send_ms']:.0f}ms/send"
+                )
+    
+    def _deliver(self, to_addresses: List[str], message: str):
+        """Send a rendered message, over the session connection if one is open."""
+        pool = self._pool
+        try:
+            if pool is not None:
+                timing = pool.send(self.from_address, to_addresses, message)
+            else:
+                with self._new_pool() as pool:
+                    timing = pool.send(self.from_address, to_addresses, message)
+        except Exception:
+            self._sends.inc(outcome="error")
+            raise
+        self._sends.inc(outcome="ok")
+        self._send_latency.observe(timing.total_seconds)
+    
     def send_notification(
         self, 
         post: Post, 
@@ -60,16 +130,7 @@ class EmailService:
             subject = self._build_subject(post)
             html_body = self._build_html_body(post, suggested_response)
             
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{self.from_name} <{self.from_address}>"
-            msg['To'] = self.to_address
-            
-            msg.attach(MIMEText(html_body, 'html'))
-            
-            server = self._create_connection()
-            server.sendmail(self.from_address, [self.to_address], msg.as_string())
-            server.quit()
+            self.deliver_html(self.to_address, subject, html_body)
             
             logger.info(f"Email sent successfully to {self.to_address}")
             return True
@@ -82,7 +143,8 @@ class EmailService:
         self, 
         posts: List[Post], 
         responses: Dict[str, Optional[str]],
-        recipient: Optional[str] = None
+        recipient: Optional[str] = None,
+        html_body: Optional[str] = None
     ) -> bool:
         to_address = recipient or self.to_address
         if not self.smtp_user or not self.smtp_pass or not to_address:
@@ -92,19 +154,11 @@ class EmailService:
             return False
         
         try:
-            subject = f"{self.subject_prefix} {len(posts)} new matches found"
-            html_body = self._build_batch_html_body(posts, responses)
-            
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{self.from_name} <{self.from_address}>"
-            msg['To'] = to_address
+            subject = self.build_batch_subject(posts)
+            if html_body is None:
+                html_body = self._build_batch_html_body(posts, responses)
             
-            msg.attach(MIMEText(html_body, 'html'))
-            
-            server = self._create_connection()
-            server.sendmail(self.from_address, [to_address], msg.as_string())
-            server.quit()
+            self.deliver_html(to_address, subject, html_body)
             
             logger.info(f"Batch email sent: {len(posts)} posts to {to_address}")
             return True
@@ -113,6 +167,40 @@ class EmailService:
             logger.error(f"Error sending batch email: {e}")
             return False
     
+    def deliver_html(self, recipient: str, subject: str, html_body: str):
+        """
+        Send an already-rendered HTML email.
+        
+        Raises:
+            The underlying SMTP error if delivery fails
+        """
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = f"{self.from_name} <{self.from_address}>"
+        msg['To'] = recipient
+        
+        msg.attach(MIMEText(html_body, 'html'))
+        
+        self._deliver([recipient], msg.as_string())
+    
+    def build_batch_subject(self, posts: List[Post]) -> str:
+        return f"{self.subject_prefix} {len(posts)} new matches found"
+    
+    def render_notification(self, post: Post, suggested_response: Optional[str] = None):
+        """Render (subject, html_body) for a single-post notification."""
+        return self._build_subject(post), self._build_html_body(post, suggested_response)
+    
+    def render_batch(
+        self,
+        posts: List[Post],
+        responses: Dict[str, Optional[str]],
+        html_body: Optional[str] = None
+    ):
+        """Render (subject, html_body) for a batch notification."""
+        if html_body is None:
+            html_body = self._build_batch_html_body(posts, responses)
+        return self.build_batch_subject(posts), html_body
+    
     def _build_subject(self, post: Post) -> str:
         platform = post.platform.title()
         location = ""
@@ -188,44 +276,15 @@ class EmailService:
         </div>"""
     
     def _build_batch_html_body(self, posts: List[Post], responses: Dict[str, Optional[str]]) -> str:
-        by_platform: Dict[str, List[Post]] = {}
-        for post in posts:
-            if post.platform not in by_platform:
-                by_platform[post.platform] = []
-            by_platform[post.platform].append(post)
-        
-        platform_colors = {"reddit": "#FF4500", "twitter": "#1DA1F2", "discord": "#5865F2"}
-        
-        posts_html = ""
-        for platform, platform_posts in by_platform.items():
-            badge_color = platform_colors.get(platform, "#666666")
-            posts_html += f'<h2 style="color: {badge_color}; border-bottom: 2px solid {badge_color}; padding-bottom: 5px;">{platform.title()} ({len(platform_posts)})</h2>'
-            
-            for post in platform_posts:
-                response = responses.get(post.id)
-                resp_html = f'<div style="margin-top: 15px; padding: 12px; background: #E8F5E9; border-radius: 4px; border-left: 3px solid #47A88D;"><strong style="color: #2E7D32;">💡 Suggested Response:</strong><br><div style="font-size: 14px; margin-top: 8px; white-space: pre-wrap;">{response}</div></div>' if response else ''
-                posts_html += f"""<div style="margin: 20px 0; padding: 15px; background: white; border-radius: 8px; border-left: 4px solid {badge_color};">
-                    <div style="font-weight: bold; margin-bottom: 5px;">{f'r/{post.subreddit} • ' if post.subreddit else ''}{post.author}</div>
-                    {f'<div style="font-size: 16px; font-weight: bold; margin: 10px 0;">{post.title}</div>' if post.title else ''}
-                    <div style="color: #666; font-size: 14px; margin: 10px 0;">{post.content[:500]}{'...' if len(post.content) > 500 else ''}</div>
-                    <div style="margin: 10px 0;">{''.join(f'<span style="display: inline-block; background: #E04E1B; color: white; padding: 2px 6px; border-radius: 4px; font-size: 11px; margin: 2px;">{kw}</span>' for kw in post.matched_keywords)}</div>
-                    <a href="{post.url}" style="color: {badge_color};">View Post →</a>
-                    {resp_html}
-                </div>"""
-        
-        return f"""<!DOCTYPE html>
-<html>
-<head><style>body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; max-width: 700px; margin: 0 auto; padding: 20px; }} .header {{ background: #002E47; color: white; padding: 20px; border-radius: 8px 8px 0 0; }} .content {{ background: #f9f9f9; padding: 20px; border: 1px solid #ddd; }} .footer {{ text-align: center; color: #999; font-size: 12px; margin-top: 20px; }}</style></head>
-<body>
-    <div class="header"><h1>🎯 {len(posts)} Social Media Matches Found</h1><p style="margin: 0; opacity: 0.8;">{datetime.now().strftime('%Y-%m-%d %H:%M')}</p></div>
-    <div class="content">{posts_html}</div>
-    <div class="footer"><p>Social Media Monitor for LeaderReps<br><a href="https://www.leaderreps.com">www.leaderreps.com</a></p></div>
-</body>
-</html>"""
+        return BatchEmailRenderer(posts, responses).render(posts)
+    
+    def fanout_renderer(self, posts: List[Post], responses: Dict[str, Optional[str]]) -> BatchEmailRenderer:
+        """Create a renderer shared by every subscriber in one fan-out."""
+        return BatchEmailRenderer(posts, responses)
     
     def test_connection(self) -> bool:
         try:
-            server = self._create_connection()
+            server = self.connection_factory()
             server.quit()
             return True
         except Exception as e:
@@ -0,0 +1,184 @@
+"""Precompiled, cached HTML rendering for batch notification emails."""
+import logging
+from datetime import datetime
+from string import Template
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from adapters.base import Post
+from .metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+PLATFORM_COLORS = {"reddit": "#FF4500", "twitter": "#1DA1F2", "discord": "#5865F2"}
+DEFAULT_COLOR = "#666666"
+
+# Templates are parsed once at import; rendering only substitutes values.
+_SECTION_HEADER = Template(
+    '<h2 style="color: $color; border-bottom: 2px solid $color; padding-bottom: 5px;">$label ($count)</h2>'
+)
+
+_KEYWORD_BADGE = Template(
+    '<span style="display: inline-block; background: #E04E1B; color: white; padding: 2px 6px; '
+    'border-radius: 4px; font-size: 11px; margin: 2px;">$keyword</span>'
+)
+
+_RESPONSE_BLOCK = Template(
+    '<div style="margin-top: 15px; padding: 12px; background: #E8F5E9; border-radius: 4px; '
+    'border-left: 3px solid #47A88D;"><strong style="color: #2E7D32;">💡 Suggested Response:</strong><br>'
+    '<div style="font-size: 14px; margin-top: 8px; white-space: pre-wrap;">$response</div></div>'
+)
+
+_TITLE_BLOCK = Template('<div style="font-size: 16px; font-weight: bold; margin: 10px 0;">$title</div>')
+
+_POST_CARD = Template("""<div style="margin: 20px 0; padding: 15px; background: white; border-radius: 8px; border-left: 4px solid $color;">
+                    <div style="font-weight: bold; margin-bottom: 5px;">$location$author</div>
+                    $title_html
+                    <div style="color: #666; font-size: 14px; margin: 10px 0;">$excerpt</div>
+                    <div style="margin: 10px 0;">$keywords_html</div>
+                    <a href="$url" style="color: $color;">View Post →</a>
+                    $response_html
+                </div>""")
+
+_PAGE = Template("""<!DOCTYPE html>
+<html>
+<head><style>body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; max-width: 700px; margin: 0 auto; padding: 20px; } .header { background: #002E47; color: white; padding: 20px; border-radius: 8px 8px 0 0; } .content { background: #f9f9f9; padding: 20px; border: 1px solid #ddd; } .footer { text-align: center; color: #999; font-size: 12px; margin-top: 20px; }</style></head>
+<body>
+    <div class="header"><h1>🎯 $count Social Media Matches Found</h1><p style="margin: 0; opacity: 0.8;">$timestamp</p></div>
+    <div class="content">$posts_html</div>
+    <div class="footer"><p>Social Media Monitor for LeaderReps<br><a href="https://www.leaderreps.com">www.leaderreps.com</a></p></div>
+</body>
+</html>""")
+
+
+class BatchEmailRenderer:
+    """
+    Renders batch notification bodies for one set of posts.
+
+    Built once per notification cycle and shared by every recipient:
+    post cards are rendered once per post, platform sections once per
+    (platform, posts) pair, and complete bodies once per distinct set of
+    subscribed platforms.
+    """
+
+    def __init__(self, posts: List[Post], responses: Dict[str, Optional[str]]):
+        self.posts = posts
+        self.responses = responses
+        self.timestamp = datetime.now().strftime('%Y-%m-%d %H:%M')
+
+        self._keyword_cache: Dict[str, str] = {}
+        self._post_cache: Dict[str, str] = {}
+        self._section_cache: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+        self._body_cache: Dict[FrozenSet[str], Tuple[List[Post], Optional[str]]] = {}
+        # platform -> its posts in batch order, built on the first selection
+        self._by_platform: Optional[Dict[str, List[Post]]] = None
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache_metric = get_metrics().counter(
+            "email_render_cache_total", "Batch email render cache lookups", ("result",)
+        )
+
+    def _keyword_badge(self, keyword: str) -> str:
+        badge = self._keyword_cache.get(keyword)
+        if badge is None:
+            badge = _KEYWORD_BADGE.substitute(keyword=keyword)
+            self._keyword_cache[keyword] = badge
+        return badge
+
+    def render_post(self, post: Post) -> str:
+        """Render (or fetch the cached) card for a single post."""
+        card = self._post_cache.get(post.id)
+        if card is not None:
+            self.cache_hits += 1
+            self._cache_metric.inc(result="hit")
+            return card
+        self.cache_misses += 1
+        self._cache_metric.inc(result="miss")
+
+        response = self.responses.get(post.id)
+        content = post.content
+        card = _POST_CARD.substitute(
+            color=PLATFORM_COLORS.get(post.platform, DEFAULT_COLOR),
+            location=f"r/{post.subreddit} • " if post.subreddit else "",
+            author=post.author,
+            title_html=_TITLE_BLOCK.substitute(title=post.title) if post.title else "",
+            excerpt=content[:500] + ("..." if len(content) > 500 else ""),
+            keywords_html="".join(self._keyword_badge(kw) for kw in post.matched_keywords),
+            url=post.url,
+            response_html=_RESPONSE_BLOCK.substitute(response=response) if response else "",
+        )
+        self._post_cache[post.id] = card
+        return card
+
+    def render_section(self, platform: str, platform_posts: List[Post]) -> str:
+        """Render (or fetch the cached) section for one platform's posts."""
+        key = (platform, tuple(p.id for p in platform_posts))
+        section = self._section_cache.get(key)
+        if section is not None:
+            self.cache_hits += 1
+            self._cache_metric.inc(result="hit")
+            return section
+        self.cache_misses += 1
+        self._cache_metric.inc(result="miss")
+
+        header = _SECTION_HEADER.substitute(
+            color=PLATFORM_COLORS.get(platform, DEFAULT_COLOR),
+            label=platform.title(),
+            count=len(platform_posts),
+        )
+        section = header + "".join(self.render_post(p) for p in platform_posts)
+        self._section_cache[key] = section
+        return section
+
+    def render(self, posts: List[Post]) -> str:
+        """Render a complete email body for any subset of this batch's posts."""
+        by_platform: Dict[str, List[Post]] = {}
+        for post in posts:
+            by_platform.setdefault(post.platform, []).append(post)
+
+        posts_html = "".join(
+            self.render_section(platform, platform_posts)
+            for platform, platform_posts in by_platform.items()
+        )
+        return _PAGE.substitute(count=len(posts), timestamp=self.timestamp, posts_html=posts_html)
+
+    def _platform_groups(self) -> Dict[str, List[Post]]:
+        """Posts partitioned by platform, in order of each platform's first post."""
+        if self._by_platform is None:
+            groups: Dict[str, List[Post]] = {}
+            for post in self.posts:
+                group = groups.get(post.platform)
+                if group is None:
+                    group = groups[post.platform] = []
+                group.append(post)
+            self._by_platform = groups
+        return self._by_platform
+
+    def for_platforms(self, platforms: Iterable[str]) -> Tuple[List[Post], Optional[str]]:
+        """
+        Get the posts and rendered body for a subscriber's platform selection.
+
+        Memoized by the frozenset of platforms, so subscribers sharing a
+        selection share one render. Selections are assembled from the batch
+        partitioned once by platform, so each costs only its own posts.
+        Posts come back grouped by platform, the order they render in.
+
+        Returns:
+            (filtered posts, html body) - body is None when no posts match
+        """
+        key = frozenset(platforms)
+        cached = self._body_cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            self._cache_metric.inc(result="hit")
+            return cached
+        self.cache_misses += 1
+        self._cache_metric.inc(result="miss")
+
+        filtered = []
+        for platform, platform_posts in self._platform_groups().items():
+            if platform in key:
+                filtered.extend(platform_posts)
+        result = (filtered, self.render(filtered) if filtered else None)
+        self._body_cache[key] = result
+        return result
@@ -3,8 +3,7 @@ import logging
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
-import firebase_admin
-from firebase_admin import credentials, firestore
+from .cassette import FirestoreCassette, get_cassette
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +32,11 @@ class FirestoreService:
         if self._initialized:
             return
         
+        # Imported here: firebase_admin is slow to import and only needed
+        # once Firestore is actually used
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+        
         try:
             # Check if already initialized
             firebase_admin.get_app()
@@ -134,6 +138,8 @@ class FirestoreService:
             # Merge and keep last 500 (rolling window)
             all_ids = list(set(post_ids) | existing)[:500]
             
+            from firebase_admin import firestore
+            
             doc_ref = self.db.document(self.SENT_POSTS_DOC)
             doc_ref.set({
                 "postIds": all_ids,
@@ -167,8 +173,11 @@ class FirestoreService:
 _firestore_service = None
 
 def get_firestore_service(credentials_path: Optional[Path] = None) -> FirestoreService:
-    """Get or create the Firestore service singleton."""
+    """Get or create the Firestore service singleton (recorded/replayed while a cassette is active)."""
     global _firestore_service
     if _firestore_service is None:
         _firestore_service = FirestoreService(credentials_path)
+    cassette = get_cassette()
+    if cassette:
+        return FirestoreCassette(_firestore_service, cassette)
     return _firestore_service
@@ -0,0 +1,170 @@
+"""Post-to-inbox freshness measurement and SLO alerting."""
+import logging
+import math
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from adapters.base import Post
+from .metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Stages in the order a notified post passes through them
+STAGES = ("fetched", "matched", "relevant", "drafted", "sent")
+
+# Post ages span minutes to days
+AGE_BUCKETS = (60, 300, 600, 900, 1800, 3600, 7200, 14400, 28800, 43200, 86400, 172800)
+
+
+def _epoch(created_at: Optional[datetime]) -> Optional[float]:
+    if created_at is None:
+        return None
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at.timestamp()
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    rank = math.ceil(pct / 100.0 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+class FreshnessTracker:
+    """
+    Measures how old each notified post is at every pipeline stage.
+
+    Ages (stage time minus the post's `created_at`) feed a per-platform,
+    per-stage histogram in the metrics registry plus a rolling window used
+    for percentile summaries. A post reaching "sent" later than the alert
+    threshold counts as an SLO breach.
+    """
+
+    def __init__(
+        self,
+        alert_threshold_seconds: Optional[float] = None,
+        alert_percentile: float = 90.0,
+        window: int = 500,
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            alert_threshold_seconds: Post-to-sent age considered too stale
+                (None disables alerting)
+            alert_percentile: Warn when this percentile of recent sent ages
+                exceeds the threshold
+            window: Recent ages kept per (platform, stage) for percentiles
+        """
+        self.alert_threshold_seconds = alert_threshold_seconds
+        self.alert_percentile = alert_percentile
+        self.window = window
+        self._ages: Dict[Tuple[str, str], Deque[float]] = {}
+        self._lock = threading.Lock()
+
+        metrics = get_metrics()
+        self._histogram = metrics.histogram(
+            "post_age_seconds", "Post age (since created_at) at each stage", ("platform", "stage"),
+            buckets=AGE_BUCKETS,
+        )
+        self._breaches = metrics.counter(
+            "freshness_slo_breaches_total", "Posts sent later than the freshness threshold", ("platform",)
+        )
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "FreshnessTracker":
+        threshold = config.get("alert_threshold_minutes")
+        return cls(
+            alert_threshold_seconds=threshold * 60 if threshold else None,
+            alert_percentile=config.get("alert_percentile", 90),
+            window=config.get("window", 500),
+        )
+
+    def record(self, platform: str, stage: str, created_at: Optional[float], at: float):
+        """
+        Record a post reaching `stage` at epoch time `at`.
+
+        Args:
+            platform: Post platform
+            stage: One of STAGES
+            created_at: Post creation time (epoch seconds); unknown ages are skipped
+            at: When the stage was reached (epoch seconds)
+        """
+        if created_at is None:
+            return
+        age = max(0.0, at - created_at)
+        self._histogram.observe(age, platform=platform, stage=stage)
+        with self._lock:
+            ages = self._ages.setdefault((platform, stage), deque(maxlen=self.window))
+            ages.append(age)
+
+        if stage == "sent" and self.alert_threshold_seconds and age > self.alert_threshold_seconds:
+            self._breaches.inc(platform=platform)
+
+    def mark(self, post: Post, stage: str, at: float):
+        self.record(post.platform, stage, _epoch(post.created_at), at)
+
+    def percentiles(self, platform: str, stage: str, pcts=(50, 90, 99)) -> Optional[Dict[str, float]]:
+        """Percentiles of recent ages for one platform and stage (None if no data)."""
+        with self._lock:
+            ages = sorted(self._ages.get((platform, stage), ()))
+        if not ages:
+            return None
+        result = {f"p{p:g}": _percentile(ages, p) for p in pcts}
+        result["count"] = len(ages)
+        return result
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """{platform: {stage: percentiles}} for everything recorded."""
+        with self._lock:
+            keys = list(self._ages)
+        result: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for platform, stage in sorted(keys):
+            result.setdefault(platform, {})[stage] = self.percentiles(platform, stage)
+        return result
+
+    def check_slo(self) -> List[str]:
+        """
+        Log a warning for each platform whose sent-age percentile is over the threshold.
+
+        Returns:
+            Platforms currently breaching the SLO
+        """
+        if not self.alert_threshold_seconds:
+            return []
+        breaching = []
+        with self._lock:
+            platforms = [p for p, stage in self._ages if stage == "sent"]
+        for platform in platforms:
+            stats = self.percentiles(platform, "sent", (self.alert_percentile,))
+            value = stats[f"p{self.alert_percentile:g}"]
+            if value > self.alert_threshold_seconds:
+                breaching.append(platform)
+                logger.warning(
+                    f"Freshness SLO breach: {platform} p{self.alert_percentile:g} post-to-sent "
+                    f"{value / 60:.0f}m > {self.alert_threshold_seconds / 60:.0f}m "
+                    f"(last {stats['count']} posts)"
+                )
+        return breaching
+
+    def log_summary(self):
+        """One line per platform: median and p90 age at each stage."""
+        for platform, stages in self.summary().items():
+            parts = [
+                f"{stage} {stats['p50'] / 60:.0f}m/{stats['p90'] / 60:.0f}m"
+                for stage in STAGES
+                if (stats := stages.get(stage))
+            ]
+            logger.info(f"Freshness {platform} (p50/p90): {', '.join(parts)}")
+
+
+def post_freshness_metadata(posts: List[Post]) -> Dict[str, Any]:
+    """Outbox metadata needed to measure the "sent" stage after delivery."""
+    return {
+        "freshness": {
+            p.id: {"platform": p.platform, "created_at": _epoch(p.created_at)}
+            for p in posts
+        }
+    }
@@ -1,9 +1,13 @@
 """Gemini AI service using direct HTTP API."""
 import logging
+import time
 import requests
 from typing import Dict, Any, Optional
 
 from adapters.base import Post
+from .cassette import get_cassette
+from .metrics import get_metrics
+from .tracing import get_tracer
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +88,50 @@ class GeminiService:
         self.temperature = config.get("temperature", 0.7)
         self.max_tokens = config.get("max_tokens", 600)
         self.context = config.get("context", DEFAULT_CONTEXT)
+        # Override to point at a proxy or a local stub (soak tests)
+        self.api_url = config.get("api_url", self.API_URL)
+        
+        metrics = get_metrics()
+        self._calls = metrics.counter("gemini_calls_total", "Gemini API calls", ("kind", "outcome"))
+        self._tokens = metrics.counter("gemini_tokens_total", "Gemini tokens used", ("kind", "direction"))
+        self._latency = metrics.histogram("gemini_latency_seconds", "Gemini API call latency", ("kind",))
+    
+    def _generate(self, kind: str, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """POST a generateContent request, recording call, token and latency metrics."""
+        url = self.api_url.format(model=self.model_name)
+        headers = {"Content-Type": "application/json"}
+        params = {"key": self.api_key}
+        
+        with get_tracer().span(f"gemini {kind}", "llm", model=self.model_name) as span:
+            start = time.perf_counter()
+            try:
+                response = self._post(url, headers, params, payload, timeout)
+                response.raise_for_status()
+                data = response.json()
+            except Exception:
+                self._calls.inc(kind=kind, outcome="error")
+                raise
+            finally:
+                self._latency.observe(time.perf_counter() - start, kind=kind)
+            
+            self._calls.inc(kind=kind, outcome="ok")
+            usage = data.get("usageMetadata") or {}
+            prompt_tokens = usage.get("promptTokenCount", 0)
+            output_tokens = usage.get("candidatesTokenCount", 0)
+            self._tokens.inc(prompt_tokens, kind=kind, direction="prompt")
+            self._tokens.inc(output_tokens, kind=kind, direction="output")
+            span.set(prompt_tokens=prompt_tokens, output_tokens=output_tokens)
+            return data
+    
+    def _post(self, url: str, headers: Dict[str, str], params: Dict[str, str], payload: Dict[str, Any],
+              timeout: float) -> requests.Response:
+        def send():
+            return requests.post(url, headers=headers, params=params, json=payload, timeout=timeout)
+        
+        cassette = get_cassette()
+        if cassette:
+            return cassette.http("POST", url, send, params=params, body=payload)
+        return send()
     
     def generate_response(self, post: Post) -> Optional[str]:
         """Generate a response draft for a social media post."""
@@ -94,10 +142,6 @@ class GeminiService:
         try:
             prompt = self._build_prompt(post)
             
-            url = self.API_URL.format(model=self.model_name)
-            headers = {"Content-Type": "application/json"}
-            params = {"key": self.api_key}
-            
             payload = {
                 "contents": [{"parts": [{"text": prompt}]}],
                 "generationConfig": {
@@ -106,10 +150,7 @@ class GeminiService:
                 }
             }
             
-            response = requests.post(url, headers=headers, params=params, json=payload, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._generate("draft", payload, timeout=30)
             if "candidates" in data and data["candidates"]:
                 text = data["candidates"][0]["content"]["parts"][0]["text"]
                 return text.strip()
@@ -141,7 +182,7 @@ Generate a helpful, authentic response to this post."""
     def test_connection(self) -> bool:
         """Test the Gemini API connection."""
         try:
-            url = self.API_URL.format(model=self.model_name)
+            url = self.api_url.format(model=self.model_name)
             params = {"key": self.api_key}
             payload = {"contents": [{"parts": [{"text": "Say hi"}]}]}
             
@@ -151,7 +192,7 @@ Generate a helpful, authentic response to this post."""
             logger.error(f"Gemini test failed: {e}")
             return False
     
-    def check_relevance(self, post: Post) -> bool:
+    def check_relevance(self, post: Post) -> Optional[bool]:
         """
         Check if a post is genuinely about leadership development.
         
@@ -161,11 +202,13 @@ Generate a helpful, authentic response to this post."""
             post: The Post object to check
             
         Returns:
-            True if the post is relevant to leadership development, False otherwise
+            True (YES) or False (NO) from the model, or None when no verdict
+            was reached (no API key, API error, unclear reply). Callers
+            include None posts but must not record them as labels.
         """
         if not self.api_key:
             logger.warning("No Gemini API key - skipping relevance check")
-            return True  # Include by default if no API key
+            return None  # Include by default if no API key
         
         try:
             prompt = RELEVANCE_CHECK_PROMPT.format(
@@ -174,10 +217,6 @@ Generate a helpful, authentic response to this post."""
                 platform=f"{post.platform} (r/{post.subreddit})" if post.subreddit else post.platform
             )
             
-            url = self.API_URL.format(model=self.model_name)
-            headers = {"Content-Type": "application/json"}
-            params = {"key": self.api_key}
-            
             payload = {
                 "contents": [{"parts": [{"text": prompt}]}],
                 "generationConfig": {
@@ -186,18 +225,15 @@ Generate a helpful, authentic response to this post."""
                 }
             }
             
-            response = requests.post(url, headers=headers, params=params, json=payload, timeout=15)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._generate("relevance", payload, timeout=15)
             if "candidates" in data and data["candidates"]:
                 text = data["candidates"][0]["content"]["parts"][0]["text"].strip().upper()
                 is_relevant = text.startswith("YES")
                 logger.info(f"Relevance check [{post.platform}]: {'✓' if is_relevant else '✗'} {post.title[:50]}... - {text}")
                 return is_relevant
             
-            return True  # Include on unclear response
+            return None  # Include on unclear response
             
         except Exception as e:
             logger.warning(f"Relevance check failed for {post.id}, including by default: {e}")
-            return True  # Include on error to avoid missing content
+            return None  # Include on error to avoid missing content
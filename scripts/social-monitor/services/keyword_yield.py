@@ -0,0 +1,124 @@
+"""Per-keyword yield: how many posts each keyword matches, passes relevance and notifies."""
+import json
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from .metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Funnel stages, in order: admitted to the AI check, judged relevant, notified
+STAGES = ("matched", "relevant", "notified")
+
+
+class KeywordYield:
+    """
+    Counts posts per keyword at each funnel stage, bucketed by UTC day.
+
+    A post counts once for every keyword it matched, so a keyword whose
+    matches are almost never relevant shows up as a low pass rate. Daily
+    buckets are kept in a small JSON file so single-run (cron) mode
+    accumulates history; the same counts feed the `keyword_posts_total`
+    counter for Prometheus.
+    """
+
+    def __init__(self, path: Path, retention_days: int = 90):
+        """
+        Initialize the tracker.
+
+        Args:
+            path: JSON state file
+            retention_days: Daily buckets older than this are dropped on save
+        """
+        self.path = path
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        # "YYYY-MM-DD" -> keyword -> [matched, relevant, notified]
+        self._days: Dict[str, Dict[str, List[int]]] = {}
+        self._counter = get_metrics().counter(
+            "keyword_posts_total", "Posts per matched keyword and funnel stage", ("keyword", "stage")
+        )
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r") as f:
+                self._days = json.load(f).get("days", {})
+        except Exception as e:
+            logger.warning(f"Error loading keyword yield: {e}")
+            self._days = {}
+
+    def save(self):
+        """Drop expired days and write the state file."""
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        with self._lock:
+            for day in [d for d in self._days if d < cutoff]:
+                del self._days[day]
+            data = {"days": self._days, "updated": datetime.now(timezone.utc).isoformat()}
+        try:
+            with open(self.path, "w") as f:
+                json.dump(data, f)
+        except Exception as e:
+            logger.error(f"Error saving keyword yield: {e}")
+
+    def record(self, stage: str, keywords: Iterable[str]):
+        """Count one post at `stage` for each of its matched keywords."""
+        index = STAGES.index(stage)
+        day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        with self._lock:
+            counts = self._days.setdefault(day, {})
+            for keyword in keywords:
+                counts.setdefault(keyword, [0, 0, 0])[index] += 1
+                self._counter.inc(keyword=keyword, stage=stage)
+
+    def totals(self, days: int = 30) -> Dict[str, Dict[str, int]]:
+        """
+        Per-keyword totals over the last `days` days (including today).
+
+        Returns:
+            keyword -> {"matched", "relevant", "notified"}
+        """
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        totals: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            for day, counts in self._days.items():
+                if day < cutoff:
+                    continue
+                for keyword, values in counts.items():
+                    row = totals.setdefault(keyword, dict.fromkeys(STAGES, 0))
+                    for stage, value in zip(STAGES, values):
+                        row[stage] += value
+        return totals
+
+    def report(self, keywords: Iterable[str], days: int = 30) -> str:
+        """
+        Table of per-keyword yield, worst pass rate first.
+
+        Args:
+            keywords: Configured keywords (listed even with no matches)
+            days: Window in days
+        """
+        totals = self.totals(days)
+        rows: List[Dict[str, Any]] = []
+        for keyword in dict.fromkeys([*keywords, *totals]):
+            row = totals.get(keyword, dict.fromkeys(STAGES, 0))
+            rate = row["relevant"] / row["matched"] if row["matched"] else None
+            rows.append({"keyword": keyword, **row, "pass_rate": rate})
+        # Keywords that cost AI checks without passing them come first
+        rows.sort(key=lambda r: (r["pass_rate"] is None, r["pass_rate"] or 0.0, -r["matched"]))
+
+        lines = [
+            f"Keyword yield, last {days} day(s)",
+            f"{'keyword':<32} {'matched':>8} {'relevant':>9} {'notified':>9} {'pass':>6}",
+        ]
+        for row in rows:
+            rate = f"{row['pass_rate']:.0%}" if row["pass_rate"] is not None else "-"
+            lines.append(
+                f"{row['keyword'][:32]:<32} {row['matched']:>8} {row['relevant']:>9} {row['notified']:>9} {rate:>6}"
+            )
+        return "\n".join(lines)
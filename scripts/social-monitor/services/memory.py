@@ -0,0 +1,173 @@
+"""Opt-in per-cycle memory instrumentation using tracemalloc."""
+import logging
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Allocations made by the profiler itself or the import machinery
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class MemoryProfiler:
+    """
+    Diffs tracemalloc snapshots at cycle boundaries.
+
+    After each cycle it logs total traced-memory growth and the allocation
+    sites that grew the most, optionally dumps the snapshot to disk (load
+    with `tracemalloc.Snapshot.load`), and warns when growth per cycle or
+    since start crosses the configured thresholds.
+    """
+
+    def __init__(
+        self,
+        top_n: int = 10,
+        frames: int = 1,
+        key_type: str = "lineno",
+        dump_dir: Optional[Path] = None,
+        max_dumps: int = 20,
+        cycle_threshold_mb: Optional[float] = None,
+        total_threshold_mb: Optional[float] = None,
+    ):
+        """
+        Initialize the profiler.
+
+        Args:
+            top_n: Allocation sites to report per cycle
+            frames: Stack frames stored per allocation (more = slower, more context)
+            key_type: Group allocations by "lineno", "filename" or "traceback"
+            dump_dir: Write each cycle's snapshot here (None disables dumps)
+            max_dumps: Keep only the most recent dumps
+            cycle_threshold_mb: Warn when one cycle grows memory by more than this
+            total_threshold_mb: Warn when growth since start exceeds this
+        """
+        self.top_n = top_n
+        self.frames = frames
+        self.key_type = key_type
+        self.dump_dir = dump_dir
+        self.max_dumps = max_dumps
+        self.cycle_threshold_mb = cycle_threshold_mb
+        self.total_threshold_mb = total_threshold_mb
+
+        self.cycles = 0
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._dumps: List[Path] = []
+
+        metrics = get_metrics()
+        self._traced = metrics.gauge("traced_memory_bytes", "Memory traced by tracemalloc", ("kind",))
+        self._alerts = metrics.counter("memory_growth_alerts_total", "Memory growth threshold breaches", ("scope",))
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], base_dir: Path) -> "MemoryProfiler":
+        dump_dir = config.get("dump_dir")
+        return cls(
+            top_n=config.get("top_n", 10),
+            frames=config.get("frames", 1),
+            key_type=config.get("key_type", "lineno"),
+            dump_dir=base_dir / dump_dir if dump_dir else None,
+            max_dumps=config.get("max_dumps", 20),
+            cycle_threshold_mb=config.get("cycle_growth_threshold_mb"),
+            total_threshold_mb=config.get("total_growth_threshold_mb"),
+        )
+
+    def start(self):
+        """Begin tracing and take the baseline snapshot."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        if self.dump_dir:
+            self.dump_dir.mkdir(parents=True, exist_ok=True)
+        self._baseline = self._previous = self._snapshot()
+        logger.info(f"Memory tracing started ({self.frames} frame(s) per allocation)")
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+    def on_cycle(self, summary: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Snapshot, diff against the previous cycle and report.
+
+        Usable directly as a SocialMonitor cycle listener.
+
+        Returns:
+            {"cycle", "growth_bytes", "total_growth_bytes", "top": [...]}
+        """
+        if self._previous is None:
+            self.start()
+            return {}
+
+        self.cycles += 1
+        snapshot = self._snapshot()
+        stats = snapshot.compare_to(self._previous, self.key_type)
+        growth = sum(s.size_diff for s in stats)
+        total_growth = sum(s.size_diff for s in snapshot.compare_to(self._baseline, "filename"))
+        self._previous = snapshot
+
+        current, peak = tracemalloc.get_traced_memory()
+        self._traced.set(current, kind="current")
+        self._traced.set(peak, kind="peak")
+
+        top = sorted(stats, key=lambda s: s.size_diff, reverse=True)[:self.top_n]
+        logger.info(
+            f"Memory cycle {self.cycles}: {growth / 1e6:+.2f} MB "
+            f"({total_growth / 1e6:+.2f} MB since start, {current / 1e6:.1f} MB traced, "
+            f"peak {peak / 1e6:.1f} MB)"
+        )
+        for stat in top:
+            if stat.size_diff <= 0:
+                break
+            frame = stat.traceback[0]
+            logger.info(
+                f"  {stat.size_diff / 1024:+9.1f} KiB {stat.count_diff:+7d} blocks  "
+                f"{frame.filename}:{frame.lineno}"
+            )
+
+        self._check_thresholds(growth, total_growth)
+        if self.dump_dir:
+            self._dump(snapshot)
+
+        return {
+            "cycle": self.cycles,
+            "growth_bytes": growth,
+            "total_growth_bytes": total_growth,
+            "top": [
+                {"site": str(s.traceback[0]), "size_diff": s.size_diff, "count_diff": s.count_diff}
+                for s in top
+            ],
+        }
+
+    def _check_thresholds(self, growth: int, total_growth: int):
+        if self.cycle_threshold_mb and growth > self.cycle_threshold_mb * 1e6:
+            self._alerts.inc(scope="cycle")
+            logger.warning(
+                f"Memory grew {growth / 1e6:.1f} MB in cycle {self.cycles} "
+                f"(threshold {self.cycle_threshold_mb} MB)"
+            )
+        if self.total_threshold_mb and total_growth > self.total_threshold_mb * 1e6:
+            self._alerts.inc(scope="total")
+            logger.warning(
+                f"Memory grew {total_growth / 1e6:.1f} MB since start over {self.cycles} cycles "
+                f"(threshold {self.total_threshold_mb} MB) - possible leak"
+            )
+
+    def _dump(self, snapshot: tracemalloc.Snapshot):
+        path = self.dump_dir / f"cycle-{self.cycles:05d}.tracemalloc"
+        try:
+            snapshot.dump(str(path))
+            self._dumps.append(path)
+            while len(self._dumps) > self.max_dumps:
+                self._dumps.pop(0).unlink(missing_ok=True)
+        except Exception as e:
+            logger.error(f"Error dumping memory snapshot: {e}")
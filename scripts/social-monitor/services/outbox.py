@@ -0,0 +1,357 @@
+"""Durable SQLite outbox and background dispatcher for notification emails."""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_SENDING = "sending"
+STATUS_SENT = "sent"
+STATUS_DEAD = "dead"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    recipient TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    html_body TEXT NOT NULL,
+    post_ids TEXT NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    claimed_at REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at);
+"""
+
+
+def make_idempotency_key(recipient: str, post_ids: List[str]) -> str:
+    """Stable key for "this recipient was told about exactly these posts"."""
+    raw = recipient.lower() + "\n" + "\n".join(sorted(post_ids))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class OutboxMessage:
+    """A rendered notification waiting in the outbox."""
+
+    id: int
+    idempotency_key: str
+    recipient: str
+    subject: str
+    html_body: str
+    post_ids: List[str]
+    attempts: int
+    created_at: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class NotificationOutbox:
+    """
+    Persistent queue of rendered notification emails.
+
+    Messages survive restarts and SMTP outages. Each message carries an
+    idempotency key derived from its recipient and post IDs, so re-enqueueing
+    the same notification (e.g. after a crash mid-cycle) never sends twice.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_attempts: int = 8,
+        base_backoff_seconds: float = 30.0,
+        max_backoff_seconds: float = 3600.0,
+        claim_timeout_seconds: float = 600.0,
+    ):
+        """
+        Initialize the outbox.
+
+        Args:
+            path: SQLite database file
+            max_attempts: Give up (mark dead) after this many failed sends
+            base_backoff_seconds: Delay after the first failure (doubles each time)
+            max_backoff_seconds: Upper bound on the retry delay
+            claim_timeout_seconds: Reclaim messages stuck in 'sending' after this long
+        """
+        self.path = path
+        self.max_attempts = max_attempts
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.claim_timeout_seconds = claim_timeout_seconds
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def enqueue(
+        self,
+        recipient: str,
+        subject: str,
+        html_body: str,
+        post_ids: List[str],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Add a rendered notification to the outbox.
+
+        Returns:
+            True if queued, False if an identical notification already exists
+        """
+        key = make_idempotency_key(recipient, post_ids)
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """INSERT OR IGNORE INTO outbox
+                   (idempotency_key, recipient, subject, html_body, post_ids, metadata,
+                    status, next_attempt_at, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (key, recipient, subject, html_body, json.dumps(post_ids),
+                 json.dumps(metadata or {}), STATUS_PENDING, now, now),
+            )
+            self._conn.commit()
+        if cursor.rowcount == 0:
+            logger.debug(f"Outbox already has this notification for {recipient}, skipping")
+            return False
+        return True
+
+    def claim_due(self, limit: int = 50) -> List[OutboxMessage]:
+        """Claim up to `limit` messages that are due for a send attempt."""
+        now = time.time()
+        stale = now - self.claim_timeout_seconds
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT * FROM outbox
+                   WHERE (status = ? AND next_attempt_at <= ?)
+                      OR (status = ? AND claimed_at < ?)
+                   ORDER BY next_attempt_at, id LIMIT ?""",
+                (STATUS_PENDING, now, STATUS_SENDING, stale, limit),
+            ).fetchall()
+            if rows:
+                self._conn.executemany(
+                    "UPDATE outbox SET status = ?, claimed_at = ? WHERE id = ?",
+                    [(STATUS_SENDING, now, row["id"]) for row in rows],
+                )
+                self._conn.commit()
+
+        return [
+            OutboxMessage(
+                id=row["id"],
+                idempotency_key=row["idempotency_key"],
+                recipient=row["recipient"],
+                subject=row["subject"],
+                html_body=row["html_body"],
+                post_ids=json.loads(row["post_ids"]),
+                attempts=row["attempts"],
+                created_at=row["created_at"],
+                metadata=json.loads(row["metadata"] or "{}"),
+            )
+            for row in rows
+        ]
+
+    def mark_sent(self, message_id: int):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, sent_at = ?, attempts = attempts + 1, last_error = NULL WHERE id = ?",
+                (STATUS_SENT, time.time(), message_id),
+            )
+            self._conn.commit()
+
+    def mark_failed(self, message: OutboxMessage, error: str) -> bool:
+        """
+        Record a failed attempt and schedule the retry.
+
+        Returns:
+            True if the message will be retried, False if it is now dead
+        """
+        attempts = message.attempts + 1
+        if attempts >= self.max_attempts:
+            status, next_attempt = STATUS_DEAD, time.time()
+        else:
+            delay = min(self.base_backoff_seconds * (2 ** (attempts - 1)), self.max_backoff_seconds)
+            status, next_attempt = STATUS_PENDING, time.time() + delay
+
+        with self._lock:
+            self._conn.execute(
+                """UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?,
+                   claimed_at = NULL, last_error = ? WHERE id = ?""",
+                (status, attempts, next_attempt, error[:500], message.id),
+            )
+            self._conn.commit()
+        return status == STATUS_PENDING
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the next pending message is due (None if nothing pending)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt_at) AS due FROM outbox WHERE status = ?",
+                (STATUS_PENDING,),
+            ).fetchone()
+        if row is None or row["due"] is None:
+            return None
+        return max(0.0, row["due"] - time.time())
+
+    def counts(self) -> Dict[str, int]:
+        """Number of messages in each status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) AS n FROM outbox GROUP BY status"
+            ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def purge_sent(self, older_than_days: int = 7) -> int:
+        """Delete delivered messages older than the retention window."""
+        cutoff = time.time() - older_than_days * 86400
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM outbox WHERE status = ? AND sent_at < ?",
+                (STATUS_SENT, cutoff),
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+
+class OutboxDispatcher:
+    """
+    Drains the outbox in the background, retrying failures with backoff.
+
+    In daemon mode the dispatcher runs on its own thread so slow SMTP never
+    blocks a monitoring cycle. One-shot runs call `drain()` before exiting.
+    """
+
+    def __init__(
+        self,
+        outbox: NotificationOutbox,
+        send: Callable[[OutboxMessage], None],
+        session: Optional[Callable[[], ContextManager]] = None,
+        poll_interval: float = 5.0,
+        batch_size: int = 50,
+        on_sent: Optional[Callable[[OutboxMessage], None]] = None,
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            outbox: Outbox to drain
+            send: Delivers one message, raising on failure
+            session: Optional context manager factory wrapped around each batch
+                (e.g. EmailService.session to reuse one SMTP connection)
+            poll_interval: Max seconds between checks for due messages
+            batch_size: Messages claimed per batch
+            on_sent: Optional callback after each successful delivery
+        """
+        self.outbox = outbox
+        self.send = send
+        self.session = session or nullcontext
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.on_sent = on_sent
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the background dispatch thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="outbox-dispatcher", daemon=True)
+        self._thread.start()
+        logger.info("Outbox dispatcher started")
+
+    def stop(self, timeout: float = 30.0):
+        """Stop the background thread after its current batch."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self):
+        """Signal that new messages were enqueued."""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.dispatch_batch()
+            except Exception as e:
+                logger.error(f"Outbox dispatch error: {e}")
+
+            due_in = self.outbox.next_due_in()
+            wait = self.poll_interval if due_in is None else min(due_in, self.poll_interval)
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    def dispatch_batch(self) -> int:
+        """
+        Send one batch of due messages.
+
+        Returns:
+            Number of messages attempted
+        """
+        messages = self.outbox.claim_due(self.batch_size)
+        if not messages:
+            return 0
+
+        with self.session():
+            for message in messages:
+                try:
+                    self.send(message)
+                    self.outbox.mark_sent(message.id)
+                    logger.info(f"Outbox: sent {len(message.post_ids)} posts to {message.recipient}")
+                except Exception as e:
+                    if self.outbox.mark_failed(message, str(e)):
+                        logger.warning(f"Outbox: send to {message.recipient} failed, will retry: {e}")
+                    else:
+                        logger.error(
+                            f"Outbox: giving up on {message.recipient} after "
+                            f"{message.attempts + 1} attempts: {e}"
+                        )
+                    continue
+
+                if self.on_sent:
+                    try:
+                        self.on_sent(message)
+                    except Exception as e:
+                        logger.warning(f"Outbox: on_sent callback failed: {e}")
+        return len(messages)
+
+    def drain(self, timeout: float = 120.0) -> int:
+        """
+        Synchronously send everything currently due.
+
+        Messages that fail stay queued for their retry time (picked up by the
+        next run). Stops early when `timeout` seconds have elapsed.
+
+        Returns:
+            Number of messages attempted
+        """
+        deadline = time.monotonic() + timeout
+        attempted = 0
+        while time.monotonic() < deadline:
+            count = self.dispatch_batch()
+            if count == 0:
+                break
+            attempted += count
+        return attempted
@@ -0,0 +1,186 @@
+"""Streaming staged pipeline with bounded queues between stages."""
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    """Timing and throughput for one pipeline stage."""
+
+    name: str
+    workers: int
+    items_in: int = 0
+    items_out: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+    first_output_at: Optional[float] = None
+    last_output_at: Optional[float] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 4),
+            "blocked_seconds": round(self.blocked_seconds, 4),
+        }
+
+
+class Stage:
+    """
+    One step of the pipeline.
+
+    `func` takes a single item and returns an iterable of output items
+    (a list, a generator, or None to drop the item). Generators stream:
+    each yielded item is handed downstream immediately.
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Optional[Iterable[Any]]], workers: int = 1):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+
+
+class Pipeline:
+    """
+    Runs items through a chain of stages on worker threads.
+
+    Stages are connected by bounded queues, so a slow stage applies
+    backpressure upstream instead of letting work pile up in memory, and
+    items reach later stages as soon as earlier ones produce them.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 64):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.stats: List[StageStats] = []
+        self.wall_seconds = 0.0
+        self._queues: List[queue.Queue] = []
+
+    def run(self, items: Iterable[Any]) -> List[Any]:
+        """
+        Feed `items` into the first stage and collect the last stage's output.
+
+        Returns:
+            Items emitted by the final stage, in arrival order
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        self._queues = queues
+        self.stats = [StageStats(stage.name, stage.workers) for stage in self.stages]
+        start = time.perf_counter()
+
+        threads = [threading.Thread(
+            target=self._feed, args=(items, queues[0]), name="pipeline-feed", daemon=True
+        )]
+        for index, stage in enumerate(self.stages):
+            remaining = {"workers": stage.workers}
+            lock = threading.Lock()
+            for n in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work,
+                    args=(stage, self.stats[index], queues[index], queues[index + 1], remaining, lock),
+                    name=f"pipeline-{stage.name}-{n}",
+                    daemon=True,
+                ))
+
+        for thread in threads:
+            thread.start()
+
+        results = []
+        while True:
+            item = queues[-1].get()
+            if item is _DONE:
+                break
+            results.append(item)
+
+        for thread in threads:
+            thread.join()
+
+        self.wall_seconds = time.perf_counter() - start
+        return results
+
+    @staticmethod
+    def _feed(items: Iterable[Any], out_q: queue.Queue):
+        try:
+            for item in items:
+                out_q.put(item)
+        finally:
+            out_q.put(_DONE)
+
+    @staticmethod
+    def _work(
+        stage: Stage,
+        stats: StageStats,
+        in_q: queue.Queue,
+        out_q: queue.Queue,
+        remaining: dict,
+        lock: threading.Lock,
+    ):
+        while True:
+            item = in_q.get()
+            if item is _DONE:
+                with lock:
+                    remaining["workers"] -= 1
+                    last = remaining["workers"] == 0
+                if last:
+                    out_q.put(_DONE)
+                else:
+                    # Pass the marker on to a sibling worker
+                    in_q.put(_DONE)
+                return
+
+            with lock:
+                stats.items_in += 1
+
+            started = time.perf_counter()
+            blocked = 0.0
+            produced = 0
+            try:
+                outputs = stage.func(item)
+                for output in outputs or ():
+                    put_start = time.perf_counter()
+                    out_q.put(output)
+                    put_end = time.perf_counter()
+                    blocked += put_end - put_start
+                    produced += 1
+                    with lock:
+                        if stats.first_output_at is None:
+                            stats.first_output_at = put_end
+                        stats.last_output_at = put_end
+            except Exception as e:
+                logger.error(f"Pipeline stage '{stage.name}' failed on item: {e}")
+                with lock:
+                    stats.errors += 1
+
+            elapsed = time.perf_counter() - started
+            with lock:
+                stats.items_out += produced
+                stats.busy_seconds += elapsed - blocked
+                stats.blocked_seconds += blocked
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Items waiting in front of each stage (approximate, for monitoring)."""
+        return {stage.name: q.qsize() for stage, q in zip(self.stages, self._queues)}
+
+    def summary(self) -> str:
+        """One-line per-stage timing breakdown for the last run."""
+        parts = [
+            f"{s.name} {s.items_in}->{s.items_out} "
+            f"{s.busy_seconds:.2f}s busy/{s.workers}w"
+            + (f" {s.blocked_seconds:.2f}s blocked" if s.blocked_seconds >= 0.01 else "")
+            + (f" {s.errors} errors" if s.errors else "")
+            for s in self.stats
+        ]
+        return f"{self.wall_seconds:.2f}s total | " + " | ".join(parts)
@@ -0,0 +1,276 @@
+"""Per-cycle CPU profiling: flamegraph-ready collapsed stacks and hot-function tables."""
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Leaf frames that mean "blocked, not burning CPU" (left out of the hot-function table)
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("socketserver.py", "serve_forever"),
+}
+
+
+# From 3.12 cProfile runs on sys.monitoring: one profiler sees every thread, and only one may be active
+_MONITORING_PROFILER = sys.version_info >= (3, 12)
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples the stacks of every thread at a fixed interval.
+
+    Unlike cProfile this sees the pipeline's worker threads, and its
+    overhead is bounded by the interval rather than by call counts. Samples
+    are wall-clock, so time blocked on network I/O shows up too.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        """
+        Initialize the sampler.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                labels.append(names.get(ident, str(ident)))
+                self.stacks[tuple(reversed(labels))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Stacks in Brendan Gregg's folded format (flamegraph.pl, speedscope, inferno)."""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+    @staticmethod
+    def _is_idle(leaf: str) -> bool:
+        name, _, location = leaf.partition(" (")
+        return (location.split(":")[0], name) in _IDLE_LEAVES
+
+    def top(self, n: int = 25) -> List[Tuple[str, int, int]]:
+        """
+        Hottest functions among non-idle samples.
+
+        Returns:
+            [(function, self samples, total samples)] by self samples
+        """
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            if self._is_idle(stack[-1]):
+                continue
+            own[stack[-1]] += count
+            for label in set(stack[1:]):
+                total[label] += count
+        return [(label, count, total[label]) for label, count in own.most_common(n)]
+
+    def top_table(self, n: int = 25) -> str:
+        rows = self.top(n)
+        busy = sum(count for stack, count in self.stacks.items() if not self._is_idle(stack[-1])) or 1
+        lines = [f"{'self%':>6} {'total%':>7}  function", f"{'-' * 6} {'-' * 7}  {'-' * 40}"]
+        for label, own, total in rows:
+            lines.append(f"{own / busy:6.1%} {total / busy:7.1%}  {label}")
+        return "\n".join(lines) + "\n"
+
+
+class ThreadedProfile:
+    """
+    cProfile for the calling thread plus every thread started while enabled.
+
+    Before Python 3.12 cProfile only hooks the thread that enables it;
+    pipeline workers are started fresh each cycle, so a `threading.setprofile`
+    hook gives each new thread its own profiler and the stats are merged at
+    the end. From 3.12 the one profiler already covers all threads.
+    """
+
+    def __init__(self):
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def _start_thread_profile(self, frame, event, arg):
+        # Runs in the new thread before its target, so it must never raise
+        profile = cProfile.Profile()
+        try:
+            # Replaces this hook with the C profiler for the rest of the thread
+            profile.enable()
+        except Exception as e:
+            sys.setprofile(None)
+            logger.debug(f"Thread {threading.current_thread().name} not profiled: {e}")
+            return
+        with self._lock:
+            self._profiles.append(profile)
+
+    def enable(self):
+        main = cProfile.Profile()
+        main.enable()
+        self._profiles.append(main)
+        if not _MONITORING_PROFILER:
+            threading.setprofile(self._start_thread_profile)
+
+    def disable(self):
+        if not _MONITORING_PROFILER:
+            threading.setprofile(None)
+        self._profiles[0].disable()
+
+    def stats(self, stream=None) -> pstats.Stats:
+        with self._lock:
+            profiles = list(self._profiles)
+        # pstats rejects profilers that recorded nothing (threads that never ran)
+        collected = []
+        for profile in profiles:
+            profile.create_stats()
+            if profile.stats:
+                collected.append(profile)
+        return pstats.Stats(*collected, stream=stream)
+
+
+class CycleProfiler:
+    """
+    Profiles monitoring cycles and writes one report set per profiled cycle.
+
+    Modes:
+        sample: StackSampler over all threads -> cycle-N.collapsed + cycle-N.top.txt
+        deterministic: cProfile on the cycle thread and the worker threads it
+            starts (see ThreadedProfile) -> cycle-N.pstats + cycle-N.top.txt
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        mode: str = "sample",
+        every: int = 1,
+        interval: float = 0.005,
+        top_n: int = 25,
+    ):
+        """
+        Initialize the profiler.
+
+        Args:
+            output_dir: Where per-cycle profiles are written
+            mode: "sample" or "deterministic"
+            every: Profile every Nth cycle (1 = all)
+            interval: Sampling interval in seconds (sample mode)
+            top_n: Rows in the hot-function table
+        """
+        if mode not in ("sample", "deterministic"):
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.output_dir = Path(output_dir)
+        self.mode = mode
+        self.every = max(1, every)
+        self.interval = interval
+        self.top_n = top_n
+        self.cycles = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], base_dir: Path) -> "CycleProfiler":
+        return cls(
+            output_dir=base_dir / config.get("output_dir", "profiles"),
+            mode=config.get("mode", "sample"),
+            every=config.get("every", 1),
+            interval=config.get("interval_ms", 5) / 1000.0,
+            top_n=config.get("top_n", 25),
+        )
+
+    @contextmanager
+    def cycle(self) -> Iterator[None]:
+        """Profile the enclosed cycle if it's one of every Nth."""
+        self.cycles += 1
+        if (self.cycles - 1) % self.every:
+            yield
+            return
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = self.output_dir / f"cycle-{self.cycles:05d}"
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        if self.mode == "sample":
+            sampler = StackSampler(self.interval)
+            sampler.start()
+            try:
+                yield
+            finally:
+                sampler.stop()
+                self._write_sampled(sampler, stem, cpu_start, wall_start)
+        else:
+            profile = ThreadedProfile()
+            try:
+                profile.enable()
+            except Exception as e:
+                # e.g. the whole process already runs under another profiler
+                logger.warning(f"Profile cycle {self.cycles} skipped: {e}")
+                profile = None
+            if profile is None:
+                yield
+                return
+            try:
+                yield
+            finally:
+                profile.disable()
+                self._write_deterministic(profile, stem, cpu_start, wall_start)
+
+    def _write_sampled(self, sampler: StackSampler, stem: Path, cpu_start: float, wall_start: float):
+        try:
+            stem.with_suffix(".collapsed").write_text(sampler.collapsed())
+            table = sampler.top_table(self.top_n)
+            stem.with_suffix(".top.txt").write_text(table)
+            logger.info(
+                f"Profile cycle {self.cycles}: {time.perf_counter() - wall_start:.2f}s wall, "
+                f"{time.process_time() - cpu_start:.2f}s CPU, {sampler.samples} samples -> "
+                f"{stem.with_suffix('.collapsed')}\n{table}"
+            )
+        except Exception as e:
+            logger.error(f"Error writing profile: {e}")
+
+    def _write_deterministic(self, profile: ThreadedProfile, stem: Path, cpu_start: float, wall_start: float):
+        try:
+            out = io.StringIO()
+            stats = profile.stats(stream=out)
+            stats.dump_stats(str(stem.with_suffix(".pstats")))
+            stats.sort_stats("tottime").print_stats(self.top_n)
+            stem.with_suffix(".top.txt").write_text(out.getvalue())
+            logger.info(
+                f"Profile cycle {self.cycles}: {time.perf_counter() - wall_start:.2f}s wall, "
+                f"{time.process_time() - cpu_start:.2f}s CPU -> {stem.with_suffix('.pstats')}\n{out.getvalue()}"
+            )
+        except Exception as e:
+            logger.error(f"Error writing profile: {e}")
@@ -0,0 +1,328 @@
+"""Per-adapter and per-source polling schedules."""
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PollSchedule:
+    """When a single adapter (or feed) should next be polled."""
+
+    name: str
+    interval: float
+    jitter: float = 0.0
+    priority: int = 0
+    next_due: float = 0.0
+    last_run: Optional[float] = None
+    adaptive: bool = False
+
+    def is_due(self, now: float) -> bool:
+        return now >= self.next_due
+
+    def reschedule(self, now: float):
+        """Schedule the next poll one interval (plus random jitter) from now."""
+        self.last_run = now
+        self.next_due = now + self.interval + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+
+@dataclass
+class SourceRate:
+    """Observed arrival rate of new items for one source."""
+
+    new_per_poll: float
+    polls: int = 0
+    recent_ids: List[str] = field(default_factory=list)
+
+
+class AdaptivePollPolicy:
+    """
+    Sizes each source's polling interval to its observed change rate.
+
+    Keeps an exponentially weighted estimate of new items per poll and
+    picks the interval at which a poll is expected to find
+    `target_new_per_poll` new items: quiet feeds back off towards
+    `max_interval`, busy ones speed up towards `min_interval`. An optional
+    request budget stretches all intervals when total spend is too high.
+    """
+
+    # Remember this many item IDs per source to tell new items from old ones
+    RECENT_IDS_LIMIT = 200
+
+    def __init__(
+        self,
+        min_interval: float = 120.0,
+        max_interval: float = 21600.0,
+        initial_interval: float = 300.0,
+        target_new_per_poll: float = 1.0,
+        smoothing: float = 0.3,
+        max_step: float = 2.0,
+        max_requests_per_hour: Optional[float] = None,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            min_interval: Fastest allowed polling (seconds)
+            max_interval: Slowest allowed polling (seconds)
+            initial_interval: Interval for sources with no history yet
+            target_new_per_poll: New items a poll should find; lower means
+                fresher results at the cost of more requests
+            smoothing: EWMA weight of the latest observation (0-1)
+            max_step: Largest factor an interval may change by per poll
+            max_requests_per_hour: Request spend cap across adaptive sources
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.target_new_per_poll = target_new_per_poll
+        self.smoothing = smoothing
+        self.max_step = max_step
+        self.max_requests_per_hour = max_requests_per_hour
+        self.rates: Dict[str, SourceRate] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], default_interval: float) -> "AdaptivePollPolicy":
+        return cls(
+            min_interval=config.get("min_interval_seconds", 120),
+            max_interval=config.get("max_interval_seconds", 21600),
+            initial_interval=config.get("initial_interval_seconds", default_interval),
+            target_new_per_poll=config.get("target_new_items_per_poll", 1.0),
+            smoothing=config.get("smoothing", 0.3),
+            max_requests_per_hour=config.get("max_requests_per_hour"),
+        )
+
+    def observe(self, name: str, item_ids: List[str]) -> int:
+        """
+        Record the items returned by one poll.
+
+        Returns:
+            Number of items not seen in the source's previous polls
+        """
+        rate = self.rates.get(name)
+        if rate is None:
+            # First poll only establishes a baseline
+            self.rates[name] = SourceRate(
+                new_per_poll=self.target_new_per_poll,
+                polls=1,
+                recent_ids=list(item_ids)[-self.RECENT_IDS_LIMIT:],
+            )
+            return 0
+
+        known = set(rate.recent_ids)
+        new_ids = [i for i in item_ids if i not in known]
+        rate.new_per_poll = self.smoothing * len(new_ids) + (1 - self.smoothing) * rate.new_per_poll
+        rate.polls += 1
+        rate.recent_ids = (rate.recent_ids + new_ids)[-self.RECENT_IDS_LIMIT:]
+        return len(new_ids)
+
+    def next_interval(self, name: str, current: float) -> float:
+        """Interval expected to yield `target_new_per_poll` new items."""
+        rate = self.rates.get(name)
+        if rate is None or rate.polls < 2:
+            return current
+
+        if rate.new_per_poll <= 1e-6:
+            proposed = current * self.max_step
+        else:
+            items_per_second = rate.new_per_poll / current
+            proposed = self.target_new_per_poll / items_per_second
+
+        # Move gradually so a single burst or lull doesn't swing the schedule
+        proposed = min(max(proposed, current / self.max_step), current * self.max_step)
+        return min(max(proposed, self.min_interval), self.max_interval)
+
+    def apply_budget(self, interval: float, intervals: List[float]) -> float:
+        """Stretch an interval if all adaptive sources together exceed the request budget."""
+        if not self.max_requests_per_hour or not intervals:
+            return interval
+        requests_per_hour = sum(3600.0 / i for i in intervals if i > 0)
+        if requests_per_hour <= self.max_requests_per_hour:
+            return interval
+        return min(interval * requests_per_hour / self.max_requests_per_hour, self.max_interval)
+
+    def state(self) -> Dict[str, Dict]:
+        return {name: asdict(rate) for name, rate in self.rates.items()}
+
+    def restore(self, state: Dict[str, Dict]):
+        for name, data in state.items():
+            self.rates[name] = SourceRate(
+                new_per_poll=data.get("new_per_poll", self.target_new_per_poll),
+                polls=data.get("polls", 0),
+                recent_ids=data.get("recent_ids", []),
+            )
+
+
+class PollScheduler:
+    """
+    Tracks polling schedules for adapters and their individual sources.
+
+    Times are wall-clock so the state can be persisted and shared between
+    cron-driven single runs as well as the long-lived daemon.
+    """
+
+    def __init__(self, state_path: Optional[Path] = None, adaptive: Optional[AdaptivePollPolicy] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            state_path: JSON file for persisting schedules between runs
+            adaptive: Optional policy that sizes per-source intervals to
+                their observed change rate
+        """
+        self.state_path = state_path
+        self.adaptive = adaptive
+        self._schedules: Dict[str, PollSchedule] = {}
+        self._saved_state: Dict[str, Dict] = {}
+        # Source name -> (last_run, next_due) before its latest claim, for release()
+        self._claims: Dict[str, Tuple[Optional[float], float]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Load persisted next-due times (and source rates)."""
+        if not self.state_path or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, "r") as f:
+                data = json.load(f)
+            self._saved_state = data.get("schedules", {})
+            if self.adaptive:
+                self.adaptive.restore(data.get("rates", {}))
+            logger.debug(f"Loaded {len(self._saved_state)} poll schedules")
+        except Exception as e:
+            logger.warning(f"Error loading schedule state: {e}")
+
+    def save(self):
+        """Persist next-due times (and source rates)."""
+        if not self.state_path:
+            return
+        with self._lock:
+            data = {"schedules": {name: asdict(s) for name, s in self._schedules.items()}}
+            if self.adaptive:
+                data["rates"] = self.adaptive.state()
+        try:
+            with open(self.state_path, "w") as f:
+                json.dump(data, f, indent=2)
+        except Exception as e:
+            logger.error(f"Error saving schedule state: {e}")
+
+    def add(self, name: str, interval: float, jitter: float = 0.0, priority: int = 0) -> PollSchedule:
+        """
+        Register a schedule, restoring its persisted next-due time if known.
+
+        Configured interval/jitter/priority always win over persisted values.
+        """
+        with self._lock:
+            schedule = PollSchedule(name=name, interval=interval, jitter=jitter, priority=priority)
+            saved = self._saved_state.get(name)
+            if saved:
+                schedule.last_run = saved.get("last_run")
+                if schedule.last_run is not None:
+                    # Re-derive from the configured interval in case it changed
+                    schedule.next_due = min(saved.get("next_due", 0.0), schedule.last_run + interval + jitter)
+            self._schedules[name] = schedule
+            return schedule
+
+    def get(self, name: str) -> Optional[PollSchedule]:
+        return self._schedules.get(name)
+
+    def due(self, names: Optional[List[str]] = None, now: Optional[float] = None) -> List[PollSchedule]:
+        """Schedules due now, highest priority (lowest number) first."""
+        now = time.time() if now is None else now
+        with self._lock:
+            candidates = [
+                s for name, s in self._schedules.items()
+                if (names is None or name in names) and s.is_due(now)
+            ]
+        return sorted(candidates, key=lambda s: (s.priority, s.next_due))
+
+    def mark_ran(self, names: List[str], now: Optional[float] = None):
+        now = time.time() if now is None else now
+        with self._lock:
+            for name in names:
+                if name in self._schedules:
+                    self._schedules[name].reschedule(now)
+
+    def claim(self, name: str, interval: float, jitter: float = 0.0) -> bool:
+        """
+        Check-and-reschedule for a source polled inside an adapter.
+
+        Registers the source on first sight (due immediately). Returns True
+        if the source is due, in which case its next poll is scheduled; a
+        poll that then fails should hand the claim back with `release`.
+        """
+        now = time.time()
+        schedule = self._schedules.get(name)
+        if schedule is None or schedule.interval != interval:
+            schedule = self.add(name, interval, jitter)
+        return self._take(schedule, now)
+
+    def claim_adaptive(self, name: str) -> bool:
+        """
+        Check-and-reschedule for a source whose interval the adaptive policy sets.
+
+        Sources keep their learned interval across runs; new ones start at
+        the policy's initial interval.
+        """
+        now = time.time()
+        schedule = self._schedules.get(name)
+        if schedule is None:
+            saved = self._saved_state.get(name, {})
+            schedule = self.add(name, saved.get("interval", self.adaptive.initial_interval))
+            schedule.adaptive = True
+        return self._take(schedule, now)
+
+    def _take(self, schedule: PollSchedule, now: float) -> bool:
+        with self._lock:
+            if not schedule.is_due(now):
+                return False
+            self._claims[schedule.name] = (schedule.last_run, schedule.next_due)
+            schedule.reschedule(now)
+            return True
+
+    def release(self, name: str):
+        """Undo a source's claim after a failed poll, so it is due again next cycle."""
+        with self._lock:
+            claimed = self._claims.pop(name, None)
+            schedule = self._schedules.get(name)
+            if claimed is not None and schedule is not None:
+                schedule.last_run, schedule.next_due = claimed
+
+    def record_poll(self, name: str, item_ids: List[str]):
+        """Feed a source's poll result to the adaptive policy and resize its interval."""
+        if not self.adaptive:
+            return
+        with self._lock:
+            schedule = self._schedules.get(name)
+            if schedule is None or not schedule.adaptive:
+                return
+            new_items = self.adaptive.observe(name, item_ids)
+            interval = self.adaptive.next_interval(name, schedule.interval)
+            others = [
+                s.interval for n, s in self._schedules.items()
+                if n != name and n in self.adaptive.rates
+            ]
+            interval = self.adaptive.apply_budget(interval, others + [interval])
+            if abs(interval - schedule.interval) >= 1:
+                logger.debug(
+                    f"{name}: {new_items} new, ~{self.adaptive.rates[name].new_per_poll:.2f}/poll, "
+                    f"interval {schedule.interval:.0f}s -> {interval:.0f}s"
+                )
+            schedule.interval = interval
+            schedule.next_due = (schedule.last_run or time.time()) + interval
+
+    def seconds_until_next(self, names: Optional[List[str]] = None, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the earliest schedule is due (None if none registered)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            dues = [s.next_due for name, s in self._schedules.items() if names is None or name in names]
+        if not dues:
+            return None
+        return max(0.0, min(dues) - now)
@@ -0,0 +1,225 @@
+"""Pooled SMTP session for sending many messages over one connection."""
+import logging
+import smtplib
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# SMTP reply codes that mean "try again later" rather than "rejected"
+TRANSIENT_SMTP_CODES = {421, 450, 451, 452, 454}
+
+
+@dataclass
+class SendTiming:
+    """Timing record for a single message sent through the pool."""
+
+    recipient: str
+    connect_seconds: float
+    send_seconds: float
+    attempts: int
+    reused_connection: bool
+    success: bool
+    error: Optional[str] = None
+
+    @property
+    def total_seconds(self) -> float:
+        return self.connect_seconds + self.send_seconds
+
+
+class SMTPSessionPool:
+    """
+    Session-scoped SMTP connection that is shared across many sends.
+
+    Opens one authenticated connection on first use and keeps it open
+    for the rest of the session. The connection is recycled after
+    `max_messages_per_connection` messages (Gmail drops connections that
+    send too many), re-checked with NOOP after sitting idle, and
+    re-established when the server drops it mid-session.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], smtplib.SMTP],
+        max_messages_per_connection: int = 90,
+        max_retries: int = 2,
+        retry_delay: float = 1.0,
+        idle_timeout: float = 60.0,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            connect: Factory returning a connected, authenticated SMTP client
+            max_messages_per_connection: Recycle the connection after this many sends
+            max_retries: Reconnect-and-retry attempts on transient failures
+            retry_delay: Base delay between retries (doubles each attempt)
+            idle_timeout: Seconds idle before the connection is probed with NOOP
+        """
+        self._connect = connect
+        self.max_messages_per_connection = max_messages_per_connection
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.idle_timeout = idle_timeout
+
+        self._server: Optional[smtplib.SMTP] = None
+        self._sent_on_connection = 0
+        self._last_used = 0.0
+
+        self.connections_opened = 0
+        self.timings: List[SendTiming] = []
+
+    def __enter__(self) -> "SMTPSessionPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _open(self):
+        """Open a fresh connection, closing any previous one."""
+        self._discard()
+        self._server = self._connect()
+        self._sent_on_connection = 0
+        self._last_used = time.monotonic()
+        self.connections_opened += 1
+        logger.debug(f"SMTP connection opened (#{self.connections_opened})")
+
+    def _discard(self):
+        """Drop the current connection without raising."""
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            try:
+                self._server.close()
+            except Exception:
+                pass
+        self._server = None
+
+    def _is_alive(self) -> bool:
+        """Probe an idle connection with NOOP."""
+        try:
+            code, _ = self._server.noop()
+            return code == 250
+        except Exception:
+            return False
+
+    def _ensure_connection(self) -> bool:
+        """
+        Make sure a usable connection is open.
+
+        Returns:
+            True if an existing connection was reused, False if a new one was opened
+        """
+        if self._server is not None:
+            if self._sent_on_connection >= self.max_messages_per_connection:
+                logger.debug("SMTP per-connection limit reached, recycling")
+            elif time.monotonic() - self._last_used > self.idle_timeout and not self._is_alive():
+                logger.debug("Idle SMTP connection went stale, reconnecting")
+            else:
+                return True
+        self._open()
+        return False
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        """Whether an error is worth a reconnect and retry."""
+        if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+            return True
+        if isinstance(error, smtplib.SMTPResponseException):
+            return error.smtp_code in TRANSIENT_SMTP_CODES
+        if isinstance(error, smtplib.SMTPException):
+            # Auth failures, refused recipients etc. won't fix themselves
+            return False
+        return isinstance(error, (ConnectionError, TimeoutError, OSError))
+
+    @classmethod
+    def _keeps_connection(cls, error: Exception) -> bool:
+        """Whether the server rejected the message but left the session usable."""
+        # smtplib resets the transaction (RSET) before raising these
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return True
+        return isinstance(error, smtplib.SMTPResponseException) and not cls._is_transient(error)
+
+    def send(self, from_address: str, to_addresses: List[str], message: str) -> SendTiming:
+        """
+        Send one message over the pooled connection.
+
+        Args:
+            from_address: Envelope sender
+            to_addresses: Envelope recipients
+            message: Fully rendered message (as returned by Message.as_string())
+
+        Returns:
+            SendTiming for this message
+
+        Raises:
+            The last SMTP error if the send fails after all retries. A
+            rejected recipient, sender or message is raised at once and
+            the connection is kept for the next send.
+        """
+        connect_seconds = 0.0
+        send_seconds = 0.0
+        reused = False
+        attempt = 0
+
+        while True:
+            attempt += 1
+            try:
+                start = time.perf_counter()
+                reused = self._ensure_connection()
+                connect_seconds += time.perf_counter() - start
+
+                start = time.perf_counter()
+                self._server.sendmail(from_address, to_addresses, message)
+                send_seconds += time.perf_counter() - start
+
+                self._sent_on_connection += 1
+                self._last_used = time.monotonic()
+                timing = SendTiming(
+                    recipient=", ".join(to_addresses),
+                    connect_seconds=connect_seconds,
+                    send_seconds=send_seconds,
+                    attempts=attempt,
+                    reused_connection=reused,
+                    success=True,
+                )
+                self.timings.append(timing)
+                return timing
+
+            except Exception as e:
+                if not self._keeps_connection(e):
+                    self._discard()
+                if attempt > self.max_retries or not self._is_transient(e):
+                    self.timings.append(SendTiming(
+                        recipient=", ".join(to_addresses),
+                        connect_seconds=connect_seconds,
+                        send_seconds=send_seconds,
+                        attempts=attempt,
+                        reused_connection=reused,
+                        success=False,
+                        error=str(e),
+                    ))
+                    raise
+
+                delay = self.retry_delay * (2 ** (attempt - 1))
+                logger.warning(f"Transient SMTP error ({e}), reconnecting in {delay:.1f}s")
+                time.sleep(delay)
+
+    def close(self):
+        """Close the pooled connection."""
+        self._discard()
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarize the session's send timings."""
+        sent = [t for t in self.timings if t.success]
+        total = sum(t.total_seconds for t in sent)
+        return {
+            "sent": len(sent),
+            "failed": len(self.timings) - len(sent),
+            "connections": self.connections_opened,
+            "avg_send_ms": (total / len(sent) * 1000) if sent else 0.0,
+            "max_send_ms": max((t.total_seconds for t in sent), default=0.0) * 1000,
+        }
@@ -0,0 +1,292 @@
+"""Durable SQLite task queue with leases, and a pool of worker processes."""
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_LEASED = "leased"
+STATUS_DONE = "done"
+STATUS_DEAD = "dead"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    result TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_ready ON tasks (status, available_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_lease ON tasks (status, lease_expires_at);
+"""
+
+
+@dataclass
+class Task:
+    """A unit of work leased from the queue."""
+
+    id: int
+    key: str
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+    status: str = STATUS_LEASED
+    result: Optional[Dict[str, Any]] = None
+    last_error: Optional[str] = None
+
+
+class TaskQueue:
+    """
+    Durable work queue shared by a coordinator and worker processes.
+
+    Every process opens its own connection; leasing runs in a
+    `BEGIN IMMEDIATE` transaction, so two workers never get the same task.
+    A leased task that is not completed before its lease expires (the
+    worker crashed or hung) becomes available again, up to `max_attempts`
+    leases. Task keys are unique, so enqueueing the same work twice
+    returns the existing task and its result.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        lease_seconds: float = 300.0,
+        max_attempts: int = 3,
+        base_backoff_seconds: float = 5.0,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            path: SQLite database file
+            lease_seconds: How long a worker owns a task before it can be re-leased
+            max_attempts: Leases (including expired ones) before a task is dead
+            base_backoff_seconds: Delay before retrying a failed task (doubles each time)
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.base_backoff_seconds = base_backoff_seconds
+
+        self._lock = threading.Lock()
+        # Autocommit; transactions are explicit so leases can BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def enqueue(self, kind: str, key: str, payload: Dict[str, Any]) -> int:
+        """
+        Add a task unless one with the same key exists.
+
+        Returns:
+            ID of the new or existing task
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """INSERT OR IGNORE INTO tasks (key, kind, payload, status, available_at, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (key, kind, json.dumps(payload, default=str), STATUS_PENDING, now, now),
+            )
+            return self._conn.execute("SELECT id FROM tasks WHERE key = ?", (key,)).fetchone()["id"]
+
+    def lease(self, owner: str, limit: int = 1, kinds: Optional[Sequence[str]] = None) -> List[Task]:
+        """
+        Lease up to `limit` ready tasks (pending and due, or with an expired lease).
+
+        Expired leases count as failed attempts; a task out of attempts is
+        marked dead instead of being handed out again.
+        """
+        now = time.time()
+        kind_filter = f"AND kind IN ({', '.join('?' * len(kinds))})" if kinds else ""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    """UPDATE tasks SET status = ?, finished_at = ?, last_error = 'lease expired'
+                       WHERE status = ? AND lease_expires_at < ? AND attempts >= ?""",
+                    (STATUS_DEAD, now, STATUS_LEASED, now, self.max_attempts),
+                )
+                rows = self._conn.execute(
+                    f"""SELECT * FROM tasks
+                        WHERE ((status = ? AND available_at <= ?) OR (status = ? AND lease_expires_at < ?))
+                        {kind_filter}
+                        ORDER BY available_at, id LIMIT ?""",
+                    (STATUS_PENDING, now, STATUS_LEASED, now, *(kinds or ()), limit),
+                ).fetchall()
+                self._conn.executemany(
+                    """UPDATE tasks SET status = ?, attempts = attempts + 1, lease_owner = ?,
+                       lease_expires_at = ? WHERE id = ?""",
+                    [(STATUS_LEASED, owner, now + self.lease_seconds, row["id"]) for row in rows],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [
+            Task(row["id"], row["key"], row["kind"], json.loads(row["payload"]), row["attempts"] + 1)
+            for row in rows
+        ]
+
+    def complete(self, task: Task, owner: str, result: Dict[str, Any]) -> bool:
+        """
+        Store a task's result.
+
+        Returns:
+            False if the lease was lost (expired and taken by another worker)
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                """UPDATE tasks SET status = ?, result = ?, finished_at = ?, lease_owner = NULL,
+                   lease_expires_at = NULL WHERE id = ? AND status = ? AND lease_owner = ?""",
+                (STATUS_DONE, json.dumps(result, default=str), time.time(), task.id, STATUS_LEASED, owner),
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, task: Task, owner: str, error: str) -> bool:
+        """
+        Record a failed attempt and schedule the retry with backoff.
+
+        Returns:
+            True if the task will be retried, False if it is now dead
+        """
+        now = time.time()
+        if task.attempts >= self.max_attempts:
+            status, available_at = STATUS_DEAD, now
+        else:
+            status, available_at = STATUS_PENDING, now + self.base_backoff_seconds * (2 ** (task.attempts - 1))
+        with self._lock:
+            self._conn.execute(
+                """UPDATE tasks SET status = ?, available_at = ?, last_error = ?, lease_owner = NULL,
+                   lease_expires_at = NULL, finished_at = CASE WHEN ? = 'dead' THEN ? END
+                   WHERE id = ? AND status = ? AND lease_owner = ?""",
+                (status, available_at, error[:500], status, now, task.id, STATUS_LEASED, owner),
+            )
+        return status == STATUS_PENDING
+
+    def finished(self, task_ids: Iterable[int]) -> List[Task]:
+        """Tasks among `task_ids` that are done or dead, with their results."""
+        ids = list(task_ids)
+        finished = []
+        with self._lock:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                rows = self._conn.execute(
+                    f"""SELECT * FROM tasks WHERE status IN (?, ?)
+                        AND id IN ({', '.join('?' * len(chunk))})""",
+                    (STATUS_DONE, STATUS_DEAD, *chunk),
+                ).fetchall()
+                finished.extend(
+                    Task(
+                        row["id"], row["key"], row["kind"], json.loads(row["payload"]), row["attempts"],
+                        status=row["status"], result=json.loads(row["result"]) if row["result"] else None,
+                        last_error=row["last_error"],
+                    )
+                    for row in rows
+                )
+        return finished
+
+    def counts(self) -> Dict[str, int]:
+        """Number of tasks in each status."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM tasks GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def purge_finished(self, older_than_days: float = 7) -> int:
+        """Delete done and dead tasks older than the retention window."""
+        cutoff = time.time() - older_than_days * 86400
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM tasks WHERE status IN (?, ?) AND finished_at < ?",
+                (STATUS_DONE, STATUS_DEAD, cutoff),
+            )
+        return cursor.rowcount
+
+
+class WorkerPool:
+    """
+    Keeps N worker processes running.
+
+    Workers are started with the "spawn" method (no inherited threads,
+    locks or SQLite connections) and receive a shared stop event as their
+    last argument. `ensure_running()` replaces workers that died, so a
+    crash costs only the tasks it held until their leases expire.
+    """
+
+    def __init__(self, target: Callable[..., None], args: Tuple = (), size: int = 2):
+        """
+        Initialize the pool.
+
+        Args:
+            target: Importable worker entry point, called as target(*args, worker_id, stop_event)
+            args: Leading arguments for `target` (must be picklable)
+            size: Number of worker processes
+        """
+        self.target = target
+        self.args = args
+        self.size = size
+        self._context = multiprocessing.get_context("spawn")
+        self._stop = self._context.Event()
+        self._workers: Dict[int, Any] = {}
+
+    def _spawn(self, slot: int):
+        worker_id = f"{os.getpid()}-w{slot}"
+        process = self._context.Process(
+            target=self.target, args=(*self.args, worker_id, self._stop), name=f"worker-{slot}", daemon=True
+        )
+        process.start()
+        self._workers[slot] = process
+
+    def start(self):
+        self._stop.clear()
+        for slot in range(self.size):
+            self._spawn(slot)
+        logger.info(f"Started {self.size} worker processes")
+
+    def ensure_running(self) -> int:
+        """
+        Restart workers that exited.
+
+        Returns:
+            Number of workers restarted
+        """
+        restarted = 0
+        for slot, process in list(self._workers.items()):
+            if not process.is_alive():
+                logger.warning(f"Worker {process.name} exited (code {process.exitcode}), restarting")
+                self._spawn(slot)
+                restarted += 1
+        return restarted
+
+    def stop(self, timeout: float = 30.0):
+        """Ask workers to finish their current task and exit."""
+        self._stop.set()
+        deadline = time.time() + timeout
+        for process in self._workers.values():
+            process.join(max(0.0, deadline - time.time()))
+            if process.is_alive():
+                process.terminate()
+        self._workers = {}
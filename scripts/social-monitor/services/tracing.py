@@ -0,0 +1,251 @@
+"""Nested span tracing with Chrome trace export and structured JSON logging."""
+import contextvars
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+_span_ids = itertools.count(1)
+
+# Finished spans of these categories are logged at INFO, the rest at DEBUG
+_INFO_CATEGORIES = {"cycle", "adapter"}
+
+
+@dataclass
+class Span:
+    """One timed unit of work (cycle, adapter fetch, HTTP request, post, LLM call)."""
+
+    name: str
+    category: str
+    span_id: int
+    trace_id: int
+    parent_id: Optional[int]
+    start: float
+    duration: Optional[float] = None
+    thread_id: int = 0
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    outcome: str = "ok"
+
+    def set(self, **attrs):
+        """Attach attributes (IDs, counts, status codes) to the span."""
+        self.attrs.update(attrs)
+
+    def as_log_fields(self) -> Dict[str, Any]:
+        return {
+            "span": self.name,
+            "category": self.category,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "duration_ms": round((self.duration or 0.0) * 1000, 3),
+            "outcome": self.outcome,
+            **self.attrs,
+        }
+
+
+class _NullSpan:
+    """Stand-in yielded while tracing is disabled."""
+
+    span_id = None
+    trace_id = None
+    outcome = "ok"
+
+    def set(self, **attrs):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Records nested spans for the monitoring cycle.
+
+    The active span is tracked in a context variable, so spans opened inside
+    another span's block nest automatically. Worker threads don't inherit the
+    context; pass `parent=` explicitly when handing work to another thread.
+    """
+
+    def __init__(self, max_spans: int = 200000):
+        """
+        Initialize the tracer (disabled until `enable()` is called).
+
+        Args:
+            max_spans: Finished spans kept in memory; oldest are dropped first
+        """
+        self.enabled = False
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+        self._epoch = time.perf_counter()
+        self._thread_names: Dict[int, str] = {}
+        self._span_logger = logging.getLogger("trace")
+
+    def enable(self, max_spans: Optional[int] = None):
+        if max_spans:
+            with self._lock:
+                self._spans = deque(self._spans, maxlen=max_spans)
+        self.enabled = True
+
+    def current(self) -> Optional[Span]:
+        return _current_span.get()
+
+    @contextmanager
+    def span(self, name: str, category: str = "", parent: Optional[Span] = None, **attrs) -> Iterator[Span]:
+        """
+        Time a block as a span.
+
+        Args:
+            name: Span name shown in trace viewers
+            category: cycle, adapter, http, post or llm
+            parent: Parent span (default: the current span in this context)
+            **attrs: Initial attributes
+
+        Yields:
+            The Span; set `outcome` or call `set()` to annotate it. An
+            exception escaping the block marks the outcome "error".
+        """
+        if not self.enabled:
+            yield NULL_SPAN
+            return
+
+        parent = parent if isinstance(parent, Span) else _current_span.get()
+        span_id = next(_span_ids)
+        span = Span(
+            name=name,
+            category=category or name,
+            span_id=span_id,
+            trace_id=parent.trace_id if parent else span_id,
+            parent_id=parent.span_id if parent else None,
+            start=time.perf_counter(),
+            thread_id=threading.get_ident(),
+            attrs=attrs,
+        )
+        if span.thread_id not in self._thread_names:
+            self._thread_names[span.thread_id] = threading.current_thread().name
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.outcome = "error"
+            span.attrs.setdefault("error", f"{type(e).__name__}: {e}"[:200])
+            raise
+        finally:
+            span.duration = time.perf_counter() - span.start
+            _current_span.reset(token)
+            with self._lock:
+                self._spans.append(span)
+            level = logging.INFO if span.category in _INFO_CATEGORIES else logging.DEBUG
+            if self._span_logger.isEnabledFor(level):
+                self._span_logger.log(level, f"{span.name} {span.duration * 1000:.1f}ms {span.outcome}",
+                                      extra={"span_fields": span.as_log_fields()})
+
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Finished spans as a Chrome trace (chrome://tracing, Perfetto, speedscope)."""
+        pid = os.getpid()
+        events = []
+        for tid, tname in list(self._thread_names.items()):
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": tname}})
+        for span in self.spans():
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round((span.start - self._epoch) * 1e6, 1),
+                "dur": round((span.duration or 0.0) * 1e6, 1),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "trace_id": span.trace_id,
+                    "outcome": span.outcome,
+                    **span.attrs,
+                },
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome(self, path: Path):
+        """Write all buffered spans to `path` in Chrome trace JSON format."""
+        try:
+            with open(path, "w") as f:
+                json.dump(self.chrome_trace(), f, default=str)
+            logger.debug(f"Wrote trace to {path}")
+        except Exception as e:
+            logger.error(f"Error writing trace: {e}")
+
+
+def _add_span_context(logger_, method_name, event_dict):
+    """structlog processor: tag log lines with the active span's IDs."""
+    record = event_dict.get("_record")
+    fields = getattr(record, "span_fields", None) if record is not None else None
+    if fields:
+        event_dict.update(fields)
+        return event_dict
+    span = _current_span.get()
+    if span is not None:
+        event_dict.setdefault("trace_id", span.trace_id)
+        event_dict.setdefault("span_id", span.span_id)
+    return event_dict
+
+
+def configure_json_logging(level: int = logging.INFO):
+    """
+    Switch the root logger to one JSON object per line.
+
+    Uses structlog when installed; existing stdlib `logger.*` calls are
+    rendered through it, and span events carry their fields (duration,
+    IDs, outcome) as top-level keys.
+    """
+    try:
+        import structlog
+    except ImportError:
+        logger.warning("structlog not installed - keeping plain text logs")
+        return
+
+    formatter = structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=[
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.add_logger_name,
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
+            _add_span_context,
+        ],
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(default=str),
+        ],
+    )
+    handler = logging.StreamHandler()
+    handler.setFormatter(formatter)
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level)
+
+
+# Singleton tracer
+_tracer = None
+
+def get_tracer() -> Tracer:
+    """Get or create the process-wide tracer."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
@@ -0,0 +1,321 @@
+"""WebSub (PubSubHubbub) subscriber: embedded callback server for pushed feed updates."""
+import hashlib
+import hmac
+import logging
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from .metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+STATE_PENDING = "pending"
+STATE_ACTIVE = "active"
+
+# Renew once less than this share of the granted lease is left
+RENEW_FRACTION = 0.1
+
+
+@dataclass
+class Subscription:
+    """One feed subscription at a hub."""
+
+    feed_url: str        # URL the adapter polls
+    topic: str           # hub.topic (the feed's rel="self" URL if advertised)
+    hub: str
+    token: str           # Last path segment of the callback URL
+    secret: str          # HMAC key for X-Hub-Signature
+    handler: Callable[[bytes], None]
+    state: str = STATE_PENDING
+    requested_at: float = 0.0
+    expires_at: float = 0.0
+    last_polled: float = 0.0
+    pushes: int = 0
+
+
+def discover_hub(feed: Any, response: Any = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Hub and topic a feed advertises, from HTTP Link headers or <link> elements.
+
+    Args:
+        feed: Parsed feed (feedparser result)
+        response: HTTP response the feed came from (for Link headers)
+
+    Returns:
+        (hub URL, self URL); either may be None
+    """
+    hub = topic = None
+    links = getattr(response, "links", None) or {}
+    hub = links.get("hub", {}).get("url")
+    topic = links.get("self", {}).get("url")
+    for link in feed.get("feed", {}).get("links", []):
+        if link.get("rel") == "hub" and not hub:
+            hub = link.get("href")
+        elif link.get("rel") == "self" and not topic:
+            topic = link.get("href")
+    return hub, topic
+
+
+class WebSubSubscriber:
+    """
+    Subscribes to WebSub hubs and receives pushed feed content.
+
+    Feed adapters call `subscribe()` when a feed they polled advertises a
+    hub. The hub confirms the subscription with a GET challenge on the
+    callback URL and from then on POSTs the feed document whenever it
+    changes. Deliveries are authenticated with a per-subscription HMAC
+    secret and passed to the subscription's handler. A background thread
+    renews subscriptions before their lease runs out.
+
+    Feeds without a verified subscription keep being polled, and verified
+    ones are still polled every `fallback_poll_seconds` in case the hub
+    drops notifications.
+    """
+
+    def __init__(
+        self,
+        callback_url: str,
+        host: str = "0.0.0.0",
+        port: int = 8088,
+        lease_seconds: int = 86400,
+        fallback_poll_seconds: float = 21600,
+        verify_timeout_seconds: float = 600,
+    ):
+        """
+        Initialize the subscriber.
+
+        Args:
+            callback_url: Public base URL hubs can reach that maps to this server
+            host: Listen address of the callback server
+            port: Listen port (0 = any free port)
+            lease_seconds: Lease requested from hubs (they may grant less)
+            fallback_poll_seconds: Poll subscribed feeds this often anyway
+            verify_timeout_seconds: Give up on a subscription the hub never verified
+        """
+        self.callback_url = callback_url.rstrip("/")
+        self.host = host
+        self.port = port
+        self.lease_seconds = lease_seconds
+        self.fallback_poll_seconds = fallback_poll_seconds
+        self.verify_timeout_seconds = verify_timeout_seconds
+
+        self._lock = threading.Lock()
+        self._subs: Dict[str, Subscription] = {}     # feed URL -> subscription
+        self._by_token: Dict[str, Subscription] = {}
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._maintainer: Optional[threading.Thread] = None
+
+        metrics = get_metrics()
+        self._m_notifications = metrics.counter(
+            "websub_notifications_total", "Content deliveries received from WebSub hubs", ("outcome",)
+        )
+        self._m_active = metrics.gauge("websub_subscriptions", "Verified WebSub subscriptions")
+
+    # ------------------------------------------------------------------ server
+
+    def start(self):
+        # Only needed when push is enabled; keeps http.server off the cold-start path
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        subscriber = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _token(self) -> str:
+                return urlsplit(self.path).path.rstrip("/").rsplit("/", 1)[-1]
+
+            def do_GET(self):
+                params = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+                challenge = subscriber._verify(self._token(), params)
+                if challenge is None:
+                    self.send_error(404)
+                    return
+                body = challenge.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                known = subscriber._deliver(self._token(), body, self.headers.get("X-Hub-Signature"))
+                # Any 2xx acknowledges the delivery, even one we ignore (spec)
+                self.send_response(202 if known else 410)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                logger.debug("websub: " + format % args)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="websub-callback", daemon=True)
+        self._thread.start()
+        self._stop.clear()
+        self._maintainer = threading.Thread(target=self._maintain, name="websub-renew", daemon=True)
+        self._maintainer.start()
+        logger.info(f"WebSub callback server on {self.host}:{self.port} ({self.callback_url})")
+
+    def stop(self):
+        self._stop.set()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    # ----------------------------------------------------------- subscriptions
+
+    def subscribe(self, feed_url: str, hub: str, topic: Optional[str], handler: Callable[[bytes], None]):
+        """
+        Subscribe to a feed at its hub, unless already subscribed or pending.
+
+        Args:
+            feed_url: URL the adapter polls (subscriptions are keyed by it)
+            hub: Hub URL the feed advertises
+            topic: Feed's canonical (rel="self") URL; defaults to feed_url
+            handler: Called with each pushed feed document
+        """
+        now = time.time()
+        with self._lock:
+            sub = self._subs.get(feed_url)
+            if sub and sub.hub == hub:
+                sub.handler = handler
+                if sub.state == STATE_ACTIVE and sub.expires_at > now:
+                    return
+                if sub.state == STATE_PENDING and now - sub.requested_at < self.verify_timeout_seconds:
+                    return
+            if sub is None or sub.hub != hub:
+                if sub:
+                    self._by_token.pop(sub.token, None)
+                sub = Subscription(
+                    feed_url=feed_url, topic=topic or feed_url, hub=hub,
+                    token=hashlib.sha1(feed_url.encode("utf-8")).hexdigest()[:16],
+                    secret=secrets.token_hex(20), handler=handler,
+                )
+                self._subs[feed_url] = sub
+                self._by_token[sub.token] = sub
+            sub.state = STATE_PENDING
+            sub.requested_at = now
+        self._request(sub)
+
+    def needs_poll(self, feed_url: str) -> bool:
+        """Whether a feed must still be polled (no live subscription, or the fallback is due)."""
+        with self._lock:
+            sub = self._subs.get(feed_url)
+            now = time.time()
+            if sub is None or sub.state != STATE_ACTIVE or sub.expires_at <= now:
+                return True
+            return now - sub.last_polled >= self.fallback_poll_seconds
+
+    def mark_polled(self, feed_url: str):
+        with self._lock:
+            sub = self._subs.get(feed_url)
+            if sub:
+                sub.last_polled = time.time()
+
+    def active_count(self) -> int:
+        now = time.time()
+        with self._lock:
+            return sum(1 for s in self._subs.values() if s.state == STATE_ACTIVE and s.expires_at > now)
+
+    def _request(self, sub: Subscription) -> bool:
+        """Send the subscription request; the hub verifies it asynchronously."""
+        try:
+            response = requests.post(sub.hub, data={
+                "hub.mode": "subscribe",
+                "hub.topic": sub.topic,
+                "hub.callback": f"{self.callback_url}/{sub.token}",
+                "hub.lease_seconds": str(self.lease_seconds),
+                "hub.secret": sub.secret,
+            }, timeout=10)
+            if response.status_code not in (202, 204):
+                logger.warning(f"WebSub hub {sub.hub} refused {sub.topic}: HTTP {response.status_code}")
+                return False
+            logger.debug(f"WebSub subscription requested for {sub.topic} at {sub.hub}")
+            return True
+        except requests.RequestException as e:
+            logger.warning(f"WebSub subscribe to {sub.hub} failed: {e}")
+            return False
+
+    def _verify(self, token: str, params: Dict[str, str]) -> Optional[str]:
+        """Answer a hub's verification GET; returns the challenge to echo, or None (404)."""
+        mode = params.get("hub.mode")
+        with self._lock:
+            sub = self._by_token.get(token)
+            if sub is None or params.get("hub.topic") != sub.topic:
+                return None
+            if mode == "denied":
+                logger.warning(f"WebSub hub denied {sub.topic}: {params.get('hub.reason', 'no reason')}")
+                self._subs.pop(sub.feed_url, None)
+                self._by_token.pop(token, None)
+                return ""
+            if mode != "subscribe" or "hub.challenge" not in params:
+                return None
+            try:
+                lease = int(params.get("hub.lease_seconds", self.lease_seconds))
+            except ValueError:
+                lease = self.lease_seconds
+            sub.state = STATE_ACTIVE
+            sub.expires_at = time.time() + lease
+            # Subscribed feeds were just polled (that is how the hub was found)
+            sub.last_polled = sub.last_polled or time.time()
+        self._m_active.set(self.active_count())
+        logger.info(f"WebSub subscription verified for {sub.topic} ({lease}s lease)")
+        return params["hub.challenge"]
+
+    def _deliver(self, token: str, body: bytes, signature: Optional[str]) -> bool:
+        """Authenticate pushed content and hand it to the subscription's handler."""
+        with self._lock:
+            sub = self._by_token.get(token)
+        if sub is None:
+            self._m_notifications.inc(outcome="unknown")
+            return False
+        if not self._signature_ok(sub.secret, body, signature):
+            self._m_notifications.inc(outcome="bad_signature")
+            logger.warning(f"WebSub delivery for {sub.topic} failed signature check, ignored")
+            return True
+        sub.pushes += 1
+        self._m_notifications.inc(outcome="accepted")
+        try:
+            sub.handler(body)
+        except Exception as e:
+            logger.error(f"Error handling WebSub delivery for {sub.topic}: {e}")
+        return True
+
+    @staticmethod
+    def _signature_ok(secret: str, body: bytes, signature: Optional[str]) -> bool:
+        if not signature or "=" not in signature:
+            return False
+        method, digest = signature.split("=", 1)
+        if method not in ("sha1", "sha256", "sha384", "sha512"):
+            return False
+        expected = hmac.new(secret.encode("utf-8"), body, method).hexdigest()
+        return hmac.compare_digest(expected, digest)
+
+    def _maintain(self):
+        """Renew leases that are about to run out."""
+        while not self._stop.wait(60):
+            now = time.time()
+            with self._lock:
+                # Still active while the renewal is verified; re-request if it never is
+                due = [
+                    s for s in self._subs.values()
+                    if s.state == STATE_ACTIVE
+                    and s.expires_at - now < max(RENEW_FRACTION * self.lease_seconds, 120)
+                    and now - s.requested_at >= self.verify_timeout_seconds
+                ]
+                for sub in due:
+                    sub.requested_at = now
+            for sub in due:
+                logger.debug(f"Renewing WebSub subscription for {sub.topic}")
+                self._request(sub)
+            self._m_active.set(self.active_count())